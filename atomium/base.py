@@ -1,6 +1,17 @@
 """Decorators and metaclasses used by atomium structures."""
 
 import re
+import numpy as np
+
+OPERATORS = {
+ "regex": lambda attribute, value: re.match(value, attribute),
+ "in": lambda attribute, value: attribute in value,
+ "between": lambda attribute, value: attribute is not None and \
+  value[0] <= attribute <= value[1],
+ "isnull": lambda attribute, value: (attribute is None) == bool(value),
+ "startswith": lambda attribute, value: isinstance(attribute, str) and \
+  attribute.startswith(value)
+}
 
 def get_object_from_filter(obj, components):
     """Gets the object whose attributes are actually being queried, which may be
@@ -14,7 +25,7 @@ def get_object_from_filter(obj, components):
     while len(components) > 2:
         obj = getattr(obj, components.pop(0))
     if len(components) == 2:
-        if components[-1] != "regex":
+        if components[-1] not in OPERATORS:
             if not hasattr(obj, f"__{components[-1]}__"):
                 obj = getattr(obj, components[0])
     return obj
@@ -38,15 +49,17 @@ def get_object_attribute_from_filter(obj, components):
 def attribute_matches_value(attribute, value, components):
     """Checks if an attribute value matches a given value. The components given
     will determine whether an exact match is sought, or whether a more complex
-    criterion is used.
+    criterion is used - ``regex``, ``in`` (a collection of values),
+    ``between`` (an inclusive pair of values), ``isnull``, ``startswith``, or
+    a comparison method such as ``gt``.
     
     :param attribute: the value of an object's attribute.
     :param value: the value to match against.
     :param list components: the components of the original key.
     :rtype: ``bool``"""
 
-    if components[-1] == "regex":
-        return re.match(value, attribute)
+    if components[-1] in OPERATORS:
+        return OPERATORS[components[-1]](attribute, value)
     possible_magic = f"__{components[-1]}__"
     if hasattr(attribute, possible_magic):
         return getattr(attribute, possible_magic)(value)
@@ -90,15 +103,15 @@ def query(func, tuple_=False):
 
     def structures(self, *args, **kwargs):
         objects = func(self)
-        original = {s: n for n, s in enumerate(objects.structures)}
         if len(args) == 1:
             return {objects.get(args[0])} if args[0] in objects.ids else set()
+        if tuple_ and not kwargs: return tuple(objects.structures)
+        original = objects.structures
         for k, v in kwargs.items():
             objects = filter_objects(objects, k, v)
         if tuple_:
-            return tuple(sorted(
-             objects.structures, key=lambda s: original[s]
-            ))
+            matches = set(objects.structures)
+            return tuple(s for s in original if s in matches)
         else:
             return set(objects.structures)
     return structures
@@ -208,3 +221,320 @@ class StructureSet:
 
         matches = self._d.get(id, set())
         for match in matches: return match
+
+
+
+class Selection:
+    """A lazy, ordered selection of structures, drawn from some fixed sequence
+    of structures - its universe - such as all the atoms of a
+    :py:class:`.Model`.
+
+    A selection is represented by an array of integer indices into its
+    universe, or equivalently by a boolean mask over it. Filters are only
+    applied when the selection is evaluated, and selections from the same
+    universe can be combined with ``|``, ``&`` and ``-`` as masks, without the
+    structures themselves being touched. Iterating over a selection yields the
+    selected structures.
+
+    :param tuple universe: the structures the selection is drawn from.
+    :param indices: the indices of the selected structures (all by default).
+    :param Model model: the model the universe belongs to, if any.
+    :param tuple filters: filters still to be applied."""
+
+    def __init__(self, universe, indices=None, model=None, filters=()):
+        self._universe = universe
+        self._base = indices
+        self._model = model
+        self._filters = filters
+        self._indices = None
+        self._sorted, self._positions = None, None
+
+
+    def __repr__(self):
+        return "<Selection ({} structures)>".format(self.count())
+
+
+    def __len__(self):
+        return self.count()
+
+
+    def __iter__(self):
+        universe = self._universe
+        return (universe[i] for i in self.indices)
+
+
+    def __contains__(self, obj):
+        position = self._position(obj)
+        if position is None: return False
+        if self._sorted is None: self._sorted = np.sort(self.indices)
+        found = np.searchsorted(self._sorted, position)
+        return found < len(self._sorted) and self._sorted[found] == position
+
+
+    def __or__(self, other):
+        return self._combine(other, np.logical_or)
+
+
+    def __and__(self, other):
+        return self._combine(other, np.logical_and)
+
+
+    def __sub__(self, other):
+        return self._combine(other, lambda m1, m2: m1 & ~m2)
+
+
+    @staticmethod
+    def from_mask(universe, mask, model=None):
+        """Creates a selection from a boolean mask over some universe.
+
+        :param tuple universe: the structures the selection is drawn from.
+        :param numpy.ndarray mask: ``True`` for every structure selected.
+        :param Model model: the model the universe belongs to, if any.
+        :rtype: ``Selection``"""
+
+        return Selection(universe, np.flatnonzero(mask), model)
+
+
+    @property
+    def indices(self):
+        """The sorted indices of the selected structures within the
+        selection's universe. Accessing these evaluates the selection.
+
+        :rtype: ``numpy.ndarray``"""
+
+        if self._indices is None:
+            indices = np.arange(len(self._universe)) if self._base is None \
+             else self._base
+            for exclude, kwargs in self._filters:
+                keep = np.ones(len(indices), dtype=bool)
+                for key, value in kwargs.items():
+                    keep &= self._matches(indices, key, value)
+                indices = indices[~keep if exclude else keep]
+            self._indices = indices
+        return self._indices
+
+
+    @property
+    def mask(self):
+        """The selection as a boolean array with one value for every structure
+        in its universe. Accessing this evaluates the selection.
+
+        :rtype: ``numpy.ndarray``"""
+
+        mask = np.zeros(len(self._universe), dtype=bool)
+        mask[self.indices] = True
+        return mask
+
+
+    @property
+    def bitset(self):
+        """The selection as a compact packed bitset, using one bit for every
+        structure in its universe. This can be stored and later turned back
+        into a selection with :py:meth:`.Model.selection_from_bitset`.
+
+        :rtype: ``bytes``"""
+
+        return np.packbits(self.mask).tobytes()
+
+
+    def filter(self, **kwargs):
+        """Returns a new selection containing only those structures which
+        match all of the criteria given, using the same keyword syntax as
+        methods like ``atoms()``.
+
+        :rtype: ``Selection``"""
+
+        return Selection(self._universe, self._base, self._model,
+         self._filters + ((False, kwargs),))
+
+
+    def exclude(self, **kwargs):
+        """Returns a new selection without those structures which match all
+        of the criteria given, using the same keyword syntax as methods like
+        ``atoms()``.
+
+        :rtype: ``Selection``"""
+
+        return Selection(self._universe, self._base, self._model,
+         self._filters + ((True, kwargs),))
+
+
+    def count(self):
+        """Returns the number of structures in the selection.
+
+        :rtype: ``int``"""
+
+        return len(self.indices)
+
+
+    def coordinates(self):
+        """Returns the coordinates of the selected atoms as an array with one
+        row per atom.
+
+        :rtype: ``numpy.ndarray``"""
+
+        if self._model is not None and \
+         self._universe is self._model._atom_list:
+            return self._model._coordinates[self.indices]
+        return np.array(
+         [atom._location for atom in self], dtype=float
+        ).reshape(-1, 3)
+
+
+    def _position(self, obj):
+        """Finds where a structure is in the selection's universe, without
+        searching through it. Atoms of a model know their own position, other
+        structures of a model are looked up in the model, and the positions of
+        any other universe's structures are worked out once and cached.
+
+        :param obj: the structure to look for.
+        :returns: the structure's index, or ``None`` if it isn't there.
+        :rtype: ``int``"""
+
+        universe, model = self._universe, self._model
+        if model is not None:
+            if universe is model._atom_list:
+                position = getattr(obj, "_index", None)
+                if position is not None and position < len(universe) \
+                 and universe[position] is obj:
+                    return position
+                return None
+            for objects, structures in model._universes.items():
+                if structures is universe:
+                    return model._lookup(objects).get(obj)
+        if self._positions is None:
+            self._positions = {id(s): i for i, s in enumerate(universe)}
+        return self._positions.get(id(obj))
+
+
+    def _matches(self, indices, key, value):
+        """Checks which of the structures at the given indices match a single
+        filter criterion.
+
+        Where the criterion is on an atom attribute which the model keeps an
+        :py:class:`.AttributeIndex` for, the index answers it directly rather
+        than each atom being checked in turn.
+
+        :param numpy.ndarray indices: the indices to check.
+        :param str key: the filter key, such as ``name__regex``.
+        :param value: the value to match against.
+        :rtype: ``numpy.ndarray``"""
+
+        components = key.split("__")
+        if self._model is not None and len(components) <= 2 and \
+         self._universe is self._model._atom_list:
+            index = self._model._attribute_index(components[0])
+            if index is not None:
+                operator = components[1] if len(components) == 2 else "eq"
+                try:
+                    mask = index.mask(operator, value)
+                except TypeError: mask = None
+                if mask is not None: return mask[indices]
+        return np.array([bool(attribute_matches_value(
+         get_object_attribute_from_filter(
+          get_object_from_filter(self._universe[i], components), components
+         ), value, components
+        )) for i in indices], dtype=bool)
+
+
+    def _combine(self, other, operation):
+        """Combines this selection with another from the same universe.
+
+        :param Selection other: the other selection.
+        :param function operation: the operation to apply to the two masks.
+        :raises ValueError: if the selections have different universes.
+        :rtype: ``Selection``"""
+
+        if self._universe is not other._universe:
+            raise ValueError("Cannot combine selections of different structures")
+        return Selection.from_mask(
+         self._universe, operation(self.mask, other.mask), self._model
+        )
+
+
+
+class AttributeIndex:
+    """A sorted index of the values some attribute takes across a sequence of
+    structures, which can answer filter criteria for all of the structures at
+    once - equality and ``in`` lookups, comparisons, ``between`` ranges and
+    ``startswith`` prefixes become binary searches over the sorted values.
+
+    ``None`` values are kept separately, and only ever match ``isnull``.
+
+    :param list values: the attribute's value for each structure."""
+
+    SEARCHES = {
+     "eq": ("left", "right"), "gt": ("right", None), "ge": ("left", None),
+     "lt": (None, "left"), "le": (None, "right")
+    }
+
+    def __init__(self, values):
+        self._null = np.array([v is None for v in values], dtype=bool)
+        present = np.flatnonzero(~self._null)
+        values = np.array([values[i] for i in present])
+        order = np.argsort(values, kind="stable")
+        self._order, self._sorted = present[order], values[order]
+
+
+    def __len__(self):
+        return len(self._null)
+
+
+    def mask(self, operator, value):
+        """Returns a boolean mask of the structures whose attribute matches
+        some criterion, or ``None`` if the index cannot answer that kind of
+        criterion.
+
+        :param str operator: the criterion, such as ``"between"``.
+        :param value: the value to match against.
+        :raises TypeError: if the value cannot be compared with the index's\
+        values.
+        :rtype: ``numpy.ndarray``"""
+
+        if operator == "isnull":
+            return self._null.copy() if value else ~self._null
+        if operator == "in":
+            ranges = [self._range("eq", v) for v in value]
+        elif operator == "between":
+            ranges = [(self._search(value[0], "left"),
+             self._search(value[1], "right"))]
+        elif operator == "startswith":
+            if self._sorted.dtype.kind != "U": return None
+            ranges = [(self._search(value, "left"),
+             self._search(value + "\U0010ffff", "left"))]
+        elif operator in self.SEARCHES:
+            ranges = [self._range(operator, value)]
+        else: return None
+        mask = np.zeros(len(self), dtype=bool)
+        for start, end in ranges:
+            mask[self._order[start:end]] = True
+        return mask
+
+
+    def _range(self, operator, value):
+        """Gets the range of positions in the sorted values which satisfy a
+        simple comparison.
+
+        :param str operator: the comparison, such as ``"gt"``.
+        :param value: the value to compare with.
+        :rtype: ``tuple``"""
+
+        start, end = self.SEARCHES[operator]
+        return (
+         0 if start is None else self._search(value, start),
+         len(self._sorted) if end is None else self._search(value, end)
+        )
+
+
+    def _search(self, value, side):
+        """Finds where a value would be inserted into the sorted values.
+
+        :param value: the value to look for.
+        :param str side: ``"left"`` or ``"right"``.
+        :raises TypeError: if the value is not comparable with the values.
+        :rtype: ``int``"""
+
+        kind = np.asarray(value).dtype.kind
+        if kind not in "biufU" or (kind == "U") != (self._sorted.dtype.kind == "U"):
+            raise TypeError(f"Cannot compare {value!r} with indexed values")
+        return int(np.searchsorted(self._sorted, value, side=side))
\ No newline at end of file
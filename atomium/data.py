@@ -1,6 +1,12 @@
 """Contains logic for turning data dictionaies into a parsed Python objects."""
 
+import math
+import numpy as np
+from collections import OrderedDict
+from collections.abc import Sequence
 from .structures import *
+from .ensemble import Ensemble
+from .superposition import pair_atoms
 
 class File:
     """When a file is parsed, the result is a ``File``. It contains the
@@ -155,9 +161,12 @@ class File:
 
     @property
     def models(self):
-        """The structure's models.
+        """The structure's models. If every model has the same topology, this
+        will be a read-only :py:class:`.Frames` sequence, which only builds
+        each model the first time it is accessed - slicing it or adding it to
+        a list gives an ordinary list of models. Otherwise it is a list.
 
-        :rtype: ``list``"""
+        :rtype: ``Frames`` or ``list``"""
 
         return self._models
 
@@ -171,6 +180,17 @@ class File:
         return self._models[0]
 
 
+    def ensemble(self):
+        """Pairs up the atoms of all the file's models, and returns them as an
+        :py:class:`.Ensemble` with a single coordinate array, for calculating
+        things like per-atom RMSF across an NMR ensemble.
+
+        :rtype: ``Ensemble``"""
+
+        if isinstance(self._models, Frames): return self._models.ensemble()
+        return Ensemble(*self._models)
+
+
     def generate_assembly(self, id):
         """Generates a new model from the existing model using one of the file's
         set of assembly instructions (for which you provide the ID).
@@ -212,6 +232,122 @@ class File:
         return Model(*all_structures)
 
 
+
+class Frames(Sequence):
+    """A sequence of models which all share a single topology, as is usual for
+    NMR ensembles. Only the first model is built in full when the file is
+    parsed - the others are stored as one array of coordinates (and, if they
+    differ between models, one array of atom IDs and one of B-factors), and
+    each is only turned into a :py:class:`.Model` when it is accessed.
+
+    If later models in the file have a different topology, they are built in
+    full and kept after the frames.
+
+    Apart from the first, frames are not kept once built - only the few most
+    recently accessed are cached, so that looping over every model doesn't
+    hold them all in memory at once. Changes made to a model other than the
+    first are lost once it drops out of the cache.
+
+    Frames can be indexed, sliced, searched and iterated like a list, and
+    slicing them or adding them to a list gives a list, but they cannot be
+    modified in place.
+
+    :param dict template: the first model's dictionary.
+    :param Model topology: the model built from that dictionary.
+    :param numpy.ndarray coordinates: every model's atom coordinates, with\
+    the shape (models, atoms, 3), atoms being in model dictionary order.
+    :param numpy.ndarray ids: every model's atom IDs, with the shape\
+    (models, atoms), or ``None`` if they are the same in every model.
+    :param dict positions: the position in model dictionary order of each of\
+    the first model's atoms, by category, het ID and atom ID.
+    :param numpy.ndarray bvalues: every model's atom B-factors, with the\
+    shape (models, atoms), or ``None`` if they are the same in every model.
+    :param list others: built models which follow the frames.
+    :param int cache_size: how many built models other than the first to keep."""
+
+    def __init__(self, template, topology, coordinates, ids, positions,
+                 bvalues=None, others=(), cache_size=4):
+        self._template, self._coordinates = template, coordinates
+        self._ids, self._positions, self._bvalues = ids, positions, bvalues
+        self._topology, self._others = topology, list(others)
+        self._cache, self._cache_size = OrderedDict(), cache_size
+
+
+    def __repr__(self):
+        return "<Frames ({} models, {} atoms)>".format(
+         len(self), self._coordinates.shape[1]
+        )
+
+
+    def __len__(self):
+        return len(self._coordinates) + len(self._others)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        if index == 0: return self._topology
+        if index >= len(self._coordinates):
+            return self._others[index - len(self._coordinates)]
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        model = model_dict_to_model(replace_model_dict_atoms(
+         self._template, self._coordinates[index],
+         None if self._ids is None else self._ids[index],
+         None if self._bvalues is None else self._bvalues[index]
+        ))
+        self._cache[index] = model
+        if len(self._cache) > self._cache_size: self._cache.popitem(last=False)
+        return model
+
+
+    def __iter__(self):
+        for index in range(len(self)): yield self[index]
+
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+
+    def ensemble(self):
+        """Returns an :py:class:`.Ensemble` of the models, without building
+        any that aren't already built. The coordinates of the first model,
+        and of any models still in the cache, are taken from the models
+        themselves, in case they have moved.
+
+        If there are models after the frames with a different topology, every
+        model is built and their atoms are paired up instead.
+
+        :raises ValueError: if the first model's atoms have changed since\
+        the file was parsed.
+        :rtype: ``Ensemble``"""
+
+        if self._others: return Ensemble(*self)
+        topology = self._topology
+        try:
+            positions = np.array([self._positions[(
+             "polymer" if isinstance(atom._het, Residue) else
+             "water" if atom._het._water else "non-polymer",
+             atom._het._id, atom._id
+            )] for atom in topology._atom_tuple()], dtype=int)
+        except KeyError:
+            raise ValueError("{} no longer has its original atoms".format(topology))
+        coordinates = self._coordinates[:, positions]
+        built = [0] + sorted(self._cache)
+        for index, order in zip(built, pair_atoms(
+         [self[index] for index in built]
+        )):
+            coordinates[index] = self[index]._atom_arrays()[0][order]
+        return Ensemble.from_coordinates(self, coordinates)
+
+
+
 def data_dict_to_file(data_dict, filetype):
     """Turns an atomium data dictionary into a :py:class:`.File`.
 
@@ -224,10 +360,139 @@ def data_dict_to_file(data_dict, filetype):
         if key != "models":
             for subkey, value in data_dict[key].items():
                 setattr(f, "_" + subkey, value)
-    f._models = [model_dict_to_model(m) for m in data_dict["models"]]
+    f._models = model_dicts_to_models(data_dict["models"])
     return f
 
 
+def model_dicts_to_models(model_dicts):
+    """Turns a list of model dictionaries into models. If there are several
+    and they all share one topology - the same molecules, residues and atoms,
+    differing only in atom coordinates, IDs and B-factors - only the first is
+    built, and the others are stored as arrays in a :py:class:`.Frames`
+    sequence.
+
+    :param list model_dicts: the model dictionaries.
+    :rtype: ``list``"""
+
+    models = [model_dict_to_model(m) for m in model_dicts[:1]]
+    if len(model_dicts) < 2: return models
+    signature, keys, coordinates, ids, bvalues = split_model_dict(model_dicts[0])
+    positions = {key: position for position, key in enumerate(keys)}
+    if len(positions) < len(keys):
+        return models + [model_dict_to_model(m) for m in model_dicts[1:]]
+    frames, frame_ids, frame_bvalues = [coordinates], [ids], [bvalues]
+    for model_dict in model_dicts[1:]:
+        other_signature, _, coordinates, ids, bvalues = split_model_dict(model_dict)
+        if other_signature != signature: break
+        frames.append(coordinates)
+        frame_ids.append(ids)
+        frame_bvalues.append(bvalues)
+    if len(frames) < 2:
+        return models + [model_dict_to_model(m) for m in model_dicts[1:]]
+    frame_ids = np.array(frame_ids)
+    frame_bvalues = np.array(frame_bvalues, dtype=float)
+    return Frames(
+     model_dicts[0], models[0], np.array(frames, dtype=float).reshape(
+      len(frames), len(keys), 3
+     ), None if (frame_ids == frame_ids[0]).all() else frame_ids, positions,
+     None if all(np.array_equal(b, frame_bvalues[0], equal_nan=True)
+      for b in frame_bvalues) else frame_bvalues,
+     [model_dict_to_model(m) for m in model_dicts[len(frames):]]
+    )
+
+
+def split_model_dict(model_dict):
+    """Separates a model dictionary into its topology and its atom positions.
+    Atoms are visited in a fixed order - polymer residues, then non-polymers,
+    then waters, each in dictionary order.
+
+    :param dict model_dict: the model dictionary.
+    :returns: a signature which is equal for models with the same topology,\
+    the category, het ID and atom ID of each atom, the atoms' coordinates,\
+    the atoms' IDs and the atoms' B-factors.
+    :rtype: ``tuple``"""
+
+    signature, keys, coordinates, ids, bvalues = [], [], [], [], []
+    for category, het_id, het in model_dict_hets(model_dict):
+        signature.append((category, het_id, {
+         key: value for key, value in het.items() if key != "atoms"
+        }))
+        for atom_id, atom in het["atoms"].items():
+            signature.append([value for key, value in atom.items()
+             if key not in ("x", "y", "z", "id", "bvalue")])
+            keys.append((category, het_id, atom_id))
+            coordinates.append((atom["x"], atom["y"], atom["z"]))
+            ids.append(atom_id)
+            bvalues.append(atom.get("bvalue"))
+    for chain_id, chain in model_dict["polymer"].items():
+        signature.append((chain_id, {
+         key: value for key, value in chain.items() if key != "residues"
+        }))
+    positions = {atom_id: position for position, atom_id in enumerate(ids)}
+    signature.append(sorted((positions.get(id1), positions.get(id2))
+     for id1, id2 in model_dict.get("bonds", [])))
+    return signature, keys, coordinates, ids, bvalues
+
+
+def model_dict_hets(model_dict):
+    """Yields every residue, ligand and water dictionary in a model
+    dictionary - polymer residues, then non-polymers, then waters, each in
+    dictionary order - with its category and ID.
+
+    :param dict model_dict: the model dictionary.
+    :rtype: ``generator``"""
+
+    for chain in model_dict["polymer"].values():
+        for het_id, het in chain["residues"].items():
+            yield "polymer", het_id, het
+    for category in ("non-polymer", "water"):
+        for het_id, het in model_dict[category].items():
+            yield category, het_id, het
+
+
+def replace_model_dict_atoms(model_dict, coordinates, ids=None, bvalues=None):
+    """Creates a copy of a model dictionary with new atom coordinates (and
+    optionally new atom IDs and B-factors), given in the order that
+    :py:func:`.model_dict_hets` visits atoms. Only the atom dictionaries (and
+    the bonds, if the IDs change) are copied - everything else is shared with
+    the original.
+
+    :param dict model_dict: the model dictionary to copy.
+    :param numpy.ndarray coordinates: the new coordinates.
+    :param ids: the new atom IDs.
+    :param bvalues: the new atom B-factors, with ``nan`` for missing ones.
+    :rtype: ``dict``"""
+
+    locations = iter(coordinates.tolist())
+    new_ids = None if ids is None else iter(ids.tolist())
+    new_bvalues = None if bvalues is None else iter(
+     [None if math.isnan(b) else b for b in bvalues.tolist()]
+    )
+    id_map = {}
+    def replace_atoms(het):
+        atoms = {}
+        for atom_id, atom in het["atoms"].items():
+            x, y, z = next(locations)
+            new_id = atom_id if new_ids is None else next(new_ids)
+            id_map[atom_id] = new_id
+            atoms[new_id] = {**atom, "x": x, "y": y, "z": z}
+            if new_bvalues is not None: atoms[new_id]["bvalue"] = next(new_bvalues)
+        return {**het, "atoms": atoms}
+    model_dict = {**model_dict, "polymer": {chain_id: {
+     **chain, "residues": {
+      het_id: replace_atoms(het) for het_id, het in chain["residues"].items()
+     }
+    } for chain_id, chain in model_dict["polymer"].items()}, **{
+     category: {het_id: replace_atoms(het)
+      for het_id, het in model_dict[category].items()}
+     for category in ("non-polymer", "water")
+    }}
+    if ids is not None and "bonds" in model_dict:
+        model_dict["bonds"] = [(id_map.get(id1, id1), id_map.get(id2, id2))
+         for id1, id2 in model_dict["bonds"]]
+    return model_dict
+
+
 def model_dict_to_model(model_dict):
     """Takes a model dictionary and turns it into a fully processed
     :py:class:`.Model` object.
@@ -240,9 +505,25 @@ def model_dict_to_model(model_dict):
     ligands = create_ligands(model_dict, chains)
     waters = create_ligands(model_dict, chains, water=True)
     model = Model(*(chains + ligands + waters))
+    add_bonds_to_model(model, model_dict.get("bonds", []))
     return model
 
 
+def add_bonds_to_model(model, bonds):
+    """Adds bonds between pairs of atom IDs to a :py:class:`.Model`'s edge
+    array. Bonds to atoms which aren't in the model - such as those at
+    alternate locations which weren't used - are ignored.
+
+    :param Model model: the model to update.
+    :param list bonds: the pairs of atom IDs that are bonded."""
+
+    if not bonds: return
+    model._build_index()
+    indices = {atom._id: index for index, atom in enumerate(model._atom_list)}
+    model._add_bonds([(indices[id1], indices[id2]) for id1, id2 in bonds
+     if id1 in indices and id2 in indices])
+
+
 def create_chains(model_dict):
     """Creates a list of :py:class:`.Chain` objects from a model dictionary.
 
@@ -395,7 +676,19 @@ COVALENT_RADII = {
  "PU": 1.87, "AM": 1.8, "CM": 1.69
 }
 
-METALS = [
+VDW_RADII = {
+ "H": 1.2, "HE": 1.4, "LI": 1.82, "BE": 1.53, "B": 1.92, "C": 1.7, "N": 1.55,
+ "O": 1.52, "F": 1.47, "NE": 1.54, "NA": 2.27, "MG": 1.73, "AL": 1.84,
+ "SI": 2.1, "P": 1.8, "S": 1.8, "CL": 1.75, "AR": 1.88, "K": 2.75, "CA": 2.31,
+ "NI": 1.63, "CU": 1.4, "ZN": 1.39, "GA": 1.87, "GE": 2.11, "AS": 1.85,
+ "SE": 1.9, "BR": 1.85, "KR": 2.02, "RB": 3.03, "SR": 2.49, "PD": 1.63,
+ "AG": 1.72, "CD": 1.58, "IN": 1.93, "SN": 2.17, "SB": 2.06, "TE": 2.06,
+ "I": 1.98, "XE": 2.16, "CS": 3.43, "BA": 2.68, "PT": 1.75, "AU": 1.66,
+ "HG": 1.55, "TL": 1.96, "PB": 2.02, "BI": 2.07, "PO": 1.97, "AT": 2.02,
+ "RN": 2.2, "FR": 3.48, "RA": 2.83, "U": 1.86
+}
+
+METALS = frozenset([
  "LI", "BE", "NA", "MG", "AL", "K", "CA", "SC", "TI", "V", "CR", "MN", "FE",
  "CO", "NI", "CU", "ZN", "HA", "RB", "SR", "Y", "ZR", "NB", "MO", "TC", "RU",
  "RH", "PD", "AG", "CD", "IN", "SN", "CS", "BA", "LA", "CE", "PR", "ND", "PM",
@@ -403,7 +696,7 @@ METALS = [
  "RE", "OS", "IR", "PT", "AU", "HG", "TL", "PB", "BI", "PO", "FR", "RA", "AC",
  "TH", "PA", "U", "NP", "PU", "AM", "CM", "BK", "CF", "ES", "FM", "MD", "NO",
  "LR", "RF", "DB", "SG", "BH", "HS", "MT", "DS", "RG", "CN", "UUT", "FL", "LV"
-]
+])
 
 FULL_NAMES = {
  "GLY": "glycine", "ALA": "alanine", "VAL": "valine", "LEU": "leucine",
@@ -414,6 +707,76 @@ FULL_NAMES = {
  "ARG": "arginine", "HIS": "histidine", "HOH": "water"
 }
 
+CHI_ATOMS = {
+ "ARG": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"),
+  ("CB", "CG", "CD", "NE"), ("CG", "CD", "NE", "CZ")),
+ "ASN": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "OD1")),
+ "ASP": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "OD1")),
+ "CYS": (("N", "CA", "CB", "SG"),),
+ "GLN": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"),
+  ("CB", "CG", "CD", "OE1")),
+ "GLU": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"),
+  ("CB", "CG", "CD", "OE1")),
+ "HIS": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "ND1")),
+ "ILE": (("N", "CA", "CB", "CG1"), ("CA", "CB", "CG1", "CD1")),
+ "LEU": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+ "LYS": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD"),
+  ("CB", "CG", "CD", "CE"), ("CG", "CD", "CE", "NZ")),
+ "MET": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "SD"),
+  ("CB", "CG", "SD", "CE")),
+ "PHE": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+ "PRO": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD")),
+ "SER": (("N", "CA", "CB", "OG"),),
+ "THR": (("N", "CA", "CB", "OG1"),),
+ "TRP": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+ "TYR": (("N", "CA", "CB", "CG"), ("CA", "CB", "CG", "CD1")),
+ "VAL": (("N", "CA", "CB", "CG1"),)
+}
+
+DONORS = {
+ "ALA": ("N",), "ARG": ("N", "NE", "NH1", "NH2"), "ASN": ("N", "ND2"),
+ "ASP": ("N",), "CYS": ("N", "SG"), "GLN": ("N", "NE2"), "GLU": ("N",),
+ "GLY": ("N",), "HIS": ("N", "ND1", "NE2"), "ILE": ("N",), "LEU": ("N",),
+ "LYS": ("N", "NZ"), "MET": ("N",), "PHE": ("N",), "PRO": (),
+ "SER": ("N", "OG"), "THR": ("N", "OG1"), "TRP": ("N", "NE1"),
+ "TYR": ("N", "OH"), "VAL": ("N",), "HOH": ("O",)
+}
+
+ACCEPTORS = {
+ "ALA": ("O", "OXT"), "ARG": ("O", "OXT"), "ASN": ("O", "OXT", "OD1"),
+ "ASP": ("O", "OXT", "OD1", "OD2"), "CYS": ("O", "OXT"),
+ "GLN": ("O", "OXT", "OE1"), "GLU": ("O", "OXT", "OE1", "OE2"),
+ "GLY": ("O", "OXT"), "HIS": ("O", "OXT", "ND1", "NE2"), "ILE": ("O", "OXT"),
+ "LEU": ("O", "OXT"), "LYS": ("O", "OXT"), "MET": ("O", "OXT", "SD"),
+ "PHE": ("O", "OXT"), "PRO": ("O", "OXT"), "SER": ("O", "OXT", "OG"),
+ "THR": ("O", "OXT", "OG1"), "TRP": ("O", "OXT"), "TYR": ("O", "OXT", "OH"),
+ "VAL": ("O", "OXT"), "HOH": ("O",)
+}
+
+CATIONS = {
+ "ARG": ("NE", "NH1", "NH2"), "LYS": ("NZ",), "HIS": ("ND1", "NE2")
+}
+
+ANIONS = {
+ "ASP": ("OD1", "OD2"), "GLU": ("OE1", "OE2")
+}
+
+COORDINATING_ELEMENTS = frozenset(["N", "O", "S", "SE", "CL", "BR", "I"])
+
+COORDINATION_GEOMETRIES = {
+ 2: {"linear": (180,)},
+ 3: {"trigonal planar": (120,) * 3, "T-shaped": (90, 90, 180)},
+ 4: {"tetrahedral": (109.47,) * 6, "square planar": (90,) * 4 + (180,) * 2},
+ 5: {
+  "trigonal bipyramidal": (90,) * 6 + (120,) * 3 + (180,),
+  "square pyramidal": (90,) * 8 + (180,) * 2
+ },
+ 6: {
+  "octahedral": (90,) * 12 + (180,) * 3,
+  "trigonal prismatic": (81.79,) * 9 + (135.58,) * 6
+ }
+}
+
 CODES = {
  "VAL": "V", "ILE": "I", "LEU": "L", "GLU": "E", "GLN": "Q", "ASP": "D",
  "ASN": "N", "HIS": "H", "TRP": "W", "PHE": "F", "TYR": "Y", "ARG": "R",
@@ -0,0 +1,192 @@
+"""Contains the Ensemble class, for analysing many conformations at once."""
+
+import numpy as np
+from .superposition import pair_atoms, kabsch, rmsd_matrix
+
+class Ensemble:
+    """A view of several structures with the same atoms - such as the models of
+    an NMR file - as a single array of coordinates, with the shape (structures,
+    atoms, 3). Atoms are paired once, when the ensemble is made, and all the
+    structures then share the first structure's atoms as their topology.
+
+    The coordinates are a snapshot: moving the structures afterwards does not
+    change the ensemble, and superposing the ensemble does not move the
+    structures.
+
+    :param \\*structures: the structures to combine.
+    :raises ValueError: if the structures have different numbers of atoms."""
+
+    def __init__(self, *structures):
+        if not structures:
+            raise ValueError("An ensemble needs at least one structure")
+        self._structures = structures
+        self._atoms = structures[0]._atom_tuple()
+        self._orders = pair_atoms(structures)
+        self._coordinates = np.empty((len(structures), len(self._atoms), 3))
+        for layer, structure, order in zip(
+         self._coordinates, structures, self._orders
+        ):
+            layer[:] = structure._atom_arrays()[0][order]
+
+
+    @classmethod
+    def from_coordinates(cls, structures, coordinates):
+        """Creates an ensemble from a coordinate array whose atoms are already
+        in the order of the first structure's atoms, without pairing any atoms.
+        The structures can be any sequence, such as a :py:class:`.Frames`
+        sequence - only the first is needed to make the ensemble.
+
+        :param structures: the structures the coordinates belong to.
+        :param numpy.ndarray coordinates: an array of shape (structures,\
+        atoms, 3).
+        :rtype: ``Ensemble``"""
+
+        ensemble = cls.__new__(cls)
+        ensemble._structures = structures
+        ensemble._atoms = structures[0]._atom_tuple()
+        ensemble._orders = None
+        ensemble._coordinates = np.array(coordinates, dtype=float)
+        return ensemble
+
+
+    def __repr__(self):
+        return "<Ensemble ({} structure{}, {} atom{})>".format(
+         len(self._structures), "" if len(self._structures) == 1 else "s",
+         len(self._atoms), "" if len(self._atoms) == 1 else "s"
+        )
+
+
+    def __len__(self):
+        return len(self._structures)
+
+
+    @property
+    def structures(self):
+        """The structures the ensemble was made from.
+
+        :rtype: ``tuple``"""
+
+        return tuple(self._structures)
+
+
+    @property
+    def atoms(self):
+        """The atoms of the ensemble's topology, in the order of the
+        coordinate array's second axis.
+
+        :rtype: ``tuple``"""
+
+        return self._atoms
+
+
+    @property
+    def coordinates(self):
+        """The ensemble's coordinates, as an array with the shape (structures,
+        atoms, 3).
+
+        :rtype: ``numpy.ndarray``"""
+
+        return self._coordinates
+
+
+    def superpose(self, reference=0):
+        """Superposes every member of the ensemble onto one of its members. Only
+        the ensemble's coordinates are changed - the structures themselves do
+        not move.
+
+        :param int reference: the position of the member to superpose onto.
+        :returns: the RMSD of each member from the reference.
+        :rtype: ``numpy.ndarray``"""
+
+        fixed = self._coordinates[reference].copy()
+        rotations, rmsds = kabsch(self._coordinates, fixed)
+        self._coordinates -= self._coordinates.mean(axis=1, keepdims=True)
+        self._coordinates[:] = self._coordinates @ rotations + fixed.mean(axis=0)
+        return rmsds
+
+
+    def mean_coordinates(self):
+        """Returns the mean position of every atom across the ensemble.
+
+        :rtype: ``numpy.ndarray``"""
+
+        return self._coordinates.mean(axis=0)
+
+
+    def median_coordinates(self):
+        """Returns the median position of every atom across the ensemble, taking
+        the median of each dimension separately.
+
+        :rtype: ``numpy.ndarray``"""
+
+        return np.median(self._coordinates, axis=0)
+
+
+    def rmsf(self):
+        """Returns the root mean square fluctuation of every atom about its
+        mean position. The ensemble should usually be superposed first.
+
+        :rtype: ``numpy.ndarray``"""
+
+        deviations = self._coordinates - self.mean_coordinates()
+        return np.sqrt(np.einsum("nak,nak->a", deviations, deviations) / len(self))
+
+
+    def rmsd_matrix(self):
+        """Returns the RMSD between every pair of members of the ensemble, after
+        optimal superposition.
+
+        :rtype: ``numpy.ndarray``"""
+
+        return rmsd_matrix(self._coordinates)
+
+
+    def atom_values(self, attribute):
+        """Returns some attribute of every atom in every member of the ensemble,
+        as an array with the shape (structures, atoms).
+
+        :param str attribute: the atom attribute to get, such as ``"bvalue"``.
+        :rtype: ``numpy.ndarray``"""
+
+        if self._orders is None:
+            self._orders = pair_atoms(self._structures)
+        return np.array([[
+         getattr(atoms[index], attribute) for index in order.tolist()
+        ] for atoms, order in zip(
+         (structure._atom_tuple() for structure in self._structures),
+         self._orders
+        )])
+
+
+    def per_residue(self, values, statistic="mean"):
+        """Aggregates some per-atom values (such as those from :py:meth:`.rmsf`
+        or :py:meth:`.atom_values`) over each residue or ligand of the
+        ensemble's topology. Values can have any number of leading axes, but
+        the last must be the atoms axis.
+
+        :param numpy.ndarray values: the values to aggregate.
+        :param str statistic: ``"mean"``, ``"sum"``, ``"min"`` or ``"max"``.
+        :raises ValueError: if the statistic is not recognised.
+        :returns: the residues and ligands, and an array with the same shape\
+        as the values but with one entry per residue instead of per atom.
+        :rtype: ``tuple``"""
+
+        ufuncs = {
+         "mean": np.add, "sum": np.add, "min": np.minimum, "max": np.maximum
+        }
+        if statistic not in ufuncs:
+            raise ValueError("'{}' is not a recognised statistic".format(statistic))
+        positions, hets = {}, []
+        for atom in self._atoms:
+            if atom.het not in positions:
+                positions[atom.het] = len(hets)
+                hets.append(atom.het)
+        groups = np.array([positions[atom.het] for atom in self._atoms], dtype=int)
+        values = np.moveaxis(np.asarray(values, dtype=float), -1, 0)
+        initial = {"min": np.inf, "max": -np.inf}.get(statistic, 0)
+        totals = np.full((len(hets),) + values.shape[1:], initial, dtype=float)
+        ufuncs[statistic].at(totals, groups, values)
+        if statistic == "mean":
+            counts = np.bincount(groups, minlength=len(hets))
+            totals /= counts.reshape((-1,) + (1,) * (totals.ndim - 1))
+        return tuple(hets), np.moveaxis(totals, 0, -1)
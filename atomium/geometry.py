@@ -0,0 +1,82 @@
+"""Contains functions for measuring many geometric terms at once."""
+
+import numpy as np
+
+def measure(coordinates, indices):
+    """Measures many geometric terms at once, each defined by the indices of
+    some rows of a coordinate array. Pairs of indices give distances, triples
+    give angles and quadruples give dihedral angles.
+
+    :param numpy.ndarray coordinates: an (atoms, 3) array of coordinates.
+    :param numpy.ndarray indices: an (n, 2), (n, 3) or (n, 4) array of\
+    indices into the coordinates.
+    :raises ValueError: if the terms aren't pairs, triples or quadruples.
+    :rtype: ``numpy.ndarray``"""
+
+    indices = np.asarray(indices, dtype=int)
+    if indices.size == 0: return np.zeros(0)
+    if indices.ndim != 2 or indices.shape[1] not in (2, 3, 4):
+        raise ValueError(
+         "Terms of shape {} are not pairs, triples or quadruples".format(
+          indices.shape
+         )
+        )
+    function = {2: distances, 3: angles, 4: dihedrals}[indices.shape[1]]
+    return function(*np.asarray(coordinates, dtype=float)[indices.T])
+
+
+def distances(points1, points2):
+    """Calculates the distance between two sets of points, one distance per
+    row.
+
+    :param numpy.ndarray points1: an (n, 3) array of first points.
+    :param numpy.ndarray points2: an (n, 3) array of second points.
+    :rtype: ``numpy.ndarray``"""
+
+    vectors = np.asarray(points1, dtype=float).reshape(-1, 3) \
+     - np.asarray(points2, dtype=float).reshape(-1, 3)
+    return np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+
+
+def angles(points1, points2, points3):
+    """Calculates the angles made by three sets of points, one angle per row.
+    Each angle is at the second point, between the vectors to the first and
+    third points, in radians. If either vector has no length the angle is 0.
+
+    :param numpy.ndarray points1: an (n, 3) array of first points.
+    :param numpy.ndarray points2: an (n, 3) array of second (vertex) points.
+    :param numpy.ndarray points3: an (n, 3) array of third points.
+    :rtype: ``numpy.ndarray``"""
+
+    vertices = np.asarray(points2, dtype=float).reshape(-1, 3)
+    vectors1 = np.asarray(points1, dtype=float).reshape(-1, 3) - vertices
+    vectors2 = np.asarray(points3, dtype=float).reshape(-1, 3) - vertices
+    lengths = np.linalg.norm(vectors1, axis=1) * np.linalg.norm(vectors2, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cosines = np.einsum("ij,ij->i", vectors1, vectors2) / lengths
+    return np.where(
+     lengths == 0, 0, np.arccos(np.clip(cosines, -1.0, 1.0))
+    )
+
+
+def dihedrals(points1, points2, points3, points4):
+    """Calculates the dihedral angles defined by four sets of points, one angle
+    per row. Each angle is the rotation about the bond from the second point
+    to the third, in radians between -π and π, and is positive when looking
+    down that bond the first point has to turn clockwise to eclipse the
+    fourth. Rows with any missing (NaN) coordinates give NaN.
+
+    :param numpy.ndarray points1: an (n, 3) array of first points.
+    :param numpy.ndarray points2: an (n, 3) array of second points.
+    :param numpy.ndarray points3: an (n, 3) array of third points.
+    :param numpy.ndarray points4: an (n, 3) array of fourth points.
+    :rtype: ``numpy.ndarray``"""
+
+    points = [np.asarray(p, dtype=float).reshape(-1, 3) for p in (
+     points1, points2, points3, points4
+    )]
+    bond1, bond2, bond3 = [b - a for a, b in zip(points, points[1:])]
+    normal1, normal2 = np.cross(bond1, bond2), np.cross(bond2, bond3)
+    y = np.linalg.norm(bond2, axis=1) * np.einsum("ij,ij->i", bond1, normal2)
+    x = np.einsum("ij,ij->i", normal1, normal2)
+    return np.arctan2(y, x)
@@ -0,0 +1,164 @@
+"""Contains functions for working with bond graphs, stored as compressed
+sparse row (CSR) adjacency arrays - an offsets array, where the neighbours of
+atom ``i`` are ``neighbours[offsets[i]:offsets[i + 1]]``, and a neighbours
+array."""
+
+import numpy as np
+from collections import deque
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components as components
+from scipy.sparse.csgraph import breadth_first_order
+
+def csr_adjacency(edges, count):
+    """Turns an array of undirected edges into CSR adjacency arrays. Every
+    edge appears twice in the neighbours array, once for each of its atoms,
+    and each atom's neighbours are sorted.
+
+    :param numpy.ndarray edges: an (n, 2) array of atom indices.
+    :param int count: the number of atoms.
+    :returns: the offsets and neighbours arrays.
+    :rtype: ``tuple``"""
+
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    sources = np.concatenate([edges[:, 0], edges[:, 1]])
+    targets = np.concatenate([edges[:, 1], edges[:, 0]])
+    order = np.lexsort((targets, sources))
+    offsets = np.zeros(count + 1, dtype=int)
+    np.cumsum(np.bincount(sources, minlength=count), out=offsets[1:])
+    return offsets, targets[order]
+
+
+def connected_components(offsets, neighbours):
+    """Labels every atom of a bond graph with the connected component it
+    belongs to. Components are numbered in order of their lowest atom.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :returns: the number of components and each atom's component.
+    :rtype: ``tuple``"""
+
+    count, labels = components(_matrix(offsets, neighbours), directed=False)
+    _, first = np.unique(labels, return_index=True)
+    return count, np.argsort(np.argsort(first))[labels]
+
+
+def shortest_path(offsets, neighbours, source, target):
+    """Finds one of the shortest paths through a bond graph between two atoms,
+    with a breadth-first search.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :param int source: the atom to start at.
+    :param int target: the atom to finish at.
+    :returns: the atoms along the path, including both ends, or ``None`` if\
+    the atoms aren't connected.
+    :rtype: ``numpy.ndarray``"""
+
+    _, predecessors = breadth_first_order(
+     _matrix(offsets, neighbours), source, directed=False,
+     return_predecessors=True
+    )
+    if source != target and predecessors[target] < 0: return None
+    path = [target]
+    while path[-1] != source: path.append(predecessors[path[-1]])
+    return np.array(path[::-1], dtype=int)
+
+
+def ring_atoms(offsets, neighbours):
+    """Works out which atoms could be part of a ring, by repeatedly removing
+    atoms with fewer than two remaining neighbours until none are left. The
+    atoms that remain are those in rings, and those on paths between rings.
+
+    Atoms are peeled from a queue as their degree drops below two, so each
+    atom and bond is only visited once.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :rtype: ``numpy.ndarray``"""
+
+    degrees = np.diff(offsets).tolist()
+    remaining = np.ones(len(degrees), dtype=bool)
+    queue = deque(i for i, degree in enumerate(degrees) if degree < 2)
+    offsets, neighbours = offsets.tolist(), neighbours.tolist()
+    while queue:
+        atom = queue.popleft()
+        if not remaining[atom]: continue
+        remaining[atom] = False
+        for neighbour in neighbours[offsets[atom]:offsets[atom + 1]]:
+            degrees[neighbour] -= 1
+            if degrees[neighbour] == 1 and remaining[neighbour]:
+                queue.append(neighbour)
+    return remaining
+
+
+def rings(offsets, neighbours, max_size=8):
+    """Finds the rings in a bond graph. For every bond that could be in a ring,
+    the smallest ring containing it is found with a breadth-first search
+    around the bond, and the distinct rings found are returned. For fused
+    ring systems this gives each of the individual rings rather than the
+    larger rings around them.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :param int max_size: the largest ring to look for.
+    :returns: the rings, each as an array of atoms in ring order, sorted by\
+    their lowest atom.
+    :rtype: ``list``"""
+
+    candidates = ring_atoms(offsets, neighbours)
+    found = {}
+    for atom in np.flatnonzero(candidates).tolist():
+        for other in neighbours[offsets[atom]:offsets[atom + 1]].tolist():
+            if other <= atom or not candidates[other]: continue
+            ring = _smallest_ring(
+             offsets, neighbours, candidates, atom, other, max_size
+            )
+            if ring is not None: found.setdefault(frozenset(ring), ring)
+    return sorted(
+     (np.array(ring, dtype=int) for ring in found.values()),
+     key=lambda ring: (ring.min(), len(ring))
+    )
+
+
+def _smallest_ring(offsets, neighbours, allowed, atom, other, max_size):
+    """Finds the smallest ring containing the bond between two atoms, by
+    searching for the shortest path between them that doesn't use the bond.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :param numpy.ndarray allowed: which atoms the path can go through.
+    :param int atom: the bond's first atom.
+    :param int other: the bond's second atom.
+    :param int max_size: the largest ring to look for.
+    :returns: the ring's atoms in order, or ``None`` if there is no ring.
+    :rtype: ``list``"""
+
+    previous, queue = {other: None}, deque([(other, 1)])
+    while queue:
+        current, size = queue.popleft()
+        if size >= max_size: continue
+        for next_atom in neighbours[offsets[current]:offsets[current + 1]].tolist():
+            if next_atom == atom and current != other:
+                ring = [current]
+                while previous[ring[-1]] is not None:
+                    ring.append(previous[ring[-1]])
+                return [atom] + ring
+            if next_atom not in previous and next_atom != atom \
+             and allowed[next_atom]:
+                previous[next_atom] = current
+                queue.append((next_atom, size + 1))
+    return None
+
+
+def _matrix(offsets, neighbours):
+    """Wraps CSR adjacency arrays in a SciPy sparse matrix.
+
+    :param numpy.ndarray offsets: the CSR offsets array.
+    :param numpy.ndarray neighbours: the CSR neighbours array.
+    :rtype: ``scipy.sparse.csr_matrix``"""
+
+    count = len(offsets) - 1
+    return csr_matrix(
+     (np.ones(len(neighbours), dtype=np.int8), neighbours, offsets),
+     shape=(count, count)
+    )
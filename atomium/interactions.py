@@ -0,0 +1,66 @@
+"""Contains functions for finding non-covalent interactions between atoms."""
+
+import numpy as np
+from .spatial import CellList
+from .geometry import angles
+
+def close_pairs(coordinates, first, second, cutoff):
+    """Finds every pair of atoms, one from each of two groups, which are
+    within some distance of each other, with a :py:class:`.CellList` of the
+    second group. An atom in both groups is never paired with itself.
+
+    :param numpy.ndarray coordinates: an (atoms, 3) array of coordinates.
+    :param numpy.ndarray first: the indices of the first group's atoms.
+    :param numpy.ndarray second: the indices of the second group's atoms.
+    :param float cutoff: the distance cutoff to use.
+    :returns: the indices of the first atoms, the indices of the second atoms\
+    and the distances between them, as three arrays.
+    :rtype: ``tuple``"""
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    first = np.asarray(first, dtype=int)
+    second = np.asarray(second, dtype=int)
+    if not len(first) or not len(second):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    queries, points, distances = CellList(coordinates[second], cutoff).pairs(
+     coordinates[first], cutoff
+    )
+    first, second = first[queries], second[points]
+    keep = first != second
+    return first[keep], second[keep], distances[keep]
+
+
+def antecedent_angles(coordinates, atoms, partners, offsets, neighbours,
+                      allowed=None):
+    """Takes some pairs of atoms and, for each pair, finds the smallest angle
+    at the first atom between the second atom and any of the atoms bonded to
+    the first (its antecedents). Pairs whose first atom has no antecedents get
+    NaN.
+
+    :param numpy.ndarray coordinates: an (atoms, 3) array of coordinates.
+    :param numpy.ndarray atoms: the index of each pair's first atom.
+    :param numpy.ndarray partners: the index of each pair's second atom.
+    :param numpy.ndarray offsets: the CSR offsets array of the bonds.
+    :param numpy.ndarray neighbours: the CSR neighbours array of the bonds.
+    :param numpy.ndarray allowed: if given, a boolean mask of which atoms can\
+    be antecedents.
+    :rtype: ``numpy.ndarray``"""
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    atoms = np.asarray(atoms, dtype=int)
+    partners = np.asarray(partners, dtype=int)
+    counts = offsets[atoms + 1] - offsets[atoms]
+    pairs = np.repeat(np.arange(len(atoms)), counts)
+    antecedents = neighbours[np.arange(counts.sum()) + np.repeat(
+     offsets[atoms] - np.cumsum(counts) + counts, counts
+    )]
+    if allowed is not None:
+        keep = allowed[antecedents]
+        pairs, antecedents = pairs[keep], antecedents[keep]
+    minimum = np.full(len(atoms), np.inf)
+    np.minimum.at(minimum, pairs, angles(
+     coordinates[antecedents], coordinates[atoms[pairs]],
+     coordinates[partners[pairs]]
+    ))
+    minimum[np.isinf(minimum)] = np.nan
+    return minimum
@@ -6,7 +6,7 @@ from datetime import datetime
 import numpy as np
 import valerius
 from itertools import groupby
-from .data import CODES, Chain, Residue, Ligand
+from .data import CODES, Chain, Residue, Ligand, model_dict_hets
 
 def mmcif_string_to_mmcif_dict(filestring):
     """Takes a .cif filestring and turns into a ``dict`` which represents its
@@ -436,6 +436,69 @@ def update_models_list(mmcif_dict, data_dict):
     for model in data_dict["models"]:
         add_sequences_to_polymers(model, mmcif_dict, entities)
         add_secondary_structure_to_polymers(model, secondary_structure)
+        add_bonds_to_model(model, mmcif_dict)
+
+
+def add_bonds_to_model(model, mmcif_dict):
+    """Adds a list of bonded pairs of atom IDs to a model dictionary. Bonds
+    within residues and ligands come from the ``chem_comp_bond`` templates of
+    their components, and bonds between them from ``struct_conn`` - hydrogen
+    bonds and bonds to symmetry mates are skipped. Atoms at different
+    alternate locations are never bonded to each other.
+
+    :param dict model: the model to update.
+    :param dict mmcif_dict: the .mmcif dict to read."""
+
+    templates = {}
+    for bond in mmcif_dict.get("chem_comp_bond", []):
+        templates.setdefault(bond["comp_id"], []).append(
+         (bond["atom_id_1"], bond["atom_id_2"])
+        )
+    names, bonds = {}, set()
+    for _, het_id, het in model_dict_hets(model):
+        names[het_id] = {}
+        for atom_id, atom in het["atoms"].items():
+            names[het_id].setdefault(atom["name"], []).append(
+             (atom_id, atom["alt_loc"])
+            )
+        for name1, name2 in templates.get(het["name"], []):
+            bonds.update(pair_atom_ids(
+             names[het_id].get(name1, []), names[het_id].get(name2, [])
+            ))
+    for conn in mmcif_dict.get("struct_conn", []):
+        if conn["conn_type_id"] == "hydrog": continue
+        if conn.get("ptnr1_symmetry", "1_555") != conn.get("ptnr2_symmetry", "1_555"):
+            continue
+        partners = []
+        for n in (1, 2):
+            insert = conn.get(f"pdbx_ptnr{n}_PDB_ins_code", "?")
+            het_id = "{}.{}{}".format(
+             conn[f"ptnr{n}_auth_asym_id"], conn[f"ptnr{n}_auth_seq_id"],
+             "" if insert in "?." else insert
+            )
+            alt_loc = conn.get(f"pdbx_ptnr{n}_label_alt_id", "?")
+            partners.append([(atom_id, alt) for atom_id, alt in names.get(
+             het_id, {}
+            ).get(conn[f"ptnr{n}_label_atom_id"], [])
+             if alt_loc in "?." or alt == alt_loc])
+        bonds.update(pair_atom_ids(*partners))
+    model["bonds"] = sorted(bonds)
+
+
+def pair_atom_ids(atoms1, atoms2):
+    """Takes two lists of atom IDs and alternate locations which are possible
+    partners in a bond, and returns the pairs of IDs which can be bonded -
+    those whose alternate locations don't conflict. Each pair has the lower
+    ID first.
+
+    :param list atoms1: the first partners.
+    :param list atoms2: the second partners.
+    :rtype: ``list``"""
+
+    return [(min(id1, id2), max(id1, id2)) for id1, alt1 in atoms1
+     for id2, alt2 in atoms2 if id1 != id2 and (
+      alt1 is None or alt2 is None or alt1 == alt2
+     )]
 
 
 def make_aniso(mmcif_dict):
@@ -665,6 +728,7 @@ def structure_to_mmcif_string(structure):
     update_lines_with_structures(lines, chains, ligands, waters, entities)
     lines += atom_lines
     if len(aniso_lines) > 9: lines += aniso_lines
+    update_lines_with_bonds(lines, structure)
     return "\n".join(lines)
 
 
@@ -700,8 +764,7 @@ def atom_to_atom_line(atom):
      ) else atom.chain._internal_id if atom.chain else ".",
      res_num, res_insert, atom.location[0], atom.location[1], atom.location[2],
      atom.bvalue, atom.charge,
-     res_num, atom.het._name if atom.het else "?",
-     atom.chain.id if atom.chain else ".", name
+     res_num, atom.het._name if atom.het else "?", get_chain_id(atom), name
     )
 
 
@@ -714,6 +777,18 @@ def get_atom_name(atom):
     return '"{}"'.format(atom._name) if "'" in atom._name else atom._name
 
 
+def get_chain_id(atom):
+    """Gets the chain ID an atom is written under - its chain's ID or, if its
+    het has no chain, the chain part of the het's own ID.
+
+    :param Atom atom: the atom to read.
+    :rtype: ``str``"""
+
+    if atom.chain: return atom.chain.id
+    if atom.het and "." in str(atom.het.id): return atom.het.id.split(".")[0]
+    return "."
+
+
 def split_residue_id(atom):
     """Takes an atom and splits its het ID into components.
 
@@ -741,7 +816,7 @@ def create_entities(chains, ligands, waters):
         for e in entities:
             if isinstance(e, Chain) and e.sequence == chain.sequence: break
         else: entities.append(chain)
-    for ligand in sorted(ligands, key=lambda l: l.chain.id):
+    for ligand in sorted(ligands, key=lambda l: get_chain_id(l.atom())):
         for e in entities:
             if isinstance(e, Ligand) and e._name == ligand._name: break
         else: entities.append(ligand)
@@ -799,3 +874,53 @@ def update_lines_with_structures(lines, chains, ligands, waters, entities):
                     lines.append("{} {}".format(water._internal_id, i))
                     water_chains.append(water.chain)
                     break
+
+
+def update_lines_with_bonds(lines, structure):
+    """Updates a list of .cif lines with a structure's bonds. Bonds within a
+    residue or ligand become ``chem_comp_bond`` templates for its component,
+    and bonds which cross from one residue or ligand to another become
+    ``struct_conn`` records, labelled as disulphide bridges, metal
+    coordination or ordinary covalent bonds.
+
+    :param list lines: the list of lines to update.
+    :param AtomStructure structure: the structure to read bonds from."""
+
+    bonds = sorted(
+     (sorted(bond, key=lambda a: a.id) for bond in structure.bonds()),
+     key=lambda bond: (bond[0].id, bond[1].id)
+    )
+    templates, connections = {}, []
+    for atoms in bonds:
+        if atoms[0].het is not None and atoms[0].het is atoms[1].het:
+            templates.setdefault((atoms[0].het._name, tuple(sorted(
+             get_atom_name(atom) for atom in atoms
+            ))), None)
+        else:
+            connections.append(atoms)
+    if templates:
+        lines += ["#", "loop_"] + ["_chem_comp_bond." + field for field in [
+         "comp_id", "atom_id_1", "atom_id_2", "pdbx_ordinal"
+        ]]
+        for index, (name, names) in enumerate(templates, start=1):
+            lines.append(" ".join([name, *names, str(index)]))
+    if not connections: return
+    lines += ["#", "loop_"] + ["_struct_conn." + field for field in [
+     "id", "conn_type_id", "ptnr1_label_comp_id", "ptnr1_label_atom_id",
+     "pdbx_ptnr1_PDB_ins_code", "ptnr1_auth_asym_id", "ptnr1_auth_seq_id",
+     "ptnr2_label_comp_id", "ptnr2_label_atom_id", "pdbx_ptnr2_PDB_ins_code",
+     "ptnr2_auth_asym_id", "ptnr2_auth_seq_id"
+    ]]
+    for index, atoms in enumerate(connections, start=1):
+        conn_type = "metalc" if any(a.is_metal for a in atoms) else "disulf" \
+         if all(a.element == "S" for a in atoms) else "covale"
+        partners = []
+        for atom in atoms:
+            number, insert = split_residue_id(atom)
+            partners += [
+             atom.het._name if atom.het else "?", get_atom_name(atom), insert,
+             get_chain_id(atom), number
+            ]
+        lines.append(" ".join(
+         ["{}{}".format(conn_type, index), conn_type] + partners
+        ))
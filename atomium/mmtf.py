@@ -2,6 +2,7 @@
 
 import msgpack
 import struct
+import numpy as np
 from collections import deque
 from datetime import datetime
 from .mmcif import get_structure_from_atom, create_entities, split_residue_id
@@ -192,14 +193,22 @@ def update_models_list(mmtf_dict, data_dict):
     :param dict data_dict: the data dictionary to update."""
 
     atoms = get_atoms_list(mmtf_dict)
+    bonds = get_bonds_array(mmtf_dict)
+    ids = np.array(mmtf_dict["atomIdList"], dtype=int)
     group_definitions = get_group_definitions_list(mmtf_dict)
     groups = get_groups_list(mmtf_dict, group_definitions)
     chains = get_chains_list(mmtf_dict, groups)
     for model_num in range(mmtf_dict["numModels"]):
+        start = len(ids) - len(atoms)
         model = {"polymer": {}, "non-polymer": {}, "water": {}, "branched": {}}
         for chain_num in range(mmtf_dict["chainsPerModel"][model_num]):
             chain = chains[chain_num]
             add_chain_to_model(chain, model, atoms)
+        end = len(ids) - len(atoms)
+        model_bonds = bonds[((bonds >= start) & (bonds < end)).all(axis=1)]
+        model["bonds"] = [tuple(bond) for bond in np.unique(
+         np.sort(ids[model_bonds], axis=1), axis=0
+        ).tolist()]
         data_dict["models"].append(model)
 
 
@@ -220,6 +229,37 @@ def get_atoms_list(mmtf_dict):
     )]
 
 
+def get_bonds_array(mmtf_dict):
+    """Decodes all the bonds in a .mmtf dictionary into a single (n, 2) array
+    of atom positions in the file's atom lists. The bonds within groups are
+    stored once for each type of group, and are expanded into every group of
+    that type at once, before the bonds between groups are added.
+
+    :param dict mmtf_dict: the .mmtf dictionary to read.
+    :rtype: ``numpy.ndarray``"""
+
+    group_list = mmtf_dict["groupList"]
+    types = np.array(mmtf_dict["groupTypeList"], dtype=int)
+    sizes = np.array([len(g["atomNameList"]) for g in group_list], dtype=int)
+    templates = [np.array(
+     g.get("bondAtomList", []), dtype=int
+    ).reshape(-1, 2) for g in group_list]
+    counts = np.array([len(t) for t in templates], dtype=int)
+    template_starts = np.cumsum(counts) - counts
+    group_sizes, group_counts = sizes[types], counts[types]
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    rows = np.arange(group_counts.sum()) + np.repeat(
+     template_starts[types] - np.cumsum(group_counts) + group_counts,
+     group_counts
+    )
+    within = np.concatenate(templates + [np.zeros((0, 2), dtype=int)])[rows] \
+     + np.repeat(group_starts, group_counts)[:, None]
+    between = np.array(
+     mmtf_dict.get("bondAtomList", []), dtype=int
+    ).reshape(-1, 2)
+    return np.concatenate([within, between])
+
+
 def get_group_definitions_list(mmtf_dict):
     """Gets a list of group definitions from the .mmtf dict and packs its atom
     attributes into atoms dicts.
@@ -395,6 +435,7 @@ def structure_to_mmtf_string(structure):
     groups_per_chain = get_groups_per_chain(chains, ligands, waters)
     group_types, group_ids, groups, ins = get_groups(chains, ligands, waters)
     x, y, z, alt, bfactor, ids, occupancy = zip(*properties)
+    bond_atoms = get_bond_atoms(structure)
     chain_count = len(chains) + len(ligands) + len(set(l.chain for l in waters))
     d = {
      "numModels": 1, "numChains": chain_count, "chainsPerModel": [chain_count],
@@ -402,7 +443,8 @@ def structure_to_mmtf_string(structure):
      "bFactorList": bfactor, "atomIdList": ids, "occupancyList": occupancy,
      "entityList": entity_list, "chainIdList": chain_ids, "insCodeList": ins,
      "chainNameList": chain_names, "groupsPerChain": groups_per_chain,
-     "groupList": groups, "groupIdList": group_ids, "groupTypeList": group_types
+     "groupList": groups, "groupIdList": group_ids, "groupTypeList": group_types,
+     "numBonds": len(bond_atoms) // 2, "bondAtomList": bond_atoms
     }
     return msgpack.packb(d)
 
@@ -428,6 +470,19 @@ def get_structures(structure):
     return (chains, ligands, waters, atom_properties, entities)
 
 
+def get_bond_atoms(structure):
+    """Takes an atomic structure and creates a flat list of the positions of
+    its bonded atoms, two per bond, in the order the atoms are packed in.
+
+    :param AtomStructure structure: the structure to unpack.
+    :rtype: ``list``"""
+
+    positions = {atom: index for index, atom in enumerate(
+     sorted(structure.atoms(), key=lambda a: a.id)
+    )}
+    return [positions[atom] for bond in structure.bonds() for atom in bond]
+
+
 def get_entity_list(entities, chains, ligands, waters):
     """Takes a list of entity objects, as well as the objects they represent,
     and turns them into a list of .mmtf dictionaries.
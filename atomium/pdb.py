@@ -196,13 +196,16 @@ def update_models_list(pdb_dict, data_dict):
     sequences = make_sequences(pdb_dict)
     secondary_structure = make_secondary_structure(pdb_dict)
     full_names = get_full_names(pdb_dict)
+    bonds = make_bonds(pdb_dict)
     for model_lines in pdb_dict["MODEL"]:
         aniso = make_aniso(model_lines)
         last_ter = get_last_ter_line(model_lines)
         model = {"polymer": {}, "non-polymer": {}, "water": {}}
         count = 0
+        atom_ids = set()
         for index, line in enumerate(model_lines):
             if line[:6] in ["ATOM  ", "HETATM"]:
+                atom_ids.add(int(line[6:11]))
                 chain_id = line[21] if index < last_ter else id_from_line(line)
                 res_id = id_from_line(line)
                 if index < last_ter:
@@ -214,6 +217,9 @@ def update_models_list(pdb_dict, data_dict):
                 chain["sequence"] = sequences.get(chain_id, "")
         add_secondary_structure_to_polymers(model, secondary_structure)
         add_annotation_to_polymers(model, pdb_dict)
+        model["bonds"] = [
+         bond for bond in bonds if bond[0] in atom_ids and bond[1] in atom_ids
+        ]
         data_dict["models"].append(model)
 
 
@@ -476,6 +482,26 @@ def get_full_names(pdb_dict):
     return full_names
 
 
+def make_bonds(pdb_dict):
+    """Creates a list of bonded pairs of atom IDs from the CONECT records. Each
+    bond is only listed once, with the lower ID first.
+
+    :param dict pdb_dict: the .pdb dict to read.
+    :rtype: ``list``"""
+
+    bonds = set()
+    for line in pdb_dict.get("CONECT", []):
+        try:
+            atom = int(line[6:11])
+        except ValueError: continue
+        for start in range(11, 31, 5):
+            try:
+                partner = int(line[start:start + 5])
+            except ValueError: continue
+            if partner != atom: bonds.add((min(atom, partner), max(atom, partner)))
+    return sorted(bonds)
+
+
 def make_aniso(model_lines):
     """Creates a mapping of chain IDs to anisotropy, by parsing ANISOU records.
 
@@ -622,6 +648,7 @@ def structure_to_pdb_string(structure):
           isinstance(atoms[i + 1].het, Ligand)):
             last = lines[-1]
             lines.append(f"TER   {last[6:11]}      {last[17:20]} {last[21]}{last[22:26]}{last[26]}")
+    pack_bonds(structure, lines)
     return "\n".join(lines)
 
 
@@ -644,6 +671,44 @@ def pack_sequences(structure, lines):
     except AttributeError: pass
 
 
+def pack_bonds(structure, lines):
+    """Adds CONECT lines for the bonds between a structure's atoms. As is
+    conventional, only bonds which involve a HETATM atom, or which link two
+    residues other than by the usual peptide or phosphodiester bond, are
+    given. Every bond is given in the records of both its atoms, with up to
+    four bonded atoms per line.
+
+    :param AtomStructure structure: the structure to convert.
+    :param list lines: the string lines to update."""
+
+    partners = {}
+    for atom1, atom2 in structure.bonds():
+        if not is_conect_bond(atom1, atom2): continue
+        partners.setdefault(atom1.id, []).append(atom2.id)
+        partners.setdefault(atom2.id, []).append(atom1.id)
+    for atom_id in sorted(partners):
+        ids = sorted(partners[atom_id])
+        for start in range(0, len(ids), 4):
+            lines.append("CONECT{:5}".format(atom_id) + "".join(
+             "{:5}".format(id_) for id_ in ids[start:start + 4]
+            ))
+
+
+def is_conect_bond(atom1, atom2):
+    """Works out whether a bond should have a CONECT record - whether either
+    atom is a HETATM atom, or the bond links two residues other than by a
+    standard backbone bond.
+
+    :param Atom atom1: the first atom.
+    :param Atom atom2: the second atom.
+    :rtype: ``bool``"""
+
+    if any(isinstance(a.het, Ligand) or a._is_hetatm for a in (atom1, atom2)):
+        return True
+    if atom1.het is atom2.het: return False
+    return {atom1._name, atom2._name} not in ({"C", "N"}, {"O3'", "P"})
+
+
 def atom_to_atom_line(a, lines):
     """Converts an :py:class:`.Atom` to an ATOM or HETATM record. ANISOU lines
     will also be added where appropriate.
@@ -0,0 +1,385 @@
+"""Contains tools for working with points in space - spatial indexes, grids
+voxel maps, surfaces and distance matrices."""
+
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from scipy.sparse import coo_matrix
+
+NEIGHBOUR_OFFSETS = np.array(
+ [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
+)
+
+class CellList:
+    """A spatial index over a set of points. Space is divided into cubic cells
+    at least as wide as the largest distance that will be searched for, so that
+    everything within that distance of a point is in the point's own cell or
+    one of the 26 cells around it. The points are sorted by cell, so that the
+    points in any cell can be found with a binary search.
+
+    :param numpy.ndarray points: the (n, 3) points to index.
+    :param float cell_size: the width of each cell.
+    :raises ValueError: if the cell size is not positive."""
+
+    def __init__(self, points, cell_size):
+        if not cell_size > 0:
+            raise ValueError("Cell size must be positive, not {}".format(cell_size))
+        self._points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self._cell_size = float(cell_size)
+        self._origin = self._points.min(axis=0) if len(self._points) \
+         else np.zeros(3)
+        cells = self._cells(self._points)
+        self._shape = cells.max(axis=0) + 1 if len(cells) \
+         else np.ones(3, dtype=np.int64)
+        keys = self._keys(cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+
+    def __repr__(self):
+        return "<CellList ({} points, {}×{}×{} cells)>".format(
+         len(self._points), *self._shape.tolist()
+        )
+
+
+    def __len__(self):
+        return len(self._points)
+
+
+    @property
+    def cell_size(self):
+        """The width of the cells.
+
+        :rtype: ``float``"""
+
+        return self._cell_size
+
+
+    def _cells(self, points):
+        """Returns the integer cell coordinates of some points.
+
+        :param numpy.ndarray points: the points to locate.
+        :rtype: ``numpy.ndarray``"""
+
+        return np.floor((points - self._origin) / self._cell_size).astype(np.int64)
+
+
+    def _keys(self, cells):
+        """Turns integer cell coordinates into single integer keys.
+
+        :param numpy.ndarray cells: the cell coordinates.
+        :rtype: ``numpy.ndarray``"""
+
+        return (cells[..., 0] * self._shape[1] + cells[..., 1]) \
+         * self._shape[2] + cells[..., 2]
+
+
+    def pairs(self, queries, cutoff, chunk_size=65536):
+        """Finds every pairing of a query point with an indexed point that is
+        within some distance of it. Queries are processed in chunks, to keep
+        the memory used bounded.
+
+        :param numpy.ndarray queries: the (m, 3) points to search around.
+        :param float cutoff: the distance cutoff to use, which cannot be more\
+        than the cell size.
+        :param int chunk_size: how many queries to process at once.
+        :raises ValueError: if the cutoff is bigger than the cell size.
+        :returns: the query indices, the indexed point indices and the\
+        distances between them, as three arrays.
+        :rtype: ``tuple``"""
+
+        if cutoff > self._cell_size:
+            raise ValueError("Cutoff {} is bigger than the cell size {}".format(
+             cutoff, self._cell_size
+            ))
+        queries = np.asarray(queries, dtype=float).reshape(-1, 3)
+        results = [self._chunk_pairs(queries[start:start + chunk_size], cutoff)
+         for start in range(0, len(queries), chunk_size)]
+        for start, result in zip(range(0, len(queries), chunk_size), results):
+            result[0] += start
+        if not results:
+            return np.array([], dtype=int), np.array([], dtype=int), np.array([])
+        return tuple(np.concatenate(arrays) for arrays in zip(*results))
+
+
+    def self_pairs(self, cutoff, chunk_size=65536):
+        """Finds every pair of indexed points that are within some distance of
+        each other. Each pair is only given once, with the lower index first.
+
+        :param float cutoff: the distance cutoff to use, which cannot be more\
+        than the cell size.
+        :param int chunk_size: how many points to process at once.
+        :raises ValueError: if the cutoff is bigger than the cell size.
+        :returns: the first indices, the second indices and the distances\
+        between them, as three arrays.
+        :rtype: ``tuple``"""
+
+        first, second, distances = self.pairs(
+         self._points, cutoff, chunk_size=chunk_size
+        )
+        keep = first < second
+        return first[keep], second[keep], distances[keep]
+
+
+    def _chunk_pairs(self, queries, cutoff):
+        """Finds the pairs for one chunk of queries - see :py:meth:`.pairs`.
+
+        :param numpy.ndarray queries: the points to search around.
+        :param float cutoff: the distance cutoff to use.
+        :rtype: ``list``"""
+
+        neighbours = self._cells(queries)[:, None] + NEIGHBOUR_OFFSETS
+        valid = np.all((neighbours >= 0) & (neighbours < self._shape), axis=2)
+        query_indices = np.nonzero(valid)[0]
+        keys = self._keys(neighbours[valid])
+        starts = np.searchsorted(self._sorted_keys, keys, side="left")
+        counts = np.searchsorted(self._sorted_keys, keys, side="right") - starts
+        query_indices = np.repeat(query_indices, counts)
+        positions = np.arange(counts.sum()) \
+         + np.repeat(starts - np.cumsum(counts) + counts, counts)
+        point_indices = self._order[positions]
+        distances = np.sqrt(np.sum(
+         (queries[query_indices] - self._points[point_indices]) ** 2, axis=1
+        ))
+        keep = distances <= cutoff
+        return [query_indices[keep], point_indices[keep], distances[keep]]
+
+
+
+def grid_axes(lower, upper, spacing):
+    """Works out the values along each axis of a grid with some spacing which
+    covers a box. Values are always multiples of the spacing, and the origin is
+    always one of the grid's points, so the grid may extend beyond the box.
+
+    :param lower: the minimum corner of the box.
+    :param upper: the maximum corner of the box.
+    :param spacing: the distance between grid points.
+    :rtype: ``list``"""
+
+    axes = []
+    for minimum, maximum in zip(lower, upper):
+        first = min(0, int(np.floor(minimum / spacing)))
+        last = max(0, int(np.ceil(maximum / spacing)))
+        axes.append(np.arange(first, last + 1) * spacing)
+    return axes
+
+
+def splat(coordinates, channels, origins, shape, spacing, sigma, channel_count,
+          batches=None, batch_count=1, truncate=3):
+    """Rasterizes points into voxel grids, spreading each point over the voxels
+    around it as a Gaussian with a peak height of 1. Every point belongs to a
+    channel, and optionally to one of several grids in a batch, so that many
+    structures can be rasterized in one pass.
+
+    :param numpy.ndarray coordinates: the (n, 3) points to rasterize.
+    :param numpy.ndarray channels: the channel of each point.
+    :param numpy.ndarray origins: the (batch_count, 3) position of each grid's\
+    first voxel.
+    :param shape: the number of voxels along each axis.
+    :param float spacing: the distance between voxel centres.
+    :param float sigma: the width of each point's Gaussian.
+    :param int channel_count: the number of channels.
+    :param numpy.ndarray batches: the grid each point belongs to.
+    :param int batch_count: the number of grids.
+    :param float truncate: how many sigmas each Gaussian reaches out to.
+    :returns: an array of shape (batch_count, channel_count, X, Y, Z).
+    :rtype: ``numpy.ndarray``"""
+
+    shape = np.array(shape, dtype=np.int64)
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    channels = np.asarray(channels, dtype=np.int64)
+    batches = np.zeros(len(coordinates), dtype=np.int64) if batches is None \
+     else np.asarray(batches, dtype=np.int64)
+    origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+    reach = int(np.ceil(truncate * sigma / spacing))
+    offsets = np.stack(np.meshgrid(
+     *[np.arange(-reach, reach + 1)] * 3, indexing="ij"
+    ), axis=-1).reshape(-1, 3)
+    size = int(np.prod(shape))
+    output = np.zeros(batch_count * channel_count * size)
+    step = max(1, 2 ** 22 // len(offsets))
+    for start in range(0, len(coordinates), step):
+        chunk = slice(start, start + step)
+        relative = (coordinates[chunk] - origins[batches[chunk]]) / spacing
+        voxels = np.rint(relative).astype(np.int64)[:, None] + offsets
+        squares = np.sum((voxels - relative[:, None]) ** 2, axis=2) * spacing ** 2
+        inside = np.all((voxels >= 0) & (voxels < shape), axis=2) \
+         & (squares <= (truncate * sigma) ** 2)
+        grids = (batches[chunk] * channel_count + channels[chunk])[:, None]
+        flat = grids * size + (
+         voxels[..., 0] * shape[1] + voxels[..., 1]
+        ) * shape[2] + voxels[..., 2]
+        np.add.at(
+         output, flat[inside], np.exp(-squares[inside] / (2 * sigma ** 2))
+        )
+    return output.reshape((batch_count, channel_count) + tuple(shape.tolist()))
+
+
+def density_maps(structures, shape, spacing=1, channels="element", sigma=1,
+                 truncate=3, **kwargs):
+    """Rasterizes many structures into voxel grids in a single pass, using
+    boxes of the same shape centred on each structure's centroid - see
+    :py:meth:`.AtomStructure.density_map`.
+
+    :param structures: the structures to rasterize.
+    :param shape: the number of voxels along each axis.
+    :param float spacing: the distance between voxel centres.
+    :param str channels: the channel scheme to use.
+    :param float sigma: the width of each atom's Gaussian.
+    :param float truncate: how many sigmas each Gaussian reaches out to.
+    :returns: an array of shape (structures, channels, X, Y, Z), and the\
+    position of each grid's first voxel.
+    :rtype: ``tuple``"""
+
+    structures = list(structures)
+    shape = np.broadcast_to(np.array(shape, dtype=np.int64), 3)
+    coordinates, channel_indices, origins = [], [], []
+    for structure in structures:
+        names, indices = structure._atom_channels(channels, **kwargs)
+        points = structure._atom_arrays()[0]
+        coordinates.append(points)
+        channel_indices.append(indices)
+        origins.append(points.mean(axis=0) - spacing * (shape - 1) / 2)
+    batches = np.repeat(np.arange(len(structures)), [len(c) for c in coordinates])
+    return splat(
+     np.concatenate(coordinates) if coordinates else np.zeros((0, 3)),
+     np.concatenate(channel_indices) if coordinates else np.zeros(0),
+     np.array(origins).reshape(-1, 3), shape, spacing, sigma,
+     len(names) if structures else 0, batches=batches,
+     batch_count=len(structures), truncate=truncate
+    ), np.array(origins).reshape(-1, 3)
+
+
+def sphere_points(count):
+    """Spreads some number of points evenly over the surface of a unit sphere,
+    using a golden section spiral.
+
+    :param int count: the number of points to make.
+    :rtype: ``numpy.ndarray``"""
+
+    indices = np.arange(count) + 0.5
+    z = 1 - 2 * indices / count
+    radii = np.sqrt(1 - z ** 2)
+    angles = np.pi * (1 + np.sqrt(5)) * indices
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles), z])
+
+
+def shrake_rupley(coordinates, radii, points=100, chunk_size=128, threads=None):
+    """Calculates the exposed surface area of a set of spheres, using the
+    Shrake-Rupley algorithm - each sphere is covered with evenly spaced points,
+    and the area is the fraction of those points not inside any other sphere.
+
+    Overlapping spheres are found with a :py:class:`.CellList`, and the points
+    of a chunk of spheres are tested against all their neighbours at once. The
+    chunks can optionally be shared between several threads.
+
+    For solvent accessible surface area, the radii should be the atoms' radii
+    plus the radius of the solvent probe.
+
+    :param numpy.ndarray coordinates: the (n, 3) centres of the spheres.
+    :param numpy.ndarray radii: the radius of each sphere.
+    :param int points: the number of points to put on each sphere.
+    :param int chunk_size: how many spheres to process at once.
+    :param int threads: if given, the number of threads to use.
+    :returns: the exposed area of each sphere.
+    :rtype: ``numpy.ndarray``"""
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    radii = np.asarray(radii, dtype=float)
+    if not len(radii) or radii.max() <= 0: return np.zeros(len(radii))
+    sphere = sphere_points(points)
+    cells = CellList(coordinates, 2 * radii.max())
+
+    def chunk_areas(start):
+        spheres = slice(start, start + chunk_size)
+        queries, neighbours, distances = cells.pairs(
+         coordinates[spheres], cells.cell_size
+        )
+        keep = (distances < radii[start + queries] + radii[neighbours]) \
+         & (neighbours != start + queries)
+        order = np.argsort(queries[keep], kind="stable")
+        queries, neighbours = queries[keep][order], neighbours[keep][order]
+        surface = coordinates[spheres, None] + radii[spheres, None, None] * sphere
+        buried = np.zeros(surface.shape[:2], dtype=bool)
+        if len(queries):
+            inside = np.sum(
+             (surface[queries] - coordinates[neighbours, None]) ** 2, axis=2
+            ) < radii[neighbours, None] ** 2
+            starts = np.flatnonzero(np.diff(queries, prepend=-1))
+            buried[queries[starts]] = np.logical_or.reduceat(inside, starts, axis=0)
+        return 4 * np.pi * radii[spheres] ** 2 * (1 - buried.mean(axis=1))
+
+    starts = range(0, len(radii), chunk_size)
+    if threads:
+        with ThreadPoolExecutor(threads) as executor:
+            return np.concatenate(list(executor.map(chunk_areas, starts)))
+    return np.concatenate([chunk_areas(start) for start in starts])
+
+
+def distance_blocks(points, others=None, cutoff=None, dtype=np.float64,
+                    memory=2 ** 26, threads=None):
+    """A generator which yields the distance matrix between two sets of points
+    one block at a time, so that all the distances can be worked through
+    without the whole matrix ever being in memory. Each block is sized so that
+    it takes up no more than about half the memory given, leaving room for
+    the intermediate arrays used to calculate it.
+
+    If no second set of points is given, the distances between the first set's
+    own points are given instead, and only blocks on or above the diagonal of
+    the matrix are yielded.
+
+    Blocks are worked out from the points' dot products, which NumPy
+    calculates without holding the GIL, so several threads can calculate
+    blocks at once. Only as many blocks as there are threads are worked on
+    ahead of the one being yielded.
+
+    :param numpy.ndarray points: the (n, 3) points for the matrix's rows.
+    :param numpy.ndarray others: the (m, 3) points for its columns.
+    :param float cutoff: if given, each block is a sparse matrix of only the\
+    distances within the cutoff (and blocks on the diagonal of a\
+    self-distance matrix only have their pairs above the diagonal).
+    :param dtype: the float type to calculate the distances in.
+    :param int memory: the number of bytes a block can use.
+    :param int threads: if given, the number of threads to use.
+    :returns: the row and column the block starts at, and the block - either\
+    an array or a ``scipy.sparse.coo_matrix``.
+    :rtype: ``tuple``"""
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    symmetric = others is None
+    others = points if symmetric else np.asarray(others, dtype=float).reshape(-1, 3)
+    center = np.concatenate([points, others]).mean(axis=0) \
+     if len(points) + len(others) else np.zeros(3)
+    points, others = (points - center).astype(dtype), (others - center).astype(dtype)
+    squares1 = np.einsum("ij,ij->i", points, points)
+    squares2 = np.einsum("ij,ij->i", others, others)
+    size = max(1, int(np.sqrt(memory / (2 * np.dtype(dtype).itemsize))))
+
+    def block(starts):
+        row, column = starts
+        rows, columns = slice(row, row + size), slice(column, column + size)
+        distances = points[rows] @ others[columns].T
+        distances *= -2
+        distances += squares1[rows, None]
+        distances += squares2[None, columns]
+        np.sqrt(np.maximum(distances, 0, out=distances), out=distances)
+        diagonal = symmetric and row == column
+        if diagonal: np.fill_diagonal(distances, 0)
+        if cutoff is None: return row, column, distances
+        first, second = np.nonzero(distances <= cutoff)
+        if diagonal: first, second = first[first < second], second[first < second]
+        return row, column, coo_matrix(
+         (distances[first, second], (first, second)), shape=distances.shape
+        )
+
+    starts = ((row, column) for row in range(0, len(points), size)
+     for column in range(row if symmetric else 0, len(others), size))
+    if threads:
+        with ThreadPoolExecutor(threads) as executor:
+            pending = deque()
+            for start in starts:
+                pending.append(executor.submit(block, start))
+                if len(pending) > threads: yield pending.popleft().result()
+            while pending: yield pending.popleft().result()
+    else:
+        for start in starts: yield block(start)
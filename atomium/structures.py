@@ -5,8 +5,15 @@ import rmsd
 import math
 import warnings
 from scipy.spatial.distance import cdist
+from scipy.sparse import csr_matrix
+from operator import attrgetter
 from collections import Counter, OrderedDict, defaultdict
-from .base import StructureClass, query, StructureSet
+from .base import StructureClass, query, StructureSet, Selection, AttributeIndex
+from .spatial import CellList, grid_axes, splat, shrake_rupley, distance_blocks
+from .graph import csr_adjacency, connected_components, shortest_path
+from .graph import rings as find_rings
+from .geometry import measure, distances, angles, dihedrals
+from .interactions import close_pairs, antecedent_angles
 
 class AtomStructure:
     """A structure made of atoms. This contains various useful methods that rely
@@ -18,17 +25,25 @@ class AtomStructure:
 
     The class would never be instantiated directly."""
 
+    from atomium import data as __data
+
     def __init__(self, id=None, name=None):
         self._id, self._name = id, name
+        self._geometry = (None, {})
 
 
     def __eq__(self, other):
         try:
-            mapping = self.pairing_with(other)
-            for atom1, atom2 in mapping.items():
-                if not atom1 == atom2: return False
-            return True
+            atoms, other_atoms, indices, other_indices = \
+             self.pairing_indices_with(other)
         except: return False
+        if not np.array_equal(
+         self._atom_arrays()[0][indices], other._atom_arrays()[0][other_indices]
+        ): return False
+        attributes = attrgetter(*(attr for attr in Atom.__slots__
+         if attr not in ("_id", "_het", "_bonded_atoms", "_location", "_index")))
+        return all(attributes(atoms[index1]) == attributes(other_atoms[index2])
+         for index1, index2 in zip(indices.tolist(), other_indices.tolist()))
 
 
     def __hash__(self):
@@ -64,7 +79,10 @@ class AtomStructure:
 
         :rtype: ``float``"""
 
-        return round(sum([atom.mass for atom in self.atoms()]), 12)
+        model, indices = self._model_indices()
+        if model is None:
+            return round(sum([atom.mass for atom in self.atoms()]), 12)
+        return round(float(model._element_property("mass")[indices].sum()), 12)
 
 
     @property
@@ -93,9 +111,14 @@ class AtomStructure:
 
         :rtype: ``tuple``"""
 
-        mass = self.mass
-        locations = np.array([a._location * a.mass for a in self.atoms()])
-        return np.sum(locations, axis=0) / mass
+        model, indices = self._model_indices()
+        if model is None:
+            mass = self.mass
+            locations = np.array([a._location * a.mass for a in self.atoms()])
+            return np.sum(locations, axis=0) / mass
+        masses = model._element_property("mass")[indices]
+        locations = model._coordinates[indices]
+        return masses @ locations / masses.sum()
 
 
     @property
@@ -107,12 +130,122 @@ class AtomStructure:
         :rtype: ``float``"""
 
         center_of_mass = self.center_of_mass
-        atoms = self.atoms()
-        square_deviation = sum(
-         [atom.distance_to(center_of_mass) ** 2 for atom in atoms]
+        model, indices = self._model_indices()
+        if model is None:
+            atoms = self.atoms()
+            square_deviation = sum(
+             [atom.distance_to(center_of_mass) ** 2 for atom in atoms]
+            )
+            mean_square_deviation = square_deviation / len(atoms)
+            return np.sqrt(mean_square_deviation)
+        deviations = model._coordinates[indices] - center_of_mass
+        return np.sqrt(np.einsum("ij,ij->", deviations, deviations) / len(indices))
+
+
+    @property
+    def bounding_box(self):
+        """The structure's axis-aligned bounding box, as a 2 × 3 array of its
+        atoms' minimum and maximum coordinates.
+
+        :rtype: ``numpy.ndarray``"""
+
+        def box():
+            coordinates = self._atom_arrays()[0]
+            return np.array([coordinates.min(axis=0), coordinates.max(axis=0)])
+        return self._cached_geometry("bounding_box", box)
+
+
+    @property
+    def inertia_tensor(self):
+        """The structure's moment of inertia tensor about its
+        :py:meth:`.center_of_mass`, as a 3 × 3 array.
+
+        :rtype: ``numpy.ndarray``"""
+
+        def tensor():
+            coordinates, masses = self._atom_arrays()
+            deviations = coordinates - masses @ coordinates / masses.sum()
+            weighted = deviations * masses[:, None]
+            return np.eye(3) * np.einsum("ij,ij->", weighted, deviations) \
+             - weighted.T @ deviations
+        return self._cached_geometry("inertia_tensor", tensor)
+
+
+    @property
+    def principal_axes(self):
+        """The structure's principal axes of inertia, as the rows of a 3 × 3
+        array. They are unit vectors, ordered from the axis with the smallest
+        moment of inertia (the structure's long axis) to the largest.
+
+        :rtype: ``numpy.ndarray``"""
+
+        return self._cached_geometry(
+         "principal_axes", lambda: np.linalg.eigh(self.inertia_tensor)[1].T
         )
-        mean_square_deviation = square_deviation / len(atoms)
-        return np.sqrt(mean_square_deviation)
+
+
+    @property
+    def oriented_bounding_box(self):
+        """The smallest box enclosing the structure's atoms whose edges are
+        parallel to its :py:meth:`.principal_axes`. This is given as the box's
+        center, its three axes (as the rows of an array), and its half-length
+        along each axis.
+
+        :rtype: ``tuple``"""
+
+        def box():
+            axes = self.principal_axes
+            projected = self._atom_arrays()[0] @ axes.T
+            lower, upper = projected.min(axis=0), projected.max(axis=0)
+            return ((lower + upper) / 2) @ axes, axes, (upper - lower) / 2
+        return self._cached_geometry("oriented_bounding_box", box)
+
+
+    def _atom_arrays(self):
+        """Returns the coordinates and masses of the structure's atoms, as an
+        array with one row per atom and an array with one mass per atom.
+
+        :rtype: ``tuple``"""
+
+        model, indices = self._model_indices()
+        if model is None:
+            atoms = self._atom_tuple()
+            return np.array(
+             [atom._location for atom in atoms], dtype=float
+            ).reshape(-1, 3), np.array([atom.mass for atom in atoms], dtype=float)
+        return model._coordinates[indices], model._element_property("mass")[indices]
+
+
+    def _atom_tuple(self):
+        """Returns the structure's atoms as a tuple, in the same order as the
+        rows of the arrays returned by :py:meth:`._atom_arrays`.
+
+        :rtype: ``tuple``"""
+
+        model, indices = self._model_indices()
+        if model is None: return tuple(self.atoms())
+        return model._atom_list[slice(*model._atom_slices[self])]
+
+
+    def _cached_geometry(self, name, function):
+        """Returns some geometric property of the structure, only calculating
+        it if it hasn't been calculated since any atom last moved. Cached
+        arrays are made read-only so that they can be safely shared.
+
+        :param str name: the name of the property.
+        :param function function: calculates the property.
+        :returns: the property's value."""
+
+        version, cache = self._geometry
+        if version != Atom._coordinate_version:
+            cache = {}
+            self._geometry = (Atom._coordinate_version, cache)
+        if name not in cache:
+            value = function()
+            for array in value if isinstance(value, tuple) else (value,):
+                array.flags.writeable = False
+            cache[name] = value
+        return cache[name]
 
 
     def pairing_with(self, structure):
@@ -130,26 +263,65 @@ class AtomStructure:
         atoms.
         :rtype: ``dict``"""
 
-        atoms = self.atoms()
-        other_atoms = structure.atoms()
+        atoms, other_atoms, indices, other_indices = \
+         self.pairing_indices_with(structure)
+        return {atoms[index1]: other_atoms[index2] for index1, index2
+         in zip(indices.tolist(), other_indices.tolist())}
+
+
+    def pairing_indices_with(self, structure):
+        """Works out the pairing described in :py:meth:`.pairing_with` as
+        arrays of indices rather than a dictionary, which is much faster to
+        work with for large structures. Atoms whose IDs are unique in both structures are matched by
+        binary search over the sorted IDs, and any remaining atoms are matched
+        by their rank when sorted by ID, element, name and memory address. IDs
+        are first replaced by their rank among both structures' IDs, so that
+        missing (``None``) IDs and IDs of different types can still be sorted.
+
+        :param AtomStructure structure: the structure to pair with.
+        :raises ValueError: if the other structure has a different number of\
+        atoms.
+        :returns: the atoms of each structure as tuples, and two arrays of\
+        indices into those tuples which give the paired atoms - the atom at\
+        ``indices[i]`` is paired with the other atom at ``other_indices[i]``.
+        :rtype: ``tuple``"""
+
+        atoms, other_atoms = self._atom_tuple(), structure._atom_tuple()
         if len(atoms) != len(other_atoms):
             raise ValueError("{} and {} have different numbers of atoms".format(
              self, structure
             ))
-        pair = {}
-        common_ids = set(a._id for a in atoms) & set(a._id for a in other_atoms)
-        id_atoms = {a._id: a for a in atoms}
-        id_other_atoms = {a._id: a for a in other_atoms}
-        for id_ in common_ids:
-            pair[id_atoms[id_]] = id_other_atoms[id_]
-            atoms.remove(id_atoms[id_])
-            other_atoms.remove(id_other_atoms[id_])
-        atoms, other_atoms = list(atoms), list(other_atoms)
-        for l in atoms, other_atoms:
-            l.sort(key=lambda a: (
-             a._id, a._element, a._name, id(a)
-            ))
-        return {**pair, **{a1: a2 for a1, a2 in zip(atoms, other_atoms)}}
+        ranks = {value: rank for rank, value in enumerate(sorted(
+         {atom._id for atoms_ in (atoms, other_atoms) for atom in atoms_},
+         key=lambda id_: (id_ is None, str(type(id_)), 0 if id_ is None else id_)
+        ))}
+        ids, other_ids = [np.array([ranks[atom._id] for atom in atoms_], dtype=int)
+         for atoms_ in (atoms, other_atoms)]
+        unique, other_unique = [
+         np.flatnonzero(counts[inverse] == 1) for _, inverse, counts in (
+          np.unique(values, return_inverse=True, return_counts=True)
+          for values in (ids, other_ids)
+         )
+        ]
+        order = other_unique[np.argsort(other_ids[other_unique], kind="stable")]
+        found = np.minimum(
+         np.searchsorted(other_ids[order], ids[unique]), max(len(order) - 1, 0)
+        )
+        matched = other_ids[order][found] == ids[unique] if len(order) else \
+         np.zeros(len(unique), dtype=bool)
+        indices, other_indices = unique[matched], order[found[matched]]
+        rest = [np.setdiff1d(np.arange(len(atoms_)), paired)
+         for atoms_, paired in ((atoms, indices), (other_atoms, other_indices))]
+        rest = [positions[np.lexsort((
+         np.array([id(atoms_[i]) for i in positions], dtype=np.uint64),
+         np.array([atoms_[i]._name or "" for i in positions], dtype=str),
+         np.array([atoms_[i]._element or "" for i in positions], dtype=str),
+         ids_[positions]
+        ))] for atoms_, ids_, positions in zip(
+         (atoms, other_atoms), (ids, other_ids), rest
+        )]
+        return atoms, other_atoms, np.concatenate([indices, rest[0]]), \
+         np.concatenate([other_indices, rest[1]])
 
 
     def rmsd_with(self, structure):
@@ -161,13 +333,16 @@ class AtomStructure:
         atoms.
         :rtype: ``float``"""
 
-        pairing = self.pairing_with(structure)
-        coords1, coords2 = [[a.location for a in atoms]
-         for atoms in zip(*pairing.items())]
-        c1, c2 = self.center_of_mass, structure.center_of_mass
-        coords1 = [[x - c1[0], y - c1[1], z - c1[2]] for x, y, z in coords1]
-        coords2 = [[x - c2[0], y - c2[1], z - c2[2]] for x, y, z in coords2]
-        return round(rmsd.kabsch_rmsd(coords1, coords2), 12)
+        _, _, indices, other_indices = self.pairing_indices_with(structure)
+        coords1, coords2 = [(coordinates - masses @ coordinates / masses.sum())
+         for coordinates, masses in (
+          (array[order] for array in s._atom_arrays())
+          for s, order in ((self, indices), (structure, other_indices))
+         )]
+        deviations = rmsd.kabsch_rotate(coords1, coords2) - coords2
+        return round(math.sqrt(max(
+         np.einsum("ij,ij->", deviations, deviations) / len(deviations), 0
+        )), 12)
 
 
     def create_grid(self, size=1, margin=0):
@@ -180,19 +355,411 @@ class AtomStructure:
         coordinates. The default is 0.
         :rtype: ``tuple``"""
 
-        atom_locations = [atom.location for atom in self.atoms()]
-        dimension_values = []
-        for dimension in range(3):
-            coordinates = [loc[dimension] for loc in atom_locations]
-            min_, max_ = min(coordinates) - margin, max(coordinates) + margin
-            values = [0]
-            while values[0] > min_: values.insert(0, values[0] - size)
-            while values[-1] < max_: values.append(values[-1] + size)
-            dimension_values.append(values)
-        for x in dimension_values[0]:
-            for y in dimension_values[1]:
-                for z in dimension_values[2]:
-                    yield (x, y, z)
+        for chunk in self.grid_chunks(spacing=size, margin=margin):
+            yield from map(tuple, chunk.tolist())
+
+
+    def grid(self, spacing=1, margin=0):
+        """Returns the points of a grid around the structure as a single array
+        with one row per point. These are the same points, in the same order,
+        as those from :py:meth:`.create_grid`.
+
+        :param spacing: the distance between grid points.
+        :param margin: how far to extend the grid beyond the structure.
+        :rtype: ``numpy.ndarray``"""
+
+        axes = self._grid_axes(spacing, margin)
+        return np.stack(
+         np.meshgrid(*axes, indexing="ij"), axis=-1
+        ).reshape(-1, 3)
+
+
+    def grid_chunks(self, spacing=1, margin=0, chunk_size=65536):
+        """A generator which returns the points of the structure's
+        :py:meth:`.grid` a chunk at a time, so that very fine or very large
+        grids never have to be held in memory all at once.
+
+        :param spacing: the distance between grid points.
+        :param margin: how far to extend the grid beyond the structure.
+        :param int chunk_size: the number of points in each chunk.
+        :rtype: ``numpy.ndarray``"""
+
+        axes = self._grid_axes(spacing, margin)
+        shape = tuple(len(axis) for axis in axes)
+        count = shape[0] * shape[1] * shape[2]
+        for start in range(0, count, chunk_size):
+            indices = np.unravel_index(
+             np.arange(start, min(start + chunk_size, count)), shape
+            )
+            yield np.column_stack([axis[i] for axis, i in zip(axes, indices)])
+
+
+    def occupied_grid(self, spacing=1, margin=0, radius="vdw_radius", probe=0):
+        """Works out which points of the structure's :py:meth:`.grid` fall
+        within the radius of any of its atoms - useful for finding cavities and
+        pockets. Points are checked a chunk at a time against a
+        :py:class:`.CellList` of the atoms.
+
+        :param spacing: the distance between grid points.
+        :param margin: how far to extend the grid beyond the structure.
+        :param str radius: the atomic radius to use - ``"vdw_radius"`` or\
+        ``"covalent_radius"``.
+        :param float probe: an extra distance to add to every radius.
+        :returns: the grid points, and a boolean array with the grid's shape\
+        which is ``True`` for occupied points - its flattened form lines up\
+        with the points.
+        :rtype: ``tuple``"""
+
+        axes = self._grid_axes(spacing, margin)
+        points = self.grid(spacing=spacing, margin=margin)
+        coordinates = self._atom_arrays()[0]
+        radii = self._atom_property(radius) + probe
+        occupied = np.zeros(len(points), dtype=bool)
+        if radii.size and radii.max() > 0:
+            cells = CellList(coordinates, radii.max())
+            for start in range(0, len(points), 65536):
+                queries, atoms, distances = cells.pairs(
+                 points[start:start + 65536], radii.max()
+                )
+                occupied[start + queries[distances <= radii[atoms]]] = True
+        return points, occupied.reshape([len(axis) for axis in axes])
+
+
+    def density_map(self, spacing=1, channels="element", sigma=1, shape=None,
+                    center=None, truncate=3, **kwargs):
+        """Rasterizes the structure's atoms into a 3D voxel map, with one map
+        per channel, by spreading each atom over the voxels around it as a
+        Gaussian with a peak height of 1. The channel schemes are:
+
+        - ``"element"`` - one channel per element in ``elements`` (carbon,\
+        nitrogen, oxygen and sulphur by default) and one for everything else.
+        - ``"residue"`` - one channel per standard amino acid, and one for\
+        atoms not in one.
+        - ``"backbone"`` - one channel for backbone atoms, one for side chain\
+        atoms, and one for atoms not in a residue.
+        - ``"atom"`` - a single channel for all atoms.
+
+        If a shape is given, the box is centred on the center given or else the
+        structure's centroid. Otherwise the box covers the whole structure.
+
+        :param float spacing: the distance between voxel centres.
+        :param str channels: the channel scheme to use.
+        :param float sigma: the width of each atom's Gaussian.
+        :param shape: if given, the number of voxels along each axis.
+        :param center: if given, where to centre the box.
+        :param float truncate: how many sigmas each Gaussian reaches out to.
+        :param elements: the elements to give channels to.
+        :raises ValueError: if the channel scheme is not recognised.
+        :returns: an array of shape (channels, X, Y, Z), and the position of\
+        its first voxel.
+        :rtype: ``tuple``"""
+
+        coordinates = self._atom_arrays()[0]
+        names, indices = self._atom_channels(channels, **kwargs)
+        if shape is None:
+            origin = coordinates.min(axis=0) - truncate * sigma
+            shape = np.ceil(
+             (coordinates.max(axis=0) + truncate * sigma - origin) / spacing
+            ).astype(int) + 1
+        else:
+            shape = np.broadcast_to(np.array(shape, dtype=int), 3)
+            center = coordinates.mean(axis=0) if center is None else center
+            origin = np.array(center, dtype=float) - spacing * (shape - 1) / 2
+        return splat(
+         coordinates, indices, origin, shape, spacing, sigma, len(names),
+         truncate=truncate
+        )[0], origin
+
+
+    def _atom_channels(self, scheme, elements=("C", "N", "O", "S")):
+        """Assigns each of the structure's atoms to a channel of some channel
+        scheme - see :py:meth:`.density_map`.
+
+        :param str scheme: the channel scheme to use.
+        :param elements: the elements to give channels to.
+        :raises ValueError: if the channel scheme is not recognised.
+        :returns: the names of the channels, and each atom's channel.
+        :rtype: ``tuple``"""
+
+        atoms = self._atom_tuple()
+        if scheme == "element":
+            names = [element.upper() for element in elements] + ["other"]
+            keys = [atom._element.upper() for atom in atoms]
+        elif scheme == "residue":
+            names = [name for name in self.__data.FULL_NAMES if name != "HOH"]
+            names.append("other")
+            keys = [atom._het._name if isinstance(atom._het, Residue)
+             else None for atom in atoms]
+        elif scheme == "backbone":
+            names = ["backbone", "side chain", "other"]
+            keys = [("backbone" if atom._name in ("N", "CA", "C", "O")
+             else "side chain") if isinstance(atom._het, Residue) else None
+             for atom in atoms]
+        elif scheme == "atom":
+            names, keys = ["atom"], ["atom"] * len(atoms)
+        else:
+            raise ValueError("'{}' is not a channel scheme".format(scheme))
+        positions = {name: index for index, name in enumerate(names)}
+        return names, np.array(
+         [positions.get(key, len(names) - 1) for key in keys], dtype=int
+        )
+
+
+    def sasa(self, **kwargs):
+        """Returns the solvent accessible surface area of the structure - see
+        :py:meth:`.atom_sasa`.
+
+        :rtype: ``float``"""
+
+        return float(self._atom_areas(**kwargs).sum())
+
+
+    def atom_sasa(self, probe=1.4, points=100, radius="vdw_radius",
+                  threads=None, chunk_size=128):
+        """Returns the solvent accessible surface area of each of the
+        structure's atoms, calculated with the Shrake-Rupley algorithm. Only
+        the structure's own atoms are considered, so a residue's area will be
+        different on its own than as part of a chain - use
+        :py:meth:`.residue_sasa` on the chain for the latter.
+
+        :param float probe: the radius of the solvent probe.
+        :param int points: the number of points to put on each atom's sphere.
+        :param str radius: the atomic radius to use - ``"vdw_radius"`` or\
+        ``"covalent_radius"``.
+        :param int threads: if given, the number of threads to use.
+        :param int chunk_size: how many atoms to process at once.
+        :rtype: ``dict``"""
+
+        return dict(zip(self._atom_tuple(), self._atom_areas(
+         probe=probe, points=points, radius=radius,
+         threads=threads, chunk_size=chunk_size
+        ).tolist()))
+
+
+    def residue_sasa(self, **kwargs):
+        """Returns the solvent accessible surface area of each residue and
+        ligand in the structure, in the context of the whole structure - see
+        :py:meth:`.atom_sasa`.
+
+        :rtype: ``dict``"""
+
+        areas = {}
+        for atom, area in self.atom_sasa(**kwargs).items():
+            if atom._het is not None:
+                areas[atom._het] = areas.get(atom._het, 0) + area
+        return areas
+
+
+    def chain_sasa(self, **kwargs):
+        """Returns the solvent accessible surface area of each chain in the
+        structure, in the context of the whole structure - see
+        :py:meth:`.atom_sasa`.
+
+        :rtype: ``dict``"""
+
+        areas = {}
+        for het, area in self.residue_sasa(**kwargs).items():
+            if het.chain is not None:
+                areas[het.chain] = areas.get(het.chain, 0) + area
+        return areas
+
+
+    def buried_surface_area(self, structure, **kwargs):
+        """Returns the surface area buried when this structure and another
+        come together - the sum of their separate solvent accessible surface
+        areas, minus that of the two combined. Half of this is often quoted
+        as the interface area. See :py:meth:`.atom_sasa` for the options.
+
+        :param AtomStructure structure: the other structure.
+        :rtype: ``float``"""
+
+        own, other = self._atom_areas(**kwargs), structure._atom_areas(**kwargs)
+        combined = self._atom_areas(structure, **kwargs)
+        return float(own.sum() + other.sum() - combined.sum())
+
+
+    def _atom_areas(self, *others, probe=1.4, points=100, radius="vdw_radius",
+                    threads=None, chunk_size=128):
+        """Calculates the solvent accessible surface area of each of the
+        structure's atoms, in the order of the rows of :py:meth:`._atom_arrays`.
+        If other structures are given, their atoms are included too.
+
+        :param \\*others: other structures to include.
+        :param float probe: the radius of the solvent probe.
+        :param int points: the number of points to put on each atom's sphere.
+        :param str radius: the atomic radius to use.
+        :param int threads: if given, the number of threads to use.
+        :param int chunk_size: how many atoms to process at once.
+        :rtype: ``numpy.ndarray``"""
+
+        structures = (self,) + others
+        return shrake_rupley(
+         np.concatenate([s._atom_arrays()[0] for s in structures]),
+         np.concatenate([s._atom_property(radius) for s in structures]) + probe,
+         points=points, chunk_size=chunk_size, threads=threads
+        )
+
+
+    def _grid_axes(self, spacing, margin):
+        """Works out the values along each axis of the structure's grid.
+
+        :param spacing: the distance between grid points.
+        :param margin: how far to extend the grid beyond the structure.
+        :rtype: ``list``"""
+
+        lower, upper = self.bounding_box
+        return grid_axes(lower - margin, upper + margin, spacing)
+
+
+    def _atom_property(self, name):
+        """Returns an array of some element-derived property of the structure's
+        atoms, such as ``"covalent_radius"``, in the order of the rows of
+        :py:meth:`._atom_arrays`.
+
+        :param str name: the property to get.
+        :rtype: ``numpy.ndarray``"""
+
+        model, indices = self._model_indices()
+        if model is None:
+            return np.array(
+             [getattr(atom, name) for atom in self._atom_tuple()], dtype=float
+            )
+        return model._element_property(name)[indices]
+
+
+    def bonds(self):
+        """Returns the bonds between the structure's atoms, as pairs of atoms.
+        If the structure is part of a :py:class:`.Model`, the model's bonds are
+        stored compactly as an array of atom indices, and these pairs are only
+        made when asked for. Bonds made with :py:meth:`.Atom.bond` are
+        included too.
+
+        :rtype: ``tuple``"""
+
+        atoms, edges = self._bond_edges()
+        return tuple((atoms[i], atoms[j]) for i, j in edges.tolist())
+
+
+    def bond_components(self):
+        """Splits the structure's atoms into groups which are connected to each
+        other by bonds - separate molecules, or fragments of them. The groups
+        are in the order of their first atoms.
+
+        :rtype: ``list``"""
+
+        atoms, edges = self._bond_edges()
+        count, labels = connected_components(*csr_adjacency(edges, len(atoms)))
+        components = [set() for _ in range(count)]
+        for atom, label in zip(atoms, labels.tolist()):
+            components[label].add(atom)
+        return components
+
+
+    def rings(self, max_size=8):
+        """Finds the rings of bonded atoms in the structure. For fused ring
+        systems, such as those of tryptophan, each of the individual rings is
+        given rather than the larger ring around them.
+
+        :param int max_size: the largest ring to look for.
+        :returns: the rings, each as a tuple of atoms in the order they go\
+        around the ring.
+        :rtype: ``list``"""
+
+        atoms, edges = self._bond_edges()
+        return [tuple(atoms[i] for i in ring.tolist()) for ring in find_rings(
+         *csr_adjacency(edges, len(atoms)), max_size=max_size
+        )]
+
+
+    def bond_path(self, atom1, atom2):
+        """Finds the shortest path of bonds between two of the structure's
+        atoms, going only through the structure's own atoms.
+
+        :param Atom atom1: the atom to start at.
+        :param Atom atom2: the atom to finish at.
+        :raises ValueError: if either atom isn't in the structure.
+        :returns: the atoms along the path, including both ends, or ``None``\
+        if there is no path.
+        :rtype: ``tuple``"""
+
+        atoms, edges = self._bond_edges()
+        positions = {atom: index for index, atom in enumerate(atoms)}
+        for atom in (atom1, atom2):
+            if atom not in positions:
+                raise ValueError("{} is not in {}".format(atom, self))
+        path = shortest_path(
+         *csr_adjacency(edges, len(atoms)), positions[atom1], positions[atom2]
+        )
+        return None if path is None else tuple(atoms[i] for i in path.tolist())
+
+
+    def _bond_edges(self):
+        """Returns the structure's atoms, in the order of
+        :py:meth:`._atom_tuple`, and the bonds between them as an (n, 2) array
+        of positions in that order. If the structure is part of a
+        :py:class:`.Model`, this is a slice of the model's edge array.
+
+        :rtype: ``tuple``"""
+
+        atoms = self._atom_tuple()
+        edges = np.zeros((0, 2), dtype=int)
+        model, indices = self._model_indices()
+        if model is not None and len(model._bonds):
+            start, end = model._atom_slices[self]
+            edges = model._bonds[
+             ((model._bonds >= start) & (model._bonds < end)).all(axis=1)
+            ] - start
+        loose = [atom for atom in atoms if atom._bonded_atoms]
+        if loose:
+            positions = {atom: index for index, atom in enumerate(atoms)}
+            edges = np.unique(np.concatenate([edges, np.array([
+             (positions[atom], positions[other])
+             for atom in loose for other in atom._bonded_atoms
+             if positions.get(other, -1) > positions[atom]
+            ], dtype=int).reshape(-1, 2)]), axis=0)
+        return atoms, edges
+
+
+    def select(self, objects="atoms"):
+        """Returns a lazy :py:class:`.Selection` of the structure's atoms, or
+        of some other kind of sub-structure it has, such as ``"residues"``.
+
+        Nothing is filtered or gathered until the selection is iterated over
+        or counted, and selections can be refined with
+        :py:meth:`~.Selection.filter` and :py:meth:`~.Selection.exclude`, or
+        combined with ``|``, ``&`` and ``-``, along the way.
+
+        :param str objects: the kind of sub-structure to select.
+        :raises ValueError: if the structure has no such sub-structures.
+        :rtype: ``Selection``"""
+
+        if objects not in StructureClass.METHODS or not hasattr(self, objects):
+            raise ValueError(f"{self} has no {objects} to select")
+        model, indices = self._model_indices()
+        if model is not None:
+            universe = model._universes[objects]
+            if objects != "atoms":
+                lookup = model._lookup(objects)
+                indices = None if self is model else np.sort(np.array([
+                 lookup[obj] for obj in getattr(self, objects)()
+                ], dtype=int))
+            return Selection(universe, indices, model=model)
+        return Selection(tuple(getattr(self, objects)()))
+
+
+    def _model_indices(self):
+        """If the structure is part of a :py:class:`.Model`, returns that model
+        and the indices of the structure's atoms within it. Otherwise two
+        ``None`` values are returned.
+
+        :rtype: ``tuple``"""
+
+        model = self if isinstance(self, Model) else getattr(self, "model", None)
+        if model is not None:
+            model._build_index()
+            if self in model._atom_slices:
+                return model, np.arange(*model._atom_slices[self])
+        return None, None
 
 
     def check_ids(self):
@@ -279,55 +846,147 @@ class AtomStructure:
                 yield {atoms[a_index], atoms[o_index]}
 
 
-    def nearby_atoms(self, *args, **kwargs):
+    def pairwise_distances(self, cutoff=None, dtype=np.float64, memory=2 ** 26,
+                           threads=None):
+        """A generator which yields the distances between every pair of the
+        structure's atoms, one block of the distance matrix at a time, using
+        :py:func:`.spatial.distance_blocks`. Each block comes with the atoms of
+        its rows and of its columns, and only blocks on or above the diagonal
+        of the matrix are yielded.
+
+        :param float cutoff: if given, each block is a sparse matrix of only the\
+        distances within the cutoff, with each pair of atoms appearing once.
+        :param dtype: the float type to calculate the distances in, such as\
+        ``numpy.float32`` to halve the memory needed.
+        :param int memory: the number of bytes a block can use.
+        :param int threads: if given, the number of threads to use.
+        :returns: the row atoms, the column atoms, and the block.
+        :rtype: ``tuple``"""
+
+        atoms = self._atom_tuple()
+        for row, column, block in distance_blocks(
+         self._atom_arrays()[0], cutoff=cutoff, dtype=dtype, memory=memory,
+         threads=threads
+        ):
+            yield (
+             atoms[row:row + block.shape[0]],
+             atoms[column:column + block.shape[1]], block
+            )
+
+
+    def nearby_atoms(self, cutoff, *args, **kwargs):
         """Returns all atoms within a given distance of this structure,
         excluding the structure's own atoms.
 
-        This will be a lot faster if the model's
-        :py:meth:`.optimise_distances` has been called, as it won't have to
-        search all atoms.
+        If the structure is part of a :py:class:`.Model`, this is worked out
+        with boolean masks over all the model's atoms at once.
 
         :param float cutoff: the distance cutoff to use.
         :rtype: ``set``"""
 
-        atoms = set()
-        for atom in self.atoms():
-            atoms.update(atom.nearby_atoms(*args, **kwargs))
-        return atoms - self.atoms()
+        model, indices = self._model_indices()
+        if model is None or args:
+            atoms = set()
+            for atom in self.atoms():
+                atoms.update(atom.nearby_atoms(cutoff, *args, **kwargs))
+            return atoms - self.atoms()
+        outside = np.ones(len(model._atom_list), dtype=bool)
+        outside[indices] = False
+        mask = model._mask_near(
+         model._coordinates[indices], cutoff, np.flatnonzero(outside)
+        )
+        selection = Selection.from_mask(model._atom_list, mask, model)
+        return set(selection.filter(**kwargs) if kwargs else selection)
     
 
-    def nearby_hets(self, *args, **kwargs):
+    def nearby_hets(self, cutoff, *args, residues=True, ligands=True, **kwargs):
         """Returns all other het structures within a given distance of this
         structure, excluding itself.
 
-        This will be a lot faster if the model's
-        :py:meth:`.optimise_distances` has been called, as it won't have to
-        search all atoms.
+        If the structure is part of a :py:class:`.Model`, molecules whose
+        bounding boxes are too far from this structure's to contain anything
+        within the cutoff are rejected before any distances are calculated.
 
         :param float cutoff: the distance cutoff to use.
+        :param bool residues: if ``False``, residues will not be returned.
+        :param bool ligands: if ``False``, ligands will not be returned.
         :rtype: ``set``"""
 
-        structures = set()
-        hets = set()
-        for atom in self.atoms():
-            structures.update(atom.nearby_hets(*args, **kwargs))
-            hets.add(atom.het)
-        return structures - hets
+        model, hets = (None, None) if args else \
+         self._nearby_het_indices(cutoff, kwargs)
+        if model is None:
+            structures = set()
+            hets = set()
+            for atom in self.atoms():
+                structures.update(atom.nearby_hets(
+                 cutoff, *args, residues=residues, ligands=ligands, **kwargs
+                ))
+                hets.add(atom.het)
+            return structures - hets
+        return {het for het in (model._hets[i] for i in hets)
+         if (residues or not isinstance(het, Residue))
+         and (ligands or not isinstance(het, Ligand))}
     
 
-    def nearby_chains(self, *args, **kwargs):
+    def nearby_chains(self, cutoff, *args, **kwargs):
         """Returns all other chain structures within a given distance of this
         structure, excluding itself.
 
+        If the structure is part of a :py:class:`.Model`, molecules whose
+        bounding boxes are too far from this structure's to contain anything
+        within the cutoff are rejected before any distances are calculated.
+
         :param float cutoff: the distance cutoff to use.
         :rtype: ``set``"""
 
-        structures = set()
-        chains = set()
-        for atom in self.atoms():
-            structures.update(atom.nearby_chains(*args, **kwargs))
-            chains.add(atom.chain)
-        return structures - chains
+        model, hets = (None, None) if args else \
+         self._nearby_het_indices(cutoff, kwargs)
+        if model is None:
+            structures = set()
+            chains = set()
+            for atom in self.atoms():
+                structures.update(atom.nearby_chains(cutoff, *args, **kwargs))
+                chains.add(atom.chain)
+            return structures - chains
+        own = np.unique(model._atom_hets[self._model_indices()[1]])
+        chains = {model._hets[i].chain for i in hets}
+        return chains - {model._hets[i].chain for i in own} - {None}
+
+
+    def _nearby_het_indices(self, cutoff, filters):
+        """If the structure is part of a :py:class:`.Model`, finds the other
+        hets in the model with atoms within some distance of this structure.
+
+        The model's bounding volume hierarchy is used to prune the search:
+        molecules whose boxes are too far from this structure's box are
+        discarded whole, then hets whose boxes are too far from all of this
+        structure's het boxes, and only the atoms of what remains (on both
+        sides) have distances calculated.
+
+        :param float cutoff: the distance cutoff to use.
+        :param dict filters: criteria the nearby atoms must meet.
+        :returns: the model and the indices of the nearby hets within it, or\
+        two ``None`` values if the structure isn't part of a model.
+        :rtype: ``tuple``"""
+
+        model, indices = self._model_indices()
+        if model is None: return None, None
+        if not len(indices): return model, np.array([], dtype=int)
+        het_boxes, molecule_boxes = model._bounding_volumes()
+        own = np.unique(model._atom_hets[indices])
+        molecules = model._boxes_near(molecule_boxes, self.bounding_box[None], cutoff)
+        hets = np.setdiff1d(np.flatnonzero(molecules[model._het_molecules]), own)
+        hets = hets[model._boxes_near(het_boxes[hets], het_boxes[own], cutoff)]
+        own = own[model._boxes_near(het_boxes[own], het_boxes[hets], cutoff)]
+        mask = model._mask_near(
+         model._coordinates[np.isin(model._atom_hets, own)], cutoff,
+         np.flatnonzero(np.isin(model._atom_hets, hets))
+        )
+        if filters:
+            mask = Selection.from_mask(
+             model._atom_list, mask, model
+            ).filter(**filters).mask
+        return model, np.unique(model._atom_hets[mask])
 
 
     def translate(self, dx=0, dy=0, dz=0, trim=12):
@@ -481,11 +1140,20 @@ class Model(AtomStructure, metaclass=StructureClass):
     """The universe in which all other molecules live, interact, and generally
     exist.
 
-    It is a cotainer of its molecules, residues, and atoms.
+    It is a cotainer of its molecules, residues, and atoms. Checking whether
+    something is in a model just follows that object's references up to the
+    model it belongs to.
 
     :param \*molecules: The chains, ligands, and waters that will inhabit the\
     model."""
 
+    from atomium import data as __data
+
+    ELEMENT_TABLES = {
+     "mass": "PERIODIC_TABLE", "atomic_number": "ATOMIC_NUMBER",
+     "covalent_radius": "COVALENT_RADII", "vdw_radius": "VDW_RADII"
+    }
+
     def __init__(self, *molecules, file=None):
         AtomStructure.__init__(self, None, None)
         self._chains = set()
@@ -501,6 +1169,32 @@ class Model(AtomStructure, metaclass=StructureClass):
         self._waters = StructureSet(*self._waters)
         self._file = file
         self._internal_grid = None
+        self._residue_set = None
+        self._atom_list = None
+        self._bonds = np.zeros((0, 2), dtype=int)
+        self._adjacency = None
+
+
+    @property
+    def _bonds(self):
+        """The model's bonds, as a sorted (n, 2) array of atom indices with the
+        lower index first and no duplicates. Bonds added since this was last
+        read are merged in first.
+
+        :rtype: ``numpy.ndarray``"""
+
+        if self._pending_bonds:
+            edges = np.sort(np.concatenate(self._pending_bonds), axis=1)
+            self._bond_array = np.unique(
+             np.concatenate([self._bond_array, edges]), axis=0
+            )
+            self._pending_bonds = []
+        return self._bond_array
+
+
+    @_bonds.setter
+    def _bonds(self, edges):
+        self._bond_array, self._pending_bonds = edges, []
 
 
     def __repr__(self):
@@ -512,8 +1206,9 @@ class Model(AtomStructure, metaclass=StructureClass):
 
 
     def __contains__(self, obj):
-        return (obj in self.molecules() or obj in self.residues()
-         or obj in self.atoms())
+        if isinstance(obj, Atom): obj = obj._het
+        if isinstance(obj, Residue): obj = obj._chain
+        return isinstance(obj, Molecule) and obj._model is self
 
 
     @property
@@ -556,14 +1251,18 @@ class Model(AtomStructure, metaclass=StructureClass):
 
 
     def residues(self):
-        """Returns all of the model's residues in all its chains.
+        """Returns all of the model's residues in all its chains. These are
+        only gathered the first time they are needed, after which looking up a
+        residue by its ID (such as ``"A.123B"``) is a dictionary lookup.
 
         :rtype: ``set``"""
 
-        res = []
-        for chain in self._chains.structures:
-            res += chain.residues()
-        return StructureSet(*res)
+        if self._residue_set is None:
+            self._residue_set = StructureSet(*[
+             r for chain in self._chains.structures
+             for r in chain._ordered_residues
+            ])
+        return self._residue_set
 
 
     def atoms(self):
@@ -576,7 +1275,7 @@ class Model(AtomStructure, metaclass=StructureClass):
             try:
                 atoms.update(mol._atoms.structures)
             except:
-                for res in mol._residues.structures:
+                for res in mol._ordered_residues:
                     atoms.update(res._atoms.structures)
         return StructureSet(*atoms)
 
@@ -584,7 +1283,14 @@ class Model(AtomStructure, metaclass=StructureClass):
     def dehydrate(self):
         """Removes all water ligands from the model."""
 
+        if self._atom_list is not None and self._universes["waters"]:
+            end = self._atom_slices[self._universes["waters"][0]][0]
+            self._bonds = self._bonds[(self._bonds < end).all(axis=1)]
+        for water in self._waters.structures: water._model = None
         self._waters = StructureSet()
+        self._geometry = (None, {})
+        self._atom_list = None
+        self._adjacency = None
     
 
     def optimise_distances(self):
@@ -601,13 +1307,736 @@ class Model(AtomStructure, metaclass=StructureClass):
             self._internal_grid[x][y][z].add(atom)
 
 
+    def perceive_bonds(self, tolerance=0.4):
+        """Works out which of the model's atoms are bonded to each other from
+        their distances. Two atoms are bonded if they are no further apart than
+        the sum of their covalent radii plus some tolerance. Atoms whose element
+        has no covalent radius are not bonded to anything.
+
+        Close pairs of atoms are found with a :py:class:`.CellList`, so this
+        takes time roughly proportional to the number of atoms. Bonds found are
+        added to any the model already has.
+
+        :param float tolerance: the extra distance to allow on top of the\
+        covalent radii."""
+
+        self._add_bonds(self._covalent_edges(tolerance=tolerance))
+
+
+    def measure(self, terms):
+        """Measures many distances, angles or dihedral angles between the
+        model's atoms at once, from the model's coordinate array. Each term is
+        a pair, triple or quadruple of atoms, given either as the atoms
+        themselves or as their indices in the model (as in
+        :py:attr:`.Selection.indices`). Angles are in radians, with the middle
+        atom of a triple as the vertex.
+
+        :param terms: the terms to measure, all with the same number of atoms.
+        :raises ValueError: if the terms aren't pairs, triples or quadruples,\
+        or contain atoms that aren't in the model.
+        :rtype: ``numpy.ndarray``"""
+
+        self._build_index()
+        if not isinstance(terms, np.ndarray):
+            terms = list(terms)
+            if terms and isinstance(terms[0][0], Atom):
+                lookup = self._lookup("atoms")
+                try:
+                    terms = [[lookup[atom] for atom in term] for term in terms]
+                except KeyError as e:
+                    raise ValueError("{} is not in {}".format(e.args[0], self))
+        return measure(self._coordinates, terms)
+
+
+    def residue_contact_map(self, cutoff, mode="any-atom"):
+        """Works out which of the model's residues are in contact with each
+        other, and returns this as a symmetric sparse matrix whose rows and
+        columns are the model's residues, in chain and sequence order. Each
+        stored value is the shortest distance between the two residues.
+
+        Residues can be compared by all of their atoms (``"any-atom"``), by
+        their alpha carbons (``"CA"``) or by their beta carbons (``"CB"``, with
+        alpha carbons used for residues which have no beta carbon). Residues
+        without the atoms needed have no contacts.
+
+        All close pairs of atoms are found in one search with a
+        :py:class:`.CellList`.
+
+        :param float cutoff: the distance cutoff to use.
+        :param str mode: ``"any-atom"``, ``"CA"`` or ``"CB"``.
+        :raises ValueError: if the mode is not recognised.
+        :returns: a ``scipy.sparse.csr_matrix`` and the residues its rows and\
+        columns correspond to.
+        :rtype: ``tuple``"""
+
+        if mode not in ("any-atom", "CA", "CB"):
+            raise ValueError("'{}' is not a recognised contact mode".format(mode))
+        self._build_index()
+        residues = self._universes["residues"]
+        atoms = np.flatnonzero(self._atom_hets < len(residues))
+        if mode != "any-atom":
+            names = self._attribute_index("name")
+            chosen = names.mask("eq", mode)[atoms]
+            if mode == "CB":
+                hets = self._atom_hets[atoms]
+                chosen |= names.mask("eq", "CA")[atoms] \
+                 & ~np.isin(hets, hets[chosen])
+            atoms = atoms[chosen]
+            atoms = atoms[np.unique(self._atom_hets[atoms], return_index=True)[1]]
+        first, second, distances = CellList(
+         self._coordinates[atoms], cutoff
+        ).self_pairs(cutoff)
+        hets = self._atom_hets[atoms]
+        rows, columns = hets[first], hets[second]
+        keep = rows != columns
+        rows, columns = np.minimum(rows, columns)[keep], np.maximum(rows, columns)[keep]
+        keys = rows * len(residues) + columns
+        order = np.lexsort((distances[keep], keys))
+        _, firsts = np.unique(keys[order], return_index=True)
+        pairs = order[firsts]
+        rows, columns, distances = rows[pairs], columns[pairs], distances[keep][pairs]
+        matrix = csr_matrix((
+         np.concatenate([distances, distances]),
+         (np.concatenate([rows, columns]), np.concatenate([columns, rows]))
+        ), shape=(len(residues), len(residues)))
+        return matrix, residues
+
+
+    def chain_contact_map(self, cutoff, mode="any-atom"):
+        """Works out which of the model's chains are in contact with each other,
+        and returns this as a symmetric sparse matrix whose rows and columns
+        are the model's chains. Each stored value is the number of residue
+        contacts (see :py:meth:`.residue_contact_map`) between the two chains,
+        with contacts within a chain on the diagonal.
+
+        :param float cutoff: the distance cutoff to use.
+        :param str mode: ``"any-atom"``, ``"CA"`` or ``"CB"``.
+        :raises ValueError: if the mode is not recognised.
+        :returns: a ``scipy.sparse.csr_matrix`` and the chains its rows and\
+        columns correspond to.
+        :rtype: ``tuple``"""
+
+        residue_map, residues = self.residue_contact_map(cutoff, mode=mode)
+        chains = self._universes["chains"]
+        residue_chains = self._het_molecules[:len(residues)]
+        rows, columns = residue_map.nonzero()
+        keep = rows <= columns
+        rows, columns = residue_chains[rows[keep]], residue_chains[columns[keep]]
+        within = rows == columns
+        matrix = csr_matrix((
+         np.ones(len(rows) + (~within).sum(), dtype=int), (
+          np.concatenate([rows, columns[~within]]),
+          np.concatenate([columns, rows[~within]])
+         )
+        ), shape=(len(chains), len(chains)))
+        matrix.sum_duplicates()
+        return matrix, chains
+
+
+    def clashes(self, tolerance=0.4, exclude_bonded=True, hydrogen_bond_allowance=0.6):
+        """Finds the pairs of the model's atoms which clash - those whose van der
+        Waals spheres overlap by more than some tolerance. Close pairs are found
+        in one search with a :py:class:`.CellList`, and every pair's overlap is
+        then worked out from arrays of radii. Atoms whose element has no van der
+        Waals radius never clash.
+
+        Atoms which are within three bonds of each other are normally closer
+        than their van der Waals radii allow, and so these pairs are excluded,
+        using a sparse matrix of which atoms are within two bonds of each
+        other. As well as the model's own bonds, any pair close enough to be
+        bonded (see :py:meth:`.perceive_bonds`) counts as bonded here.
+
+        Hydrogen bond donors and acceptors sit closer together than their
+        radii suggest, and so donor-acceptor pairs are
+        allowed to overlap by an extra amount before they clash. Donors and
+        acceptors in standard residues and waters are picked out as in
+        :py:meth:`.hydrogen_bonds`, every nitrogen and oxygen of any other het
+        counts as both, and hydrogens bonded to a donor get the allowance with
+        acceptors too.
+
+        :param float tolerance: how much two atoms' spheres can overlap before\
+        they clash.
+        :param bool exclude_bonded: if ``False``, bonded atoms can clash too.
+        :param float hydrogen_bond_allowance: the extra overlap allowed between\
+        a donor and an acceptor.
+        :returns: the clashing atom pairs and how much they overlap by, as\
+        ``(atom1, atom2, overlap)`` tuples, with the largest overlaps first.
+        :rtype: ``list``"""
+
+        self._build_index()
+        radii = self._element_property("vdw_radius")
+        if not len(radii) or 2 * radii.max() <= tolerance: return []
+        cells = CellList(self._coordinates, 2 * radii.max() - tolerance)
+        first, second, distances = cells.self_pairs(cells.cell_size)
+        overlaps = radii[first] + radii[second] - distances
+        covalent = self._element_property("covalent_radius")
+        bonded = (distances <= covalent[first] + covalent[second] + 0.4) \
+         & (covalent[first] > 0) & (covalent[second] > 0)
+        edges = np.concatenate([
+         self._bonds, np.column_stack([first[bonded], second[bonded]])
+        ])
+        donors, acceptors = self._donor_acceptor_masks()
+        hydrogens = self._element_property("atomic_number") == 1
+        for atom, other in (edges.T, edges.T[::-1]):
+            donors[atom[hydrogens[atom] & donors[other] & ~hydrogens[other]]] = True
+        allowance = np.where(
+         (donors[first] & acceptors[second]) | (acceptors[first] & donors[second]),
+         hydrogen_bond_allowance, 0
+        )
+        keep = (overlaps > tolerance + allowance) \
+         & (radii[first] > 0) & (radii[second] > 0)
+        if exclude_bonded:
+            count = len(self._atom_list)
+            reach = csr_matrix((
+             np.ones(2 * len(edges) + count, dtype=int), (
+              np.concatenate([edges[:, 0], edges[:, 1], np.arange(count)]),
+              np.concatenate([edges[:, 1], edges[:, 0], np.arange(count)])
+             )
+            ), shape=(count, count))
+            candidates = np.flatnonzero(keep)
+            keep[candidates] = np.asarray((reach @ reach)[first[candidates]].multiply(
+             reach[second[candidates]]
+            ).sum(axis=1)).ravel() == 0
+        order = np.argsort(-overlaps[keep], kind="stable")
+        return [(self._atom_list[i], self._atom_list[j], overlap) for i, j, overlap in zip(
+         first[keep][order].tolist(), second[keep][order].tolist(),
+         overlaps[keep][order].tolist()
+        )]
+
+
+    def hydrogen_bonds(self, cutoff=3.5, angle=math.pi / 2):
+        """Finds the hydrogen bonds between the model's atoms. Donor and
+        acceptor atoms are picked out by their residue and atom names (using
+        the tables in :py:mod:`atomium.data`), and donor-acceptor pairs in
+        different residues are found in one search. Pairs are then kept if the
+        angles at the donor and at the acceptor, between the other atom and
+        each heavy atom bonded to them, are no smaller than some minimum. Atoms
+        count as bonded if the model has a bond between them or they are close
+        enough to be bonded (see :py:meth:`.perceive_bonds`).
+
+        Pairs of atoms which could each be the donor, such as two waters, are
+        only given once.
+
+        :param float cutoff: the largest donor-acceptor distance.
+        :param float angle: the smallest allowed angle, in radians.
+        :returns: ``(donor, acceptor, distance)`` tuples, ordered by donor.
+        :rtype: ``list``"""
+
+        self._build_index()
+        donors, acceptors = [np.flatnonzero(self._table_mask(table))
+         for table in (self.__data.DONORS, self.__data.ACCEPTORS)]
+        first, second, distances = close_pairs(
+         self._coordinates, donors, acceptors, cutoff
+        )
+        keep = self._atom_hets[first] != self._atom_hets[second]
+        first, second, distances = first[keep], second[keep], distances[keep]
+        atoms = np.union1d(first, second)
+        offsets, neighbours = csr_adjacency(np.concatenate([
+         self._bonds, self._covalent_edges(atoms)
+        ]), len(self._atom_list))
+        heavy = self._element_property("atomic_number") != 1
+        with np.errstate(invalid="ignore"):
+            keep = ~(antecedent_angles(
+             self._coordinates, first, second, offsets, neighbours, heavy
+            ) < angle) & ~(antecedent_angles(
+             self._coordinates, second, first, offsets, neighbours, heavy
+            ) < angle)
+        first, second, distances = first[keep], second[keep], distances[keep]
+        keys = np.minimum(first, second) * len(self._atom_list) \
+         + np.maximum(first, second)
+        unique = np.sort(np.unique(keys, return_index=True)[1])
+        return self._atom_pair_table(first[unique], second[unique], distances[unique])
+
+
+    def salt_bridges(self, cutoff=4):
+        """Finds the salt bridges between the model's residues - charged side
+        chain atoms of opposite charge (picked out by their residue and atom
+        names) in different residues, within some distance of each other.
+
+        :param float cutoff: the largest distance between the charged atoms.
+        :returns: ``(cation, anion, distance)`` tuples, ordered by cation.
+        :rtype: ``list``"""
+
+        self._build_index()
+        first, second, distances = close_pairs(self._coordinates, *[
+         np.flatnonzero(self._table_mask(table))
+         for table in (self.__data.CATIONS, self.__data.ANIONS)
+        ], cutoff)
+        keep = self._atom_hets[first] != self._atom_hets[second]
+        return self._atom_pair_table(first[keep], second[keep], distances[keep])
+
+
+    def metal_coordination(self, cutoff=2.8):
+        """Finds the atoms coordinating the model's metal atoms - atoms of
+        elements such as nitrogen, oxygen and sulphur within some distance of
+        a metal atom.
+
+        :param float cutoff: the largest metal-atom distance.
+        :returns: ``(metal, atom, distance)`` tuples, ordered by metal.
+        :rtype: ``list``"""
+
+        self._build_index()
+        return self._atom_pair_table(*close_pairs(self._coordinates, *[
+         np.flatnonzero(self._element_mask(elements)) for elements in (
+          self.__data.METALS, self.__data.COORDINATING_ELEMENTS
+         )
+        ], cutoff))
+
+
+    def metal_sites(self, cutoff=2.8):
+        """Describes the coordination site of every metal atom in the model.
+        Metal atoms are picked out with the model's element index, their
+        coordinating atoms are found in one search (see
+        :py:meth:`.metal_coordination`), and then the angles between the
+        coordinating atoms of every site with the same number of them are
+        calculated together.
+
+        Each site's geometry is the ideal coordination geometry (such as
+        ``"tetrahedral"`` or ``"octahedral"``) whose angles are closest to the
+        site's, as measured by the RMS difference between their sorted angles.
+
+        :param float cutoff: the largest metal-atom distance.
+        :returns: a ``dict`` for each metal atom, in model order, with the\
+        keys ``"metal"``, ``"atoms"`` (the coordinating atoms, nearest\
+        first), ``"distances"``, ``"angles"`` (every atom-metal-atom angle,\
+        in radians), ``"geometry"`` (``None`` if there is no ideal geometry\
+        for the site's coordination number) and ``"deviation"`` (the RMS\
+        difference from the ideal geometry's angles, in radians).
+        :rtype: ``list``"""
+
+        self._build_index()
+        metals = np.flatnonzero(self._element_mask(self.__data.METALS))
+        first, second, distances = close_pairs(
+         self._coordinates, metals,
+         np.flatnonzero(self._element_mask(self.__data.COORDINATING_ELEMENTS)),
+         cutoff
+        )
+        order = np.lexsort((distances, first))
+        first, second, distances = first[order], second[order], distances[order]
+        sites = np.searchsorted(metals, first)
+        counts = np.bincount(sites, minlength=len(metals))
+        starts = np.cumsum(counts) - counts
+        results = [{
+         "metal": self._atom_list[metal], "atoms": (), "distances": np.zeros(0),
+         "angles": np.zeros(0), "geometry": None, "deviation": None
+        } for metal in metals.tolist()]
+        for count in np.unique(counts).tolist():
+            group = np.flatnonzero(counts == count)
+            positions = starts[group, None] + np.arange(count)
+            vectors = self._coordinates[second[positions]] \
+             - self._coordinates[metals[group]][:, None]
+            vectors /= np.linalg.norm(vectors, axis=2, keepdims=True)
+            upper = np.triu_indices(count, 1)
+            angles = np.arccos(np.clip(np.einsum(
+             "sik,sjk->sij", vectors, vectors
+            )[:, upper[0], upper[1]], -1, 1))
+            names, deviations = [None] * len(group), [None] * len(group)
+            ideals = self.__data.COORDINATION_GEOMETRIES.get(count, {})
+            if ideals:
+                rms = np.sqrt(np.mean((np.sort(angles, axis=1)[:, None] - np.radians(
+                 [sorted(ideal) for ideal in ideals.values()]
+                )[None]) ** 2, axis=2))
+                best = rms.argmin(axis=1)
+                names = [list(ideals)[i] for i in best.tolist()]
+                deviations = rms[np.arange(len(group)), best].tolist()
+            for index, site, name, deviation, site_angles in zip(
+             group.tolist(), positions, names, deviations, angles
+            ):
+                results[index].update({
+                 "atoms": tuple(self._atom_list[i] for i in second[site].tolist()),
+                 "distances": distances[site], "angles": site_angles,
+                 "geometry": name, "deviation": deviation
+                })
+        return results
+
+
+    def _covalent_edges(self, atoms=None, tolerance=0.4):
+        """Works out which pairs of the model's atoms are close enough to be
+        bonded (see :py:meth:`.perceive_bonds`), without adding them to the
+        model's bonds.
+
+        :param numpy.ndarray atoms: if given, only bonds to these atoms will\
+        be looked for.
+        :param float tolerance: the extra distance to allow on top of the\
+        covalent radii.
+        :returns: an (n, 2) array of atom indices.
+        :rtype: ``numpy.ndarray``"""
+
+        self._build_index()
+        radii = self._element_property("covalent_radius")
+        if not len(radii) or radii.max() <= 0: return np.zeros((0, 2), dtype=int)
+        cells = CellList(self._coordinates, 2 * radii.max() + tolerance)
+        if atoms is None:
+            first, second, distances = cells.self_pairs(cells.cell_size)
+        else:
+            atoms = np.asarray(atoms, dtype=int)
+            queries, second, distances = cells.pairs(
+             self._coordinates[atoms], cells.cell_size
+            )
+            first = atoms[queries]
+        keep = (distances <= radii[first] + radii[second] + tolerance) \
+         & (radii[first] > 0) & (radii[second] > 0) & (first != second)
+        return np.column_stack([first[keep], second[keep]])
+
+
+    def _table_mask(self, table):
+        """Returns a boolean mask over the model's atoms, marking those whose
+        het and atom names are in some table mapping het names to atom names.
+
+        :param dict table: the table to look atoms up in.
+        :rtype: ``numpy.ndarray``"""
+
+        self._build_index()
+        if not len(self._atom_list): return np.zeros(0, dtype=bool)
+        keys = ["{} {}".format(het, name)
+         for het, names in table.items() for name in names]
+        het_names = np.array([str(het._name) + " " for het in self._hets])
+        return np.isin(np.char.add(
+         het_names[self._atom_hets],
+         np.array([str(atom._name) for atom in self._atom_list])
+        ), keys)
+
+
+    def _donor_acceptor_masks(self):
+        """Returns boolean masks over the model's atoms, marking the hydrogen
+        bond donors and acceptors. Atoms in standard residues and waters are
+        looked up in the tables in :py:mod:`atomium.data`, and every nitrogen
+        and oxygen in any other het is taken to be both.
+
+        :returns: the donor mask and the acceptor mask.
+        :rtype: ``tuple``"""
+
+        donors, acceptors = [self._table_mask(table)
+         for table in (self.__data.DONORS, self.__data.ACCEPTORS)]
+        if not len(donors): return donors, acceptors
+        listed = np.isin(
+         np.array([str(het._name) for het in self._hets]), list(self.__data.DONORS)
+        )[self._atom_hets]
+        polar = ~listed & self._element_mask({"N", "O"})
+        return donors | polar, acceptors | polar
+
+
+    def _element_mask(self, elements):
+        """Returns a boolean mask over the model's atoms, marking those whose
+        element is one of those given. Each distinct element is only checked
+        once.
+
+        :param elements: the upper case element symbols to look for.
+        :rtype: ``numpy.ndarray``"""
+
+        symbols, indices = self._elements()
+        return np.array([s in elements for s in symbols], dtype=bool)[indices]
+
+
+    def _atom_pair_table(self, first, second, distances):
+        """Turns arrays of atom index pairs and their distances into a list of
+        ``(atom1, atom2, distance)`` tuples.
+
+        :param numpy.ndarray first: the indices of the first atoms.
+        :param numpy.ndarray second: the indices of the second atoms.
+        :param numpy.ndarray distances: the distance between each pair.
+        :rtype: ``list``"""
+
+        atoms = self._atom_list
+        return [(atoms[i], atoms[j], distance) for i, j, distance in zip(
+         first.tolist(), second.tolist(), distances.tolist()
+        )]
+
+
+    def _add_bonds(self, edges):
+        """Adds bonds between pairs of atom indices to the model's bonds. The
+        new edges are only queued here - they are sorted and merged into the
+        edge array the next time it is read, so that adding bonds one at a
+        time doesn't rebuild the array each time.
+
+        :param numpy.ndarray edges: an (n, 2) array of atom indices."""
+
+        self._pending_bonds.append(np.asarray(edges, dtype=int).reshape(-1, 2))
+        self._adjacency = None
+
+
+    def _bond_adjacency(self):
+        """Returns the model's bonds as CSR adjacency arrays - an offsets array
+        and a neighbours array, with the atoms bonded to the atom at index
+        ``i`` being at ``neighbours[offsets[i]:offsets[i + 1]]``. These are
+        made from the edge array the first time they are needed.
+
+        :rtype: ``tuple``"""
+
+        self._build_index()
+        if self._adjacency is None:
+            self._adjacency = csr_adjacency(self._bonds, len(self._atom_list))
+        return self._adjacency
+
+
+    def _bonded_to(self, atom):
+        """Returns the atoms that some atom of the model is bonded to, according
+        to the model's bonds.
+
+        :param Atom atom: the atom to look up.
+        :rtype: ``list``"""
+
+        if not len(self._bonds): return []
+        offsets, neighbours = self._bond_adjacency()
+        index = self._atom_index(atom)
+        return [self._atom_list[i]
+         for i in neighbours[offsets[index]:offsets[index + 1]].tolist()]
+
+
+    def _atom_index(self, atom):
+        """Returns the position of one of the model's atoms in its index.
+
+        :param Atom atom: the atom to look up.
+        :rtype: ``int``"""
+
+        self._build_index()
+        index = atom._index
+        if index is not None and index < len(self._atom_list) \
+         and self._atom_list[index] is atom:
+            return index
+        return self._lookup("atoms")[atom]
+
+
+    def _build_index(self):
+        """Assigns every atom in the model a dense integer index - its position
+        in a fixed ordering of the model's atoms. Atoms are ordered molecule by
+        molecule and het by het, so that every chain, residue and ligand owns a
+        contiguous range of indices.
+
+        The atoms' coordinates are gathered into a single array at the same
+        time, and each atom's location becomes a view onto its row of that
+        array, so that the array always reflects where the atoms actually are.
+
+        Each atom also records its own index, so that it can be found in the
+        model without a search.
+
+        This is done lazily, the first time anything needs the index, and
+        again if the model's contents change."""
+
+        if self._atom_list is not None: return
+        chains = tuple(self._chains.structures)
+        ligands = tuple(self._ligands.structures)
+        waters = tuple(self._waters.structures)
+        residues = tuple(r for c in chains for r in c._ordered_residues)
+        atoms, slices, hets, sizes, het_molecules = [], {}, [], [], []
+        for index, molecule in enumerate(chains + ligands + waters):
+            start = len(atoms)
+            for het in molecule._ordered_residues \
+             if isinstance(molecule, Chain) else [molecule]:
+                het_start = len(atoms)
+                atoms += het._atoms.structures
+                slices[het] = (het_start, len(atoms))
+                hets.append(het)
+                sizes.append(len(atoms) - het_start)
+                het_molecules.append(index)
+            slices[molecule] = (start, len(atoms))
+        slices[self] = (0, len(atoms))
+        coordinates = np.array(
+         [a._location for a in atoms], dtype=float
+        ).reshape(len(atoms), 3)
+        for index, (atom, row) in enumerate(zip(atoms, coordinates)):
+            atom._location, atom._index = row, index
+        self._coordinates, self._atom_slices = coordinates, slices
+        self._hets = tuple(hets)
+        self._atom_hets = np.repeat(np.arange(len(hets)), sizes)
+        self._het_sizes = np.array(sizes, dtype=int)
+        self._het_molecules = np.array(het_molecules, dtype=int)
+        self._lookups, self._attribute_indexes = {}, {}
+        self._element_indices, self._element_properties = None, {}
+        self._universes = {
+         "chains": chains, "ligands": ligands, "waters": waters,
+         "molecules": chains + ligands + waters, "residues": residues
+        }
+        self._atom_list = self._universes["atoms"] = tuple(atoms)
+
+
+    def selection_from_bitset(self, bitset, objects="atoms"):
+        """Recreates a :py:class:`.Selection` of the model's structures from
+        the compact bitset produced by :py:meth:`.Selection.bitset`.
+
+        Bitsets refer to structures by their position in the model, so they
+        can only be restored onto the same model, parsed from the same file.
+
+        :param bytes bitset: the packed bitset.
+        :param str objects: the kind of structure the bitset selects.
+        :rtype: ``Selection``"""
+
+        self._build_index()
+        universe = self._universes[objects]
+        mask = np.unpackbits(
+         np.frombuffer(bitset, dtype=np.uint8), count=len(universe)
+        ).astype(bool)
+        return Selection.from_mask(universe, mask, self)
+
+
+    def _bounding_volumes(self):
+        """Returns the axis-aligned bounding boxes of every het in the model
+        and of every molecule in the model, as n × 2 × 3 arrays in the order
+        of the model's het and molecule indexes. Together these form a
+        two-level hierarchy for pruning proximity searches. Structures with no
+        atoms get inverted, infinite boxes which are never near anything.
+
+        They are recalculated only when atoms have moved.
+
+        :rtype: ``tuple``"""
+
+        def volumes():
+            self._build_index()
+            het_boxes = np.empty((len(self._hets), 2, 3))
+            het_boxes[:, 0], het_boxes[:, 1] = np.inf, -np.inf
+            filled = self._het_sizes > 0
+            if filled.any():
+                starts = (np.cumsum(self._het_sizes) - self._het_sizes)[filled]
+                het_boxes[filled, 0] = np.minimum.reduceat(
+                 self._coordinates, starts
+                )
+                het_boxes[filled, 1] = np.maximum.reduceat(
+                 self._coordinates, starts
+                )
+            molecule_boxes = np.empty((len(self._universes["molecules"]), 2, 3))
+            molecule_boxes[:, 0], molecule_boxes[:, 1] = np.inf, -np.inf
+            np.minimum.at(molecule_boxes[:, 0], self._het_molecules, het_boxes[:, 0])
+            np.maximum.at(molecule_boxes[:, 1], self._het_molecules, het_boxes[:, 1])
+            return het_boxes, molecule_boxes
+        return self._cached_geometry("bounding_volumes", volumes)
+
+
+    @staticmethod
+    def _boxes_near(boxes, queries, cutoff):
+        """Returns a boolean mask over some bounding boxes, marking those which
+        come within some distance of any of the query boxes.
+
+        :param numpy.ndarray boxes: the n × 2 × 3 boxes to check.
+        :param numpy.ndarray queries: the m × 2 × 3 boxes to search around.
+        :param float cutoff: the distance cutoff to use.
+        :rtype: ``numpy.ndarray``"""
+
+        near = np.zeros(len(boxes), dtype=bool)
+        if len(boxes) * len(queries) > 2 ** 20:
+            filled, query_filled = [np.flatnonzero(np.isfinite(b).all(axis=(1, 2)))
+             for b in (boxes, queries)]
+            if not len(filled) or not len(query_filled): return near
+            centres, query_centres = [(b[i, 0] + b[i, 1]) / 2
+             for b, i in ((boxes, filled), (queries, query_filled))]
+            reach = cutoff + sum(np.linalg.norm(b[i, 1] - b[i, 0], axis=1).max() / 2
+             for b, i in ((boxes, filled), (queries, query_filled)))
+            chunks, points, _ = CellList(centres, reach).pairs(query_centres, reach)
+            first, second = boxes[filled[points]], queries[query_filled[chunks]]
+            gaps = np.maximum(np.maximum(
+             second[:, 0] - first[:, 1], first[:, 0] - second[:, 1]
+            ), 0)
+            near[filled[points[np.sum(gaps ** 2, axis=1) <= cutoff ** 2]]] = True
+            return near
+        gaps = np.maximum(np.maximum(
+         queries[None, :, 0] - boxes[:, None, 1],
+         boxes[:, None, 0] - queries[None, :, 1]
+        ), 0)
+        near |= np.any(np.sum(gaps ** 2, axis=2) <= cutoff ** 2, axis=1)
+        return near
+
+
+    def _mask_near(self, points, cutoff, candidates=None):
+        """Returns a boolean mask over the model's atoms, marking those within
+        some distance of any of the points given. Candidate atoms outside the
+        points' bounding box (plus the cutoff) are discarded, and the rest are
+        put in a :py:class:`.CellList` so that each point is only compared with
+        the atoms in the cells around it.
+
+        :param numpy.ndarray points: the points to search around.
+        :param float cutoff: the distance cutoff to use.
+        :param numpy.ndarray candidates: if given, only the atoms at these\
+        indices will be considered.
+        :rtype: ``numpy.ndarray``"""
+
+        self._build_index()
+        coordinates = self._coordinates
+        mask = np.zeros(len(coordinates), dtype=bool)
+        if not len(points): return mask
+        if candidates is None: candidates = np.arange(len(coordinates))
+        lower = points.min(axis=0) - cutoff
+        upper = points.max(axis=0) + cutoff
+        candidates = candidates[np.all(
+         (coordinates[candidates] >= lower) & (coordinates[candidates] <= upper),
+         axis=1
+        )]
+        if cutoff < 0 or not len(candidates): return mask
+        cells = CellList(coordinates[candidates], max(cutoff, 1))
+        mask[candidates[cells.pairs(points, cutoff)[1]]] = True
+        return mask
+
+
+    def _attribute_index(self, attribute):
+        """Returns an :py:class:`.AttributeIndex` of some atom attribute across
+        all the model's atoms, creating it the first time it is needed. Only
+        the attributes in :py:attr:`.Atom.INDEXED` are indexed - for any other
+        attribute, ``None`` is returned.
+
+        :param str attribute: the atom attribute to index.
+        :rtype: ``AttributeIndex``"""
+
+        if attribute not in Atom.INDEXED: return None
+        self._build_index()
+        if attribute not in self._attribute_indexes:
+            self._attribute_indexes[attribute] = AttributeIndex(
+             [getattr(atom, attribute) for atom in self._atom_list]
+            )
+        return self._attribute_indexes[attribute]
+
+
+    def _element_property(self, name):
+        """Returns an array of some element-derived property - ``"mass"``,
+        ``"atomic_number"``, ``"covalent_radius"`` or ``"vdw_radius"`` - for
+        every atom in the model. Each distinct element is only looked up once,
+        and the array is kept for next time.
+
+        :param str name: the property to get.
+        :rtype: ``numpy.ndarray``"""
+
+        if name not in self._element_properties:
+            symbols, indices = self._elements()
+            table = getattr(self.__data, self.ELEMENT_TABLES[name])
+            values = np.array([table.get(sym, 0) for sym in symbols], dtype=float)
+            self._element_properties[name] = values[indices]
+        return self._element_properties[name]
+
+
+    def _elements(self):
+        """Returns the distinct upper case element symbols of the model's
+        atoms, and the position of each atom's element among them.
+
+        :rtype: ``tuple``"""
+
+        self._build_index()
+        if self._element_indices is None:
+            symbols, indices = np.unique([
+             atom._element.upper() for atom in self._atom_list
+            ], return_inverse=True)
+            self._element_indices = (symbols, indices.ravel())
+        return self._element_indices
+
+
+    def _lookup(self, objects):
+        """Returns a dictionary mapping each of the model's structures of some
+        kind to its index in the model.
+
+        :param str objects: the kind of structure.
+        :rtype: ``dict``"""
+
+        self._build_index()
+        if objects not in self._lookups:
+            self._lookups[objects] = {
+             obj: i for i, obj in enumerate(self._universes[objects])
+            }
+        return self._lookups[objects]
+
+
     #TODO copy
 
 
 
 class Chain(Molecule, metaclass=StructureClass):
     """A sequence of residues. Unlike other structures, they are iterable, and
-    have a length.
+    have a length. They contain their residues and those residues' atoms.
 
     Residues can also be accessed using indexing.
 
@@ -618,6 +2047,8 @@ class Chain(Molecule, metaclass=StructureClass):
     :param list helices: the alpha helices within the chain.
     :param list strands: the beta strands within the chain."""
 
+    from atomium import data as __data
+
     def __init__(self, *residues, sequence="", helices=None, strands=None, information=None, **kwargs):
         Molecule.__init__(
          self, kwargs.get("id"), kwargs.get("name"), kwargs.get("internal_id")
@@ -625,29 +2056,33 @@ class Chain(Molecule, metaclass=StructureClass):
         self._sequence = sequence
         for res in residues: res._chain = self
         self._residues = StructureSet(*residues)
+        self._ordered_residues = tuple(self._residues.structures)
         self._model = None
         self._helices = helices or []
         self._strands = strands or []
         self._information = information or {}
 
     def __repr__(self):
-        return "<Chain {} ({} residues)>".format(self._id, len(self._residues))
+        return "<Chain {} ({} residues)>".format(
+         self._id, len(self._ordered_residues)
+        )
 
 
     def __len__(self):
-        return len(self._residues)
+        return len(self._ordered_residues)
 
 
     def __iter__(self):
-        return iter(self._residues.structures)
+        return iter(self._ordered_residues)
 
 
     def __getitem__(self, key):
-        return self.residues()[key]
+        return self._ordered_residues[key]
 
 
     def __contains__(self, obj):
-        return obj in self._residues.structures or obj in self.atoms()
+        if isinstance(obj, Atom): obj = obj._het
+        return isinstance(obj, Residue) and obj._chain is self
 
 
     @property
@@ -731,6 +2166,57 @@ class Chain(Molecule, metaclass=StructureClass):
          helices=[tuple(residues[r] for r in h) for h in self._helices],
          strands=[tuple(residues[r] for r in s) for s in self._strands]
         )
+
+
+    def dihedrals(self, chi=False, break_distance=2):
+        """Calculates the backbone dihedral angles of every residue in the
+        chain, and optionally their side chain chi angles, in radians. The
+        atoms needed are gathered into arrays once, and every angle of each
+        kind is then calculated at the same time.
+
+        Phi uses the previous residue's C atom, and psi and omega use the next
+        residue's N (and for omega, CA) atoms. Angles which can't be calculated
+        - at the ends of the chain, across a gap where the C and N atoms are
+        further apart than the break distance, or where atoms are missing, or
+        for chi angles a residue doesn't have - are NaN.
+
+        :param bool chi: if ``True``, chi1 to chi4 angles will be included.
+        :param float break_distance: the longest C-N distance that still\
+        counts as a peptide bond.
+        :returns: a ``dict`` of arrays with one angle per residue, in the\
+        chain's residue order, with the keys ``"phi"``, ``"psi"`` and\
+        ``"omega"`` (and ``"chi1"`` to ``"chi4"``).
+        :rtype: ``dict``"""
+
+        residues = self._ordered_residues
+        atoms, coordinates = self._atom_tuple(), self._atom_arrays()[0]
+        positions = {(atom._het, atom._name): index
+         for index, atom in enumerate(atoms)}
+        coordinates = np.concatenate([coordinates, np.full((1, 3), np.nan)])
+        def gather(names):
+            return coordinates[np.array([[
+             positions.get((residue, name), -1) for name in residue_names
+            ] for residue, residue_names in zip(residues, names)
+            ], dtype=int).reshape(len(residues), -1)].transpose(1, 0, 2)
+        n, ca, c = gather([("N", "CA", "C")] * len(residues))
+        linked = np.linalg.norm(n[1:] - c[:-1], axis=1) <= break_distance
+        previous_c, next_n, next_ca = np.full((3, len(residues), 3), np.nan)
+        previous_c[1:][linked] = c[:-1][linked]
+        next_n[:-1][linked], next_ca[:-1][linked] = n[1:][linked], ca[1:][linked]
+        angles = {
+         "phi": dihedrals(previous_c, n, ca, c),
+         "psi": dihedrals(n, ca, c, next_n),
+         "omega": dihedrals(ca, c, next_n, next_ca)
+        }
+        if chi:
+            chis = [self.__data.CHI_ATOMS.get(residue._name, ())
+             for residue in residues]
+            for index in range(4):
+                angles["chi{}".format(index + 1)] = dihedrals(*gather([
+                 names[index] if len(names) > index else (None,) * 4
+                 for names in chis
+                ]))
+        return angles
     
 
     def residues(self):
@@ -758,7 +2244,7 @@ class Chain(Molecule, metaclass=StructureClass):
         :rtype: ``set``"""
 
         atoms = set()
-        for res in self._residues.structures:
+        for res in self._ordered_residues:
             atoms.update(res._atoms.structures)
         return StructureSet(*atoms)
 
@@ -971,17 +2457,22 @@ class Atom:
 
     from atomium import data as __data
 
+    INDEXED = ("id", "element", "name", "charge", "bvalue", "mass")
+
+    _coordinate_version = 0
+
     __slots__ = [
      "_element", "_location", "_id", "_name", "_charge",
-     "_bvalue", "_anisotropy", "_het", "_bonded_atoms", "_is_hetatm"
+     "_bvalue", "_anisotropy", "_het", "_bonded_atoms", "_is_hetatm", "_index"
     ]
 
     def __init__(self, element, x, y, z, id, name, charge, bvalue, anisotropy, is_hetatm=False):
-        self._location = np.array([x, y, z])
+        self._location = np.array([x, y, z], dtype=float)
         self._element = element
         self._id, self._name, self._charge = id, name, charge
         self._bvalue, self._anisotropy = bvalue, anisotropy
-        self._het, self._bonded_atoms, self._is_hetatm = None, set(), is_hetatm
+        self._het, self._bonded_atoms, self._is_hetatm = None, None, is_hetatm
+        self._index = None
 
 
     def __repr__(self):
@@ -995,7 +2486,7 @@ class Atom:
     def __eq__(self, other):
         if not isinstance(other, Atom): return False
         for attr in self.__slots__:
-            if attr not in ("_id", "_het", "_bonded_atoms", "_location"):
+            if attr not in ("_id", "_het", "_bonded_atoms", "_location", "_index"):
                 if getattr(self, attr) != getattr(other, attr): return False
             if list(self._location) != list(other._location): return False
         return True
@@ -1014,6 +2505,7 @@ class Atom:
 
         for atom in atoms:
             atom._location += np.array(vector)
+        Atom._coordinate_version += 1
 
 
     @staticmethod
@@ -1026,7 +2518,8 @@ class Atom:
         locations = [list(a) for a in atoms]
         output = np.dot(np.array(matrix), np.array(locations).transpose())
         for atom, location in zip(atoms, output.transpose()):
-            atom._location = location
+            atom._location[:] = location
+        Atom._coordinate_version += 1
 
 
     @staticmethod
@@ -1096,6 +2589,7 @@ class Atom:
     @name.setter
     def name(self, name):
         self._name = name
+        self._invalidate_index("name")
 
 
     @property
@@ -1110,6 +2604,7 @@ class Atom:
     @charge.setter
     def charge(self, charge):
         self._charge = charge
+        self._invalidate_index("charge")
 
 
     @property
@@ -1125,6 +2620,7 @@ class Atom:
     @bvalue.setter
     def bvalue(self, bvalue):
         self._bvalue = bvalue
+        self._invalidate_index("bvalue")
 
 
     @property
@@ -1139,11 +2635,16 @@ class Atom:
 
     @property
     def bonded_atoms(self):
-        """Returns the atoms this atom is bonded to.
+        """Returns the atoms this atom is bonded to. If the atom is part of a
+        :py:class:`.Model`, these are looked up in the model's bonds, which are
+        stored as arrays rather than on each atom.
 
         :rtype: ``set```"""
 
-        return self._bonded_atoms
+        bonded = set(self._bonded_atoms or ())
+        model = self.model
+        if model is not None: bonded.update(model._bonded_to(self))
+        return bonded
 
 
     @property
@@ -1185,6 +2686,19 @@ class Atom:
         return self.__data.COVALENT_RADII.get(self._element.upper(), 0)
 
 
+    @property
+    def vdw_radius(self):
+        """The atom's van der Waals radius, based on the atom's
+        :py:meth:`element`. If there is no radius for the element, a radius of
+        0 will be returned.
+
+        The element lookup is case-insensitive.
+
+        :rtype: ``float``"""
+
+        return self.__data.VDW_RADII.get(self._element.upper(), 0)
+
+
     @property
     def is_metal(self):
         """Checks whether the atom's element matches a metal element.
@@ -1223,7 +2737,8 @@ class Atom:
         :param Atom other: The other atom (or location tuple).
         :rtype: ``float``"""
 
-        return np.linalg.norm(self._location - np.array(list(other)))
+        location = other._location if isinstance(other, Atom) else other
+        return float(distances(self._location, location)[0])
 
 
     def angle(self, atom1, atom2):
@@ -1232,13 +2747,7 @@ class Atom:
         :param Atom atom1: The first atom.
         :param Atom atom2: Thne second atom."""
 
-        vectors = [
-         [v1 - v2 for v1, v2 in zip(atom.location, self.location)
-        ] for atom in (atom1, atom2)]
-        normalized = [np.linalg.norm(v) for v in vectors]
-        if 0 in normalized: return 0
-        vectors = [v / n for v, n in zip(vectors, normalized)]
-        return np.arccos(np.clip(np.dot(vectors[0], vectors[1]), -1.0, 1.0))
+        return float(angles(atom1._location, self._location, atom2._location)[0])
     
 
     def copy(self, id=None):
@@ -1281,7 +2790,18 @@ class Atom:
 
         :rtype: ``Model``"""
 
-        if self.chain: return self.chain.model
+        if self._het: return self._het.model
+
+
+    def _invalidate_index(self, attribute):
+        """Discards the model's index of some attribute after the atom's value
+        for it has been changed.
+
+        :param str attribute: the attribute that has changed."""
+
+        model = self.model
+        if model is not None and model._atom_list is not None:
+            model._attribute_indexes.pop(attribute, None)
 
 
     def nearby_atoms(self, cutoff, *args, **kwargs):
@@ -1403,6 +2923,7 @@ class Atom:
         :param number z: The atom's new z coordinate."""
 
         self._location[0], self._location[1], self._location[2] = x, y, z
+        Atom._coordinate_version += 1
 
 
     def trim(self, places):
@@ -1413,13 +2934,22 @@ class Atom:
         ``None``, no rounding will be done."""
 
         if places is not None:
-            self._location = np.round(self._location, places)
+            np.round(self._location, places, out=self._location)
+            Atom._coordinate_version += 1
 
 
     def bond(self, other):
-        """Bonds the atom to some other atom.
+        """Bonds the atom to some other atom. If both atoms are part of the same
+        :py:class:`.Model`, the bond is added to the model's bonds - otherwise
+        it is stored on the atoms themselves.
 
         :param Atom other: the other atom to bond to."""
-        
-        self._bonded_atoms.add(other)
-        other._bonded_atoms.add(self)
+
+        model = self.model
+        if model is not None and other.model is model:
+            model._add_bonds([(model._atom_index(self), model._atom_index(other))])
+        else:
+            if self._bonded_atoms is None: self._bonded_atoms = set()
+            if other._bonded_atoms is None: other._bonded_atoms = set()
+            self._bonded_atoms.add(other)
+            other._bonded_atoms.add(self)
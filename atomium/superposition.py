@@ -0,0 +1,157 @@
+"""Contains functions for superposing many structures at once."""
+
+import numpy as np
+
+def stack_coordinates(structures, reference=None):
+    """Takes some structures with the same number of atoms, pairs each of their
+    atoms with those of a reference structure (using
+    :py:meth:`.AtomStructure.pairing_with`), and returns all their coordinates
+    as a single array of shape (structures, atoms, 3). The atoms are in the
+    order of the reference structure's atoms.
+
+    :param structures: the structures to stack.
+    :param AtomStructure reference: the structure to pair atoms with. If not\
+    given, the first structure is used.
+    :raises ValueError: if the structures have different numbers of atoms.
+    :rtype: ``numpy.ndarray``"""
+
+    structures = list(structures)
+    orders = pair_atoms(structures, reference)
+    stack = np.empty((len(structures), len(orders[0]) if orders else 0, 3))
+    for layer, structure, order in zip(stack, structures, orders):
+        layer[:] = structure._atom_arrays()[0][order]
+    return stack
+
+
+def pair_atoms(structures, reference=None):
+    """Pairs the atoms of some structures with those of a reference structure
+    (using :py:meth:`.AtomStructure.pairing_with`). For each structure, an
+    array of positions is returned which puts the structure's atoms, in the
+    order they are stored, into the order of the reference's atoms.
+
+    :param structures: the structures to pair.
+    :param AtomStructure reference: the structure to pair atoms with. If not\
+    given, the first structure is used.
+    :raises ValueError: if the structures have different numbers of atoms.
+    :rtype: ``list``"""
+
+    structures = list(structures)
+    if reference is None and structures: reference = structures[0]
+    orders = []
+    for structure in structures:
+        _, _, indices, reference_indices = structure.pairing_indices_with(reference)
+        order = np.empty(len(indices), dtype=int)
+        order[reference_indices] = indices
+        orders.append(order)
+    return orders
+
+
+def kabsch(coordinates, reference, weights=None):
+    """Finds the rotations which best superpose one or more sets of coordinates
+    onto a reference set, once each has been moved to its centroid, using a
+    batched singular value decomposition of their covariance matrices.
+
+    A set of coordinates ``x`` (with centroid ``c``) is superposed onto the
+    reference (with centroid ``r``) by ``(x - c) @ rotation + r``.
+
+    :param numpy.ndarray coordinates: an array of shape (sets, atoms, 3), or a\
+    single (atoms, 3) set.
+    :param numpy.ndarray reference: the (atoms, 3) reference coordinates.
+    :param weights: if given, a weight for each atom (masses for example).
+    :raises ValueError: if the sets have different numbers of atoms.
+    :returns: the (sets, 3, 3) rotation matrices and the RMSD of each\
+    superposed set from the reference.
+    :rtype: ``tuple``"""
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    single = coordinates.ndim == 2
+    if single: coordinates = coordinates[None]
+    if coordinates.shape[1:] != reference.shape:
+        raise ValueError("Coordinates of shape {} can't be superposed onto {}".format(
+         coordinates.shape[1:], reference.shape
+        ))
+    weights = np.ones(len(reference)) if weights is None \
+     else np.asarray(weights, dtype=float)
+    total = weights.sum()
+    moving = coordinates - (
+     np.einsum("a,nak->nk", weights, coordinates) / total
+    )[:, None]
+    fixed = reference - weights @ reference / total
+    covariance = np.einsum("nak,a,al->nkl", moving, weights, fixed)
+    u, values, vt = np.linalg.svd(covariance)
+    signs = np.where(np.linalg.det(u @ vt) < 0, -1.0, 1.0)
+    u[:, :, 2] *= signs[:, None]
+    values[:, 2] *= signs
+    squares = np.einsum("a,nak,nak->n", weights, moving, moving) \
+     + weights @ np.sum(fixed ** 2, axis=1)
+    rmsds = np.sqrt(np.maximum(squares - 2 * values.sum(axis=1), 0) / total)
+    rotations = u @ vt
+    return (rotations[0], rmsds[0]) if single else (rotations, rmsds)
+
+
+def rmsd_to_reference(coordinates, reference, weights=None):
+    """Calculates the RMSD of every set of coordinates in a stack from some
+    reference coordinates, after optimal superposition.
+
+    :param numpy.ndarray coordinates: an array of shape (sets, atoms, 3).
+    :param numpy.ndarray reference: the (atoms, 3) reference coordinates.
+    :param weights: if given, a weight for each atom (masses for example).
+    :rtype: ``numpy.ndarray``"""
+
+    return kabsch(coordinates, reference, weights=weights)[1]
+
+
+def rmsd_matrix(coordinates, memory=2 ** 26):
+    """Calculates the RMSD between every pair of coordinate sets in a stack,
+    after optimal superposition. Only the singular values of each pair's
+    covariance matrix are needed, and these are calculated for whole blocks
+    of pairs at once, sized so that each block's covariance matrices take up
+    no more than the memory given.
+
+    :param numpy.ndarray coordinates: an array of shape (sets, atoms, 3).
+    :param int memory: the number of bytes each block can use.
+    :returns: a symmetric (sets, sets) array of RMSDs.
+    :rtype: ``numpy.ndarray``"""
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    count, atom_count = coordinates.shape[:2]
+    centered = coordinates - coordinates.mean(axis=1, keepdims=True)
+    squares = np.einsum("nak,nak->n", centered, centered)
+    transposed = centered.transpose(0, 2, 1)
+    matrix = np.zeros((count, count))
+    step = max(1, memory // (72 * max(count, 1)))
+    for start in range(0, count, step):
+        rows = slice(start, start + step)
+        covariance = transposed[rows, None] @ centered[None, start:]
+        values = np.linalg.svd(covariance, compute_uv=False)
+        values[..., 2] *= np.where(np.linalg.det(covariance) < 0, -1, 1)
+        block = np.sqrt(np.maximum(
+         squares[rows, None] + squares[None, start:] - 2 * values.sum(axis=-1), 0
+        ) / atom_count)
+        matrix[rows, start:] = block
+        matrix[start:, rows] = block.T
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def superpose(structures, reference):
+    """Moves some structures so that each is optimally superposed onto a
+    reference structure, and returns how well each fits.
+
+    :param structures: the structures to move.
+    :param AtomStructure reference: the structure to superpose them onto.
+    :returns: the RMSD of each structure from the reference, after moving.
+    :rtype: ``numpy.ndarray``"""
+
+    structures = list(structures)
+    coordinates = stack_coordinates(structures, reference)
+    fixed = reference._atom_arrays()[0]
+    rotations, rmsds = kabsch(coordinates, fixed)
+    for structure, rotation, center in zip(
+     structures, rotations, coordinates.mean(axis=1)
+    ):
+        structure.translate(-center)
+        structure.transform(rotation.T)
+        structure.translate(fixed.mean(axis=0))
+    return rmsds
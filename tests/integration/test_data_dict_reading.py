@@ -406,6 +406,18 @@ class ModelDictTests(DataDictTest):
              "bvalue": 6.22, "charge": 0.0, "occupancy": 0.8, "alt_loc": "A",
              "anisotropy": [0, 0, 0, 0, 0, 0], "is_hetatm": False
             })
+            bonds = d["models"][0]["bonds"]
+            for bond in [(44, 685), (54, 566), (269, 477)]:
+                self.assertIn(bond, bonds)
+            if e == "pdb":
+                self.assertEqual(bonds[3:], [
+                 (774, 775), (774, 776), (774, 777), (774, 778)
+                ])
+            elif e == "cif":
+                self.assertEqual(len(bonds), 3)
+            else:
+                self.assertGreater(len(bonds), 600)
+                self.assertEqual(bonds, sorted(set(bonds)))
     
 
     def test_4opj_data_dict_model(self):
@@ -20,6 +20,10 @@ class SavingTest(TestCase):
         f.model.save("tests/integration/files/saved_" + filename)
         f2 = atomium.open("tests/integration/files/saved_" + filename)
         self.assertEqual(f.model, f2.model)
+        self.assertEqual(
+         {frozenset(atom.id for atom in bond) for bond in f.model.bonds()},
+         {frozenset(atom.id for atom in bond) for bond in f2.model.bonds()}
+        )
         self.assertEqual(len(f.model.chains()), len(f2.model.chains()))
         for chain1, chain2 in zip(sorted(f.model.chains(), key=lambda c: c.id),
          sorted(f2.model.chains(), key=lambda c: c.id)):
@@ -72,6 +76,46 @@ class MmcifFileSavingTests(SavingTest):
         self.assertEqual(f.model.chain("A"), chain)
 
 
+    def test_only_connections_between_hets_are_struct_conn(self):
+        f = atomium.open("tests/integration/files/1lol.mmtf")
+        f.model.save("tests/integration/files/bonds.cif")
+        with open("tests/integration/files/bonds.cif") as f2:
+            text = f2.read()
+        f2 = atomium.open("tests/integration/files/bonds.cif")
+        self.assertEqual(
+         {frozenset(atom.id for atom in bond) for bond in f.model.bonds()},
+         {frozenset(atom.id for atom in bond) for bond in f2.model.bonds()}
+        )
+        connections = [
+         line.split() for line in text.splitlines() if line.startswith("covale")
+        ]
+        self.assertEqual(len(connections), len(
+         [bond for bond in f.model.bonds() if len({atom.het for atom in bond}) == 2]
+        ))
+        for connection in connections:
+            self.assertNotEqual(connection[5:7], connection[10:12])
+        self.assertIn("_chem_comp_bond.comp_id", text)
+
+
+    def test_bonds_to_chainless_ligands_survive_saving(self):
+        atom1 = atomium.Atom("C", 0, 0, 0, 1, "C1", 0, 0, [0] * 6)
+        atom2 = atomium.Atom("C", 1.5, 0, 0, 2, "C2", 0, 0, [0] * 6)
+        atom3 = atomium.Atom("O", 3, 0, 0, 3, "O1", 0, 0, [0] * 6)
+        model = atomium.Model(
+         atomium.Ligand(atom1, atom2, id="A.100", name="LIG", internal_id="C"),
+         atomium.Ligand(atom3, id="B.101", name="XYZ", internal_id="D")
+        )
+        atom1.bond(atom2)
+        atom2.bond(atom3)
+        model.save("tests/integration/files/ligands.cif")
+        model2 = atomium.open("tests/integration/files/ligands.cif").model
+        self.assertEqual({l.id for l in model2.ligands()}, {"A.100", "B.101"})
+        self.assertEqual(
+         {frozenset(atom.id for atom in bond) for bond in model2.bonds()},
+         {frozenset((1, 2)), frozenset((2, 3))}
+        )
+
+
     def test_biological_assembly_warns_on_saving(self):
         f = atomium.open("tests/integration/files/1xda.cif")
         model = f.generate_assembly(5)
@@ -84,6 +128,10 @@ class MmtfFileSavingTests(SavingTest):
 
     def test_can_save_1lol(self):
         self.check_file_saving("1lol.mmtf")
+        with open("tests/integration/files/saved_1lol.mmtf", "rb") as f:
+            mmtf_dict = atomium.mmtf.mmtf_bytes_to_mmtf_dict(f.read())
+        self.assertEqual(mmtf_dict["numBonds"], len(mmtf_dict["bondAtomList"]) // 2)
+        self.assertNotIn("bondOrderList", mmtf_dict)
 
 
     def test_can_save_1cbn(self):
@@ -164,6 +212,25 @@ class PdbFileSavingTests(SavingTest):
         self.assertEqual(old_remark_count, new_remark_count)
 
 
+    def test_only_het_and_nonstandard_bonds_are_conect(self):
+        f = atomium.open("tests/integration/files/1xda.mmtf")
+        f.model.save("tests/integration/files/bonds.pdb")
+        f2 = atomium.open("tests/integration/files/bonds.pdb")
+        saved = {frozenset(atom.id for atom in bond) for bond in f2.model.bonds()}
+        ligand_bonds, disulphides = set(), set()
+        for bond in f.model.bonds():
+            ids = frozenset(atom.id for atom in bond)
+            if any(isinstance(atom.het, atomium.structures.Ligand) for atom in bond):
+                ligand_bonds.add(ids)
+            elif {atom.name for atom in bond} == {"SG"}:
+                disulphides.add(ids)
+            else:
+                self.assertNotIn(ids, saved)
+        self.assertTrue(ligand_bonds)
+        self.assertTrue(disulphides)
+        self.assertEqual(saved, ligand_bonds | disulphides)
+
+
     def test_chain(self):
         f = atomium.open("tests/integration/files/1lol.pdb")
         f.model.chain("A").save("tests/integration/files/chaina.pdb")
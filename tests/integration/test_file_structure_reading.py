@@ -1,6 +1,8 @@
 from datetime import date
 import math
+import numpy as np
 import atomium
+from atomium import superposition
 from unittest import TestCase
 
 class DeNovoStructureTests(TestCase):
@@ -94,6 +96,7 @@ class DeNovoStructureTests(TestCase):
         self.assertEqual(atom3.bonded_atoms, {atom2})
         self.assertEqual(atom4.bonded_atoms, {atom2, atom5})
         self.assertEqual(atom5.bonded_atoms, {atom4})
+        self.assertEqual(atom1._bonded_atoms, {atom2})
 
         # Check can copy atom
         copy = atom2.copy()
@@ -158,6 +161,18 @@ class DeNovoStructureTests(TestCase):
         self.assertAlmostEqual(res1.center_of_mass[1], -0.091, delta=0.001)
         self.assertEqual(res1.center_of_mass[2], 0)
         self.assertAlmostEqual(res1.radius_of_gyration, 1.473, delta=0.001)
+        box = res1.bounding_box
+        self.assertEqual(box.tolist(), [
+         [min(a.location[i] for a in res1.atoms()) for i in range(3)],
+         [max(a.location[i] for a in res1.atoms()) for i in range(3)]
+        ])
+        self.assertFalse(box.flags.writeable)
+        self.assertEqual(res1.inertia_tensor.shape, (3, 3))
+        self.assertAlmostEqual(abs(res1.principal_axes[2][2]), 1, delta=0.000001)
+        center, axes, half_lengths = res1.oriented_bounding_box
+        self.assertIs(axes, res1.principal_axes)
+        self.assertAlmostEqual(half_lengths[2], 0, delta=0.000001)
+        self.assertAlmostEqual(center[2], 0, delta=0.000001)
 
         # Check residue safe methods
         self.assertEqual(len(tuple(res1.pairwise_atoms())), 10)
@@ -168,6 +183,47 @@ class DeNovoStructureTests(TestCase):
          tuple(res1.create_grid(size=3)),
          ((0, -3, 0), (0, 0, 0), (0, 3, 0), (3, -3, 0), (3, 0, 0), (3, 3, 0))
         )
+        self.assertEqual(
+         res1.grid(spacing=3).tolist(), [list(p) for p in res1.create_grid(size=3)]
+        )
+        self.assertEqual(
+         np.concatenate(list(res1.grid_chunks(0.5, 1, chunk_size=10))).tolist(),
+         res1.grid(0.5, 1).tolist()
+        )
+        points, occupied = res1.occupied_grid(spacing=3)
+        self.assertEqual(occupied.shape, (2, 3, 1))
+        self.assertEqual(
+         occupied.ravel().tolist(), [False, True, False, True, True, False]
+        )
+        points, occupied = res1.occupied_grid(spacing=3, radius="covalent_radius")
+        self.assertEqual(
+         occupied.ravel().tolist(), [False, True, False, False, True, False]
+        )
+        self.assertEqual(atom1.vdw_radius, 1.55)
+        density, origin = res1.density_map(spacing=0.5, sigma=0.5)
+        self.assertEqual(density.shape[0], 5)
+        self.assertAlmostEqual(density[1].max(), 1, delta=0.000001)
+        self.assertEqual(density[3:].sum(), 0)
+        density, origin = res1.density_map(channels="backbone", shape=(10, 8, 6))
+        self.assertEqual(density.shape, (3, 10, 8, 6))
+        self.assertEqual(density[2].sum(), 0)
+        self.assertTrue(np.allclose(
+         origin + [4.5, 3.5, 2.5], res1._atom_arrays()[0].mean(axis=0)
+        ))
+        maps, origins = atomium.spatial.density_maps(
+         [res1, res1], (10, 8, 6), channels="backbone"
+        )
+        self.assertEqual(maps.shape, (2, 3, 10, 8, 6))
+        self.assertTrue(np.allclose(maps[0], density))
+        self.assertTrue(np.allclose(origins[0], origin))
+        self.assertTrue(np.allclose(maps[1], density))
+        density, origin = res1.density_map(channels="residue", shape=4, center=(0, 0, 0))
+        self.assertEqual(density.shape, (21, 4, 4, 4))
+        self.assertEqual(origin.tolist(), [-1.5, -1.5, -1.5])
+        self.assertGreater(density[1].sum(), 0)
+        self.assertEqual(density.sum(), density[1].sum())
+        with self.assertRaises(ValueError):
+            res1.density_map(channels="charge")
         self.assertEqual(res1.atoms_in_sphere((1.5, 0, 0), 1.5), {atom2, atom1, atom3, atom4})
         self.assertEqual(res1.atoms_in_sphere((1.5, 0, 0), 1.5, element="C"), {atom2, atom3, atom4})
         res1.check_ids()
@@ -207,6 +263,19 @@ class DeNovoStructureTests(TestCase):
         res_copy = res1.copy(id="C5", atom_ids=lambda i: i * 100)
         self.assertEqual(res_copy.id, "C5")
         self.assertEqual({a.id for a in res_copy.atoms()}, {100, 200, 300, 400, 500})
+        self.assertEqual(res1.pairing_with(res_copy), {
+         atom1: res_copy.atom(100), atom2: res_copy.atom(200),
+         atom3: res_copy.atom(300), atom4: res_copy.atom(400),
+         atom5: res_copy.atom(500)
+        })
+        self.assertEqual(res1, res_copy)
+        res_copy = res1.copy(atom_ids=lambda i: {3: 600, 5: 3}.get(i, i * 100))
+        self.assertEqual(res1.pairing_with(res_copy), {
+         atom3: res_copy.atom(3), atom1: res_copy.atom(100),
+         atom2: res_copy.atom(200), atom4: res_copy.atom(400),
+         atom5: res_copy.atom(600)
+        })
+        self.assertNotEqual(res1, res_copy)
 
         # Make more residues
         atom6 = atomium.Atom("N", 4.5, 0, 0, 6, "N", 0, 0.5, [0] * 6)
@@ -391,6 +460,56 @@ class DeNovoStructureTests(TestCase):
         self.assertEqual(model.atom(1), atom1)
         self.assertEqual(model.atom(name="N", het__name="ALA", chain__id="A"), atom1)
 
+        # Bonds within a model are stored by the model
+        component_count = len(model.bond_components())
+        copper_atom.bond(atom5)
+        self.assertIsNone(copper_atom._bonded_atoms)
+        self.assertEqual(copper_atom.bonded_atoms, {atom5})
+        self.assertEqual(atom5.bonded_atoms, {atom4, copper_atom})
+        self.assertEqual(len(model._bonds), 1)
+        atom5.bond(copper_atom)
+        self.assertEqual(len(model._bonds), 1)
+        self.assertEqual(len(model.bond_components()), component_count - 1)
+        self.assertEqual(
+         [model._atom_index(atom) for atom in model._atom_list],
+         list(range(len(model.atoms())))
+        )
+
+        # Model-wide properties agree with those of free structures
+        self.assertAlmostEqual(res1.mass, 66, delta=0.05)
+        self.assertAlmostEqual(res1.center_of_mass[0], 1.818, delta=0.001)
+        self.assertAlmostEqual(res1.center_of_mass[1], -0.091, delta=0.001)
+        self.assertAlmostEqual(res1.radius_of_gyration, 1.473, delta=0.001)
+        self.assertAlmostEqual(model.mass, sum(a.mass for a in model.atoms()), delta=0.000001)
+        self.assertAlmostEqual(copper.mass, copper_atom.mass, delta=0.000001)
+        self.assertEqual(tuple(copper.center_of_mass), copper_atom.location)
+        self.assertEqual(copper.radius_of_gyration, 0)
+        self.assertEqual(res1.bounding_box.tolist(), box.tolist())
+        self.assertEqual(copper.bounding_box.tolist(), [list(copper_atom.location)] * 2)
+        self.assertEqual(model.bounding_box.tolist(), [
+         [min(a.location[i] for a in model.atoms()) for i in range(3)],
+         [max(a.location[i] for a in model.atoms()) for i in range(3)]
+        ])
+        tensor = model.inertia_tensor
+        self.assertIs(model.inertia_tensor, tensor)
+        model.translate(1, 2, 3)
+        self.assertIsNot(model.inertia_tensor, tensor)
+        for row1, row2 in zip(model.inertia_tensor, tensor):
+            for value1, value2 in zip(row1, row2):
+                self.assertAlmostEqual(value1, value2, delta=0.0001)
+        self.assertEqual((res1.bounding_box - box).tolist(), [[1, 2, 3]] * 2)
+        model.translate(-1, -2, -3)
+
+        # Model contains its structures
+        for obj in (chain1, res2, atom4, copper, copper_atom, hoh1, chain2[1].atom(1100)):
+            self.assertIn(obj, model)
+        self.assertNotIn(res_copy, model)
+        self.assertNotIn(cu_copy.atom(), model)
+        self.assertIn(res2, chain1)
+        self.assertIn(atom4, chain1)
+        self.assertNotIn(copper_atom, chain1)
+        self.assertNotIn(chain2[1], chain1)
+
         # Everything points upwards correctly
         self.assertIs(atom1.model, model)
         self.assertIs(res1.model, model)
@@ -401,6 +520,8 @@ class DeNovoStructureTests(TestCase):
         self.assertEqual(atom2.nearby_atoms(1.5), {atom1, atom3, atom4})
         self.assertEqual(atom4.nearby_atoms(1.5), {atom2, atom5, atom6})
         self.assertEqual(atom4.nearby_atoms(1.5, het__name="CYS"), {atom6})
+        self.assertEqual(res2.nearby_atoms(1.5), {atom4, atom12})
+        self.assertEqual(res2.nearby_atoms(1.5, het__name="SER"), {atom12})
         self.assertEqual(atom4.nearby_hets(1.5), {res2})
         self.assertEqual(atom4.nearby_hets(9), {res2, res3, chain2[1], copper, hoh1})
         self.assertEqual(atom4.nearby_hets(9, ligands=False), {res2, res3, chain2[1]})
@@ -413,10 +534,17 @@ class DeNovoStructureTests(TestCase):
         self.assertEqual(res2.nearby_hets(6, ligands=False), {res1, res3, chain2[1]})
         self.assertEqual(copper.nearby_chains(5), {chain2})
         self.assertEqual(chain2.nearby_chains(5), {chain1})
+        chain2.translate(100, 0, 0)
+        self.assertEqual(chain2.nearby_chains(5), set())
+        self.assertEqual(res2.nearby_hets(6), {res1, res3, hoh1, copper})
+        chain2.translate(-100, 0, 0)
+        self.assertEqual(res2.nearby_hets(6), {res1, res3, hoh1, copper, chain2[1]})
 
         # Dehydrate model
         model.dehydrate()
         self.assertEqual(model.waters(), set())
+        self.assertNotIn(hoh1, model)
+        self.assertIsNone(hoh1.model)
         self.assertEqual(model.ligands(), {copper})
         self.assertEqual(model.chains(), {chain1, chain2})
 
@@ -484,6 +612,7 @@ class FileReadingTests(TestCase):
             }])
 
             self.assertEqual(len(f.models), 1)
+            self.assertIsInstance(f.models, list)
             model = f.model
             self.assertEqual(len(model.chains()), 2)
             self.assertIsInstance(model.chains(), set)
@@ -506,6 +635,32 @@ class FileReadingTests(TestCase):
             self.assertAlmostEqual(
              model.mass, 46018.5, delta=0.005
             )
+            selection = model.select()
+            self.assertEqual(selection.count(), 3431)
+            self.assertEqual(set(selection), model.atoms())
+            carbons = selection.filter(element="C")
+            self.assertEqual(set(carbons), model.atoms(element="C"))
+            self.assertEqual(len(selection.exclude(element="C") | carbons), 3431)
+            self.assertEqual(
+             set(carbons & model.ligand(name="XMP").select()),
+             model.ligand(name="XMP").atoms(element="C")
+            )
+            self.assertEqual(selection.coordinates().shape, (3431, 3))
+            self.assertEqual(
+             set(model.selection_from_bitset(carbons.bitset)), set(carbons)
+            )
+            self.assertEqual(
+             set(selection.filter(bvalue__between=(10, 20), element__in="NO")),
+             model.atoms(bvalue__between=(10, 20), element__in="NO")
+            )
+            self.assertEqual(
+             set(selection.filter(name__startswith="CG")),
+             model.atoms(name__regex="^CG")
+            )
+            self.assertEqual(
+             set(model.select("residues").filter(name__regex="CYS|VAL")),
+             model.residues(name__regex="CYS|VAL")
+            )
 
             chaina = model.chain("A")
             chainb = model.chain(id="B")
@@ -544,6 +699,9 @@ class FileReadingTests(TestCase):
             self.assertEqual(len(res.atoms(element__regex="C|O")), 7)
             self.assertEqual(len(res.atoms(name__regex="^CD")), 2)
             self.assertIs(chaina[0], chaina.residue("A.11"))
+            self.assertEqual(chaina[1:3], (chaina.residue("A.12"), chaina.residue("A.13")))
+            self.assertIs(model.residue("A.13"), chaina.residue("A.13"))
+            self.assertEqual(list(chaina), list(chaina.residues()))
             self.assertIs(res.next, chaina[5])
             self.assertIn(chaina.residue(name="GLN"), [chaina.residue("A.136"), chaina.residue("A.173")])
 
@@ -585,6 +743,188 @@ class FileReadingTests(TestCase):
             lig1, lig2 = model.ligands(name="XMP")
             self.assertAlmostEqual(lig1.rmsd_with(lig2), 0.133, delta=0.001)
             self.assertAlmostEqual(lig2.rmsd_with(lig1), 0.133, delta=0.001)
+            self.assertEqual(chaina.rmsd_with(chaina.copy()), 0)
+            stack = superposition.stack_coordinates([lig1, lig2])
+            self.assertEqual(stack.shape, (2, 24, 3))
+            self.assertAlmostEqual(
+             superposition.rmsd_matrix(stack)[0, 1], 0.133, delta=0.001
+            )
+            lig_copy = lig2.copy()
+            lig_copy.translate(10, 20, 30)
+            lig_copy.rotate(1, "x")
+            rmsds = superposition.superpose([lig_copy], lig1)
+            self.assertAlmostEqual(rmsds[0], 0.133, delta=0.001)
+            self.assertAlmostEqual(superposition.kabsch(
+             superposition.stack_coordinates([lig_copy], lig1)[0],
+             superposition.stack_coordinates([lig1])[0]
+            )[1], 0.133, delta=0.001)
+            self.assertLess(
+             np.abs(lig_copy.center_of_mass - lig1.center_of_mass).max(), 0.2
+            )
+            areas = chaina.residue_sasa(points=30)
+            self.assertEqual(len(areas), len(chaina.residues()))
+            self.assertAlmostEqual(sum(areas.values()), chaina.sasa(points=30), delta=0.001)
+            self.assertGreater(
+             lig1.sasa(points=30), model.residue_sasa(points=30)[lig1]
+            )
+            self.assertEqual(list(chaina.chain_sasa(points=30)), [chaina])
+            self.assertGreater(chaina.buried_surface_area(chainb, points=30), 1000)
+
+            atom = model.atom(934)
+            self.assertEqual(len(model.bonds()), {"mmtf": 3297, "pdb": 62}.get(e.split(".")[0], 0))
+            self.assertEqual(len(lig1.bonds()), 0 if e.startswith("cif") else 26)
+            self.assertEqual(len(atom.bonded_atoms), 3 if e == "mmtf" else 0)
+            model.perceive_bonds()
+            self.assertEqual(atom.bonded_atoms, {
+             model.atom(933), model.atom(935), model.atom(937)
+            })
+            self.assertIn((model.atom(933), atom), model.bonds())
+            self.assertEqual(hoh.atom().bonded_atoms, set())
+            lig_atoms = set(lig1.atoms())
+            for lig_atom in lig_atoms:
+                self.assertTrue(lig_atom.bonded_atoms)
+                self.assertLessEqual(lig_atom.bonded_atoms, lig_atoms)
+            bond_count = len(model.bonds())
+            model.perceive_bonds()
+            self.assertEqual(len(model.bonds()), bond_count)
+            self.assertEqual(sorted(len(ring) for ring in lig1.rings()), [5, 5, 6])
+            self.assertEqual(lig1.bond_components(), [lig_atoms])
+            self.assertEqual(len(chaina.bond_components()), 2)
+            residues = chaina.residues()
+            path = chaina.bond_path(
+             residues[0].atom(name="N"), residues[10].atom(name="N")
+            )
+            self.assertEqual(len(path), 31)
+            self.assertIs(path[1], residues[0].atom(name="CA"))
+            self.assertIsNone(model.bond_path(atom, hoh.atom()))
+            with self.assertRaises(ValueError):
+                lig1.bond_path(atom, lig1.atom())
+
+            contacts, residues = model.residue_contact_map(5)
+            self.assertEqual(residues, chaina.residues() + chainb.residues())
+            self.assertEqual(contacts.shape, (418, 418))
+            self.assertEqual((contacts != contacts.T).nnz, 0)
+            for index in (0, 20, 300):
+                self.assertEqual(
+                 {residues[i] for i in contacts[index].indices},
+                 residues[index].nearby_hets(5, ligands=False)
+                )
+            contacts, residues = model.residue_contact_map(8, mode="CA")
+            self.assertAlmostEqual(contacts[0, 1], residues[0].atom(name="CA").distance_to(
+             residues[1].atom(name="CA")
+            ), delta=0.000001)
+            self.assertGreater(model.residue_contact_map(8, mode="CB")[0].nnz, 0)
+            with self.assertRaises(ValueError):
+                model.residue_contact_map(8, mode="CG")
+            contacts, chains = model.chain_contact_map(5)
+            self.assertEqual(chains, (chaina, chainb))
+            self.assertEqual(contacts.sum(), 2451)
+            self.assertEqual(contacts[0, 1], contacts[1, 0])
+
+            angles = chaina.dihedrals(chi=True)
+            self.assertEqual(set(angles), {
+             "phi", "psi", "omega", "chi1", "chi2", "chi3", "chi4"
+            })
+            for values in angles.values():
+                self.assertEqual(len(values), len(chaina))
+            self.assertEqual(np.isnan(angles["phi"]).sum(), 2)
+            self.assertTrue(np.isnan(angles["phi"][0]))
+            self.assertTrue(np.isnan(angles["psi"][-1]))
+            self.assertAlmostEqual(np.degrees(angles["phi"][5]), -102.905, delta=0.001)
+            self.assertAlmostEqual(np.degrees(angles["psi"][0]), 132.1, delta=0.1)
+            self.assertAlmostEqual(np.degrees(angles["chi4"][3]), -168.9, delta=0.1)
+            self.assertTrue(np.isnan(angles["chi2"][0]))
+            self.assertGreater(np.nanmean(np.abs(angles["omega"])), 3)
+            self.assertNotIn("chi1", chainb.dihedrals())
+
+            residue = chaina.residues()[5]
+            n, ca, c = [residue.atom(name=name) for name in ("N", "CA", "C")]
+            previous_c = chaina.residues()[4].atom(name="C")
+            values = model.measure([(n, ca), (ca, n)])
+            self.assertEqual(values.tolist(), [n.distance_to(ca)] * 2)
+            self.assertEqual(model.measure([(n, ca, c)]).tolist(), [ca.angle(n, c)])
+            self.assertAlmostEqual(
+             model.measure([(previous_c, n, ca, c)])[0], angles["phi"][5],
+             delta=0.000001
+            )
+            selection = model.select().filter(name="CA")
+            indices, alpha_carbons = selection.indices, list(selection)
+            values = model.measure(np.column_stack([indices[:-1], indices[1:]]))
+            self.assertEqual(len(values), len(indices) - 1)
+            self.assertEqual(
+             values[0], alpha_carbons[0].distance_to(alpha_carbons[1])
+            )
+            with self.assertRaises(ValueError):
+                model.measure([(n, model.atom(934).copy())])
+
+            pairs = 0
+            for atoms1, atoms2, block in model.pairwise_distances(
+             cutoff=3, dtype=np.float32, memory=2 ** 20, threads=2
+            ):
+                self.assertEqual(block.shape, (len(atoms1), len(atoms2)))
+                for i, j, distance in zip(block.row, block.col, block.data):
+                    pairs += 1
+                    if pairs % 500 == 0:
+                        self.assertAlmostEqual(
+                         atoms1[i].distance_to(atoms2[j]), distance, delta=0.001
+                        )
+            cells = atomium.spatial.CellList(model.select().coordinates(), 3)
+            self.assertEqual(pairs, len(cells.self_pairs(3)[0]))
+            atoms1, atoms2, block = next(lig1.pairwise_distances())
+            self.assertEqual(atoms1, atoms2)
+            self.assertAlmostEqual(
+             block[1, 2], atoms1[1].distance_to(atoms1[2]), delta=0.000001
+            )
+
+            clashes = model.clashes()
+            self.assertEqual(len(clashes), 30)
+            atom1, atom2, overlap = clashes[0]
+            self.assertEqual({atom1.name, atom2.name}, {"C", "OD2"})
+            self.assertAlmostEqual(overlap, 0.963, delta=0.001)
+            self.assertAlmostEqual(
+             overlap, atom1.vdw_radius + atom2.vdw_radius - atom1.distance_to(atom2),
+             delta=0.000001
+            )
+            self.assertEqual(
+             [c[2] for c in clashes], sorted([c[2] for c in clashes], reverse=True)
+            )
+            for atom1, atom2, overlap in clashes:
+                self.assertNotIn(atom2, atom1.bonded_atoms)
+                self.assertGreater(overlap, 0.4)
+            self.assertLess(len(model.clashes(tolerance=0.6)), 30)
+            self.assertEqual(len(model.clashes(hydrogen_bond_allowance=0)), 105)
+            water1 = model.water(id="A.3017").atom()
+            water2 = model.water(id="A.3179").atom()
+            self.assertAlmostEqual(water1.distance_to(water2), 2.325, delta=0.001)
+            self.assertIn(
+             frozenset((water1, water2)),
+             {frozenset(bond[:2]) for bond in model.hydrogen_bonds()}
+            )
+            self.assertNotIn({water1, water2}, [set(clash[:2]) for clash in clashes])
+            self.assertIn({water1, water2}, [
+             set(clash[:2]) for clash in model.clashes(hydrogen_bond_allowance=0)
+            ])
+            self.assertGreater(len(model.clashes(exclude_bonded=False)), 3000)
+
+            hydrogen_bonds = model.hydrogen_bonds()
+            self.assertEqual(len(hydrogen_bonds), 844)
+            self.assertGreater(len(model.hydrogen_bonds(angle=0)), 844)
+            self.assertLess(len(model.hydrogen_bonds(cutoff=3)), 844)
+            self.assertEqual(len({frozenset(bond[:2]) for bond in hydrogen_bonds}), 844)
+            for donor, acceptor, distance in hydrogen_bonds:
+                self.assertIsNot(donor.het, acceptor.het)
+                self.assertLessEqual(distance, 3.5)
+            donor, acceptor, distance = hydrogen_bonds[2]
+            self.assertEqual((donor.id, acceptor.id), (8, 235))
+            self.assertAlmostEqual(distance, donor.distance_to(acceptor), delta=0.000001)
+            salt_bridges = model.salt_bridges()
+            self.assertEqual(len(salt_bridges), 59)
+            for cation, anion, distance in salt_bridges:
+                self.assertIn(cation.het.name, ("ARG", "LYS", "HIS"))
+                self.assertIn(anion.het.name, ("ASP", "GLU"))
+                self.assertLessEqual(distance, 4)
+            self.assertEqual(model.metal_coordination(), [])
+            self.assertEqual(model.metal_sites(), [])
 
             atom = model.atom(934)
             self.assertEqual(atom.anisotropy, [0, 0, 0, 0, 0, 0])
@@ -645,8 +985,22 @@ class FileReadingTests(TestCase):
             f = atomium.open("tests/integration/files/5xme." + e)
             self.assertEqual(f.resolution, None)
             models = f.models
+            self.assertIsInstance(models, atomium.data.Frames)
             self.assertEqual(len(models), 10)
+            self.assertEqual(len(models._cache), 0)
+            unbuilt_ensemble = f.ensemble()
+            self.assertEqual(len(models._cache), 0)
+            self.assertEqual(unbuilt_ensemble.coordinates.shape, (10, 1827, 3))
+            self.assertIs(models[-1], models[9])
+            self.assertEqual(models[8:], [models[8], models[9]])
+            self.assertEqual(list(models._cache), [8, 9])
             self.assertIs(f.model, f.models[0])
+            self.assertIsInstance(models[:2], list)
+            self.assertEqual(models.index(models[8]), 8)
+            self.assertIn(models[9], models)
+            self.assertEqual(models + [f.model], list(models) + [f.model])
+            self.assertEqual([f.model] + models, [f.model] + list(models))
+            self.assertEqual(list(reversed(models)), list(models)[::-1])
             x_values = [
              33.969, 34.064, 37.369, 36.023, 35.245,
              35.835, 37.525, 35.062, 36.244, 37.677
@@ -658,6 +1012,42 @@ class FileReadingTests(TestCase):
                 atom = model.chain()[0].atom(name="N")
                 self.assertEqual(atom.location[0], x)
             self.assertEqual(len(all_atoms), 18270)
+            self.assertEqual(len(models._cache), 4)
+
+            # Ensemble view of the models
+            ensemble = f.ensemble()
+            self.assertEqual(len(ensemble), 10)
+            self.assertEqual(
+             ensemble.coordinates.tolist(), unbuilt_ensemble.coordinates.tolist()
+            )
+            self.assertEqual(ensemble.structures, tuple(models))
+            self.assertEqual(ensemble.coordinates.shape, (10, 1827, 3))
+            self.assertEqual(ensemble.atoms[0].model, f.model)
+            n = ensemble.atoms.index(models[0].chain()[0].atom(name="N"))
+            self.assertEqual(ensemble.coordinates[:, n, 0].tolist(), x_values)
+            self.assertEqual(len(ensemble.rmsd_matrix()), 10)
+            rmsds = ensemble.superpose()
+            self.assertEqual(rmsds[0], 0)
+            self.assertAlmostEqual(rmsds[1], ensemble.rmsd_matrix()[0, 1], delta=0.001)
+            self.assertAlmostEqual(rmsds[1], models[0].rmsd_with(models[1]), delta=0.1)
+            self.assertEqual(models[1].chain()[0].atom(name="N").location[0], 34.064)
+            rmsf = ensemble.rmsf()
+            self.assertEqual(rmsf.shape, (1827,))
+            self.assertTrue((rmsf >= 0).all())
+            self.assertEqual(ensemble.mean_coordinates().shape, (1827, 3))
+            self.assertEqual(ensemble.median_coordinates().shape, (1827, 3))
+            residues, values = ensemble.per_residue(rmsf)
+            self.assertEqual(residues, models[0].chain()[:])
+            first = models[0].chain()[0]
+            self.assertAlmostEqual(values[0], np.mean([
+             rmsf[ensemble.atoms.index(atom)] for atom in first.atoms()
+            ]), delta=0.000001)
+            residues, values = ensemble.per_residue(
+             ensemble.atom_values("bvalue"), statistic="max"
+            )
+            self.assertEqual(values.shape, (10, 114))
+            with self.assertRaises(ValueError):
+                ensemble.per_residue(rmsf, statistic="mode")
 
             # Source information
             if e == "pdb":
@@ -675,6 +1065,22 @@ class FileReadingTests(TestCase):
                     "YES",
                 )
 
+    def test_1msh(self):
+        f = atomium.open("tests/integration/files/1msh.mmtf")
+        models = f.models
+        self.assertIsInstance(models, atomium.data.Frames)
+        self.assertEqual(len(models), 30)
+        self.assertEqual(len(models._others), 1)
+        self.assertIsNotNone(models._bvalues)
+        self.assertNotEqual(
+         [atom.bvalue for atom in sorted(models[0].atoms(), key=lambda a: a.id)],
+         [atom.bvalue for atom in sorted(models[1].atoms(), key=lambda a: a.id)]
+        )
+        self.assertEqual(len(models[28].atoms()), 2222)
+        self.assertEqual(len(models[29].atoms()), 1037)
+        self.assertIs(models[29], models[-1])
+
+
     def test_1cbn(self):
         for e in ["cif", "mmtf", "pdb"]:
             f = atomium.open("tests/integration/files/1cbn." + e)
@@ -687,6 +1093,18 @@ class FileReadingTests(TestCase):
                 for name in ["N", "C", "CA", "CB"]:
                     self.assertEqual(len(residue.atoms(name=name)), 1)
 
+            # Polar hydrogens in hydrogen bonds don't clash
+            hydrogen = f.model.atom(294)
+            acceptor = f.model.atom(341)
+            self.assertEqual((hydrogen.name, acceptor.name), ("HH11", "O"))
+            self.assertAlmostEqual(hydrogen.distance_to(acceptor), 1.92, delta=0.005)
+            clashes = f.model.clashes()
+            self.assertEqual(len(clashes), 15)
+            self.assertNotIn({hydrogen, acceptor}, [set(c[:2]) for c in clashes])
+            self.assertIn({hydrogen, acceptor}, [
+             set(c[:2]) for c in f.model.clashes(hydrogen_bond_allowance=0)
+            ])
+
 
     def test_1xda(self):
         for e in ["cif", "mmtf", "pdb"]:
@@ -699,6 +1117,38 @@ class FileReadingTests(TestCase):
             self.assertEqual(len(model.atoms()), 1842)
             self.assertEqual(len(model.chains()), 8)
             self.assertEqual(len(model.ligands()), 16)
+            coordination = model.metal_coordination()
+            self.assertEqual(len(coordination), 8)
+            self.assertEqual({atom.name for _, atom, _ in coordination}, {"CL", "NE2"})
+            for metal, atom, distance in coordination:
+                self.assertEqual(metal.element.upper(), "ZN")
+                self.assertLessEqual(distance, 2.8)
+            sites = model.metal_sites()
+            self.assertEqual(len(sites), 4)
+            self.assertEqual({site["metal"] for site in sites}, set(model.atoms(is_metal=True)))
+            for site in sites:
+                self.assertEqual([atom.name for atom in site["atoms"]], ["NE2", "CL"])
+                self.assertEqual(len(site["distances"]), 2)
+                self.assertLess(site["distances"][0], site["distances"][1])
+                self.assertEqual(site["geometry"], "linear")
+                self.assertAlmostEqual(
+                 site["angles"][0], site["metal"].angle(*site["atoms"]), delta=0.000001
+                )
+            self.assertEqual(model.metal_sites(cutoff=2)[0]["geometry"], None)
+            atoms = list(model.atoms())
+            coordinates = np.array([atom.location for atom in atoms])
+            for chain in model.chains():
+                own = np.array([atom in chain.atoms() for atom in atoms])
+                distances = np.sqrt(((
+                 coordinates[:, None] - coordinates[None, own]
+                ) ** 2).sum(axis=2)).min(axis=1)
+                near = {atom for atom, d, o in zip(atoms, distances, own)
+                 if d <= 5 and not o}
+                self.assertEqual(chain.nearby_atoms(5), near)
+                self.assertEqual(chain.nearby_chains(5), {
+                 atom.chain for atom in near
+                } - {chain, None})
+                self.assertEqual(chain.nearby_hets(5), {atom.het for atom in near})
 
             model = f.generate_assembly(1)
             self.assertEqual(len(model.chains()), 2)
@@ -750,6 +1200,12 @@ class FileReadingTests(TestCase):
                  "(2R,3AS,4AR,5AR,5BS)-2-(6-AMINO-9H-PURIN-9-YL)-3A-HYDROXYHEXAHYDROCYCLOPROPA[4,5]CYCLOPENTA[1,2-B]FURAN-5A(4H)-YL DIHYDROGEN PHOSPHATE"
                 )
 
+            # Nucleotide and ligand polar atoms are donors and acceptors
+            clashes = [{a.name for a in c[:2]} for c in f.model.clashes()]
+            self.assertNotIn({"N4", "O6"}, clashes)
+            self.assertNotIn({"O1", "O"}, clashes)
+            self.assertIn({"C3", "O"}, clashes)
+
             if e == "pdb":
                 self.assertEqual(
                     f.model.chain("A").information["molecule"], "RIBONUCLEASE H"
@@ -0,0 +1,61 @@
+from unittest import TestCase
+from atomium.base import AttributeIndex
+
+class AttributeIndexTest(TestCase):
+
+    def setUp(self):
+        self.numbers = AttributeIndex([15.0, 10.0, None, 30.0, 20.0, 10.0])
+        self.strings = AttributeIndex(["CA", "N", "CB", None, "O", "C"])
+
+
+
+class AttributeIndexCreationTests(AttributeIndexTest):
+
+    def test_can_create_index(self):
+        self.assertEqual(self.numbers._null.tolist(), [0, 0, 1, 0, 0, 0])
+        self.assertEqual(self.numbers._sorted.tolist(), [10, 10, 15, 20, 30])
+        self.assertEqual(self.numbers._order.tolist(), [1, 5, 0, 4, 3])
+        self.assertEqual(len(self.numbers), 6)
+
+
+
+class AttributeIndexMaskTests(AttributeIndexTest):
+
+    def test_equality(self):
+        self.assertEqual(self.numbers.mask("eq", 10).tolist(), [0, 1, 0, 0, 0, 1])
+        self.assertEqual(self.strings.mask("eq", "CB").tolist(), [0, 0, 1, 0, 0, 0])
+        self.assertEqual(self.strings.mask("eq", "X").tolist(), [0] * 6)
+
+
+    def test_comparisons(self):
+        self.assertEqual(self.numbers.mask("gt", 15).tolist(), [0, 0, 0, 1, 1, 0])
+        self.assertEqual(self.numbers.mask("ge", 15).tolist(), [1, 0, 0, 1, 1, 0])
+        self.assertEqual(self.numbers.mask("lt", 15).tolist(), [0, 1, 0, 0, 0, 1])
+        self.assertEqual(self.numbers.mask("le", 15).tolist(), [1, 1, 0, 0, 0, 1])
+
+
+    def test_membership(self):
+        self.assertEqual(self.strings.mask("in", ["N", "O", "S"]).tolist(), [0, 1, 0, 0, 1, 0])
+
+
+    def test_between(self):
+        self.assertEqual(self.numbers.mask("between", (10, 20)).tolist(), [1, 1, 0, 0, 1, 1])
+
+
+    def test_null(self):
+        self.assertEqual(self.numbers.mask("isnull", True).tolist(), [0, 0, 1, 0, 0, 0])
+        self.assertEqual(self.numbers.mask("isnull", False).tolist(), [1, 1, 0, 1, 1, 1])
+
+
+    def test_startswith(self):
+        self.assertEqual(self.strings.mask("startswith", "C").tolist(), [1, 0, 1, 0, 0, 1])
+        self.assertIsNone(self.numbers.mask("startswith", "C"))
+
+
+    def test_unsupported_operators(self):
+        self.assertIsNone(self.numbers.mask("regex", "1"))
+
+
+    def test_incomparable_values(self):
+        with self.assertRaises(TypeError):
+            self.numbers.mask("eq", "C")
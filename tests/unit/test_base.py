@@ -14,6 +14,9 @@ class ObjectFromFilterTests(TestCase):
         self.assertIs(obj, obj2)
         obj2 = get_object_from_filter(obj, ["height", "lt"])
         self.assertIs(obj, obj2)
+        for operator in ("in", "between", "isnull", "startswith"):
+            obj2 = get_object_from_filter(obj, ["height", operator])
+            self.assertIs(obj, obj2)
     
 
     def test_can_get_chained_object(self):
@@ -64,6 +67,30 @@ class AttributeMatchingTests(TestCase):
         self.assertTrue(attribute_matches_value(10, 10, ["height", "gte"]))
 
 
+    def test_membership_match(self):
+        self.assertTrue(attribute_matches_value("C", ("C", "N"), ["element", "in"]))
+        self.assertFalse(attribute_matches_value("O", ("C", "N"), ["element", "in"]))
+
+
+    def test_between_match(self):
+        self.assertTrue(attribute_matches_value(10, (10, 20), ["bvalue", "between"]))
+        self.assertTrue(attribute_matches_value(20, (10, 20), ["bvalue", "between"]))
+        self.assertFalse(attribute_matches_value(21, (10, 20), ["bvalue", "between"]))
+        self.assertFalse(attribute_matches_value(None, (10, 20), ["bvalue", "between"]))
+
+
+    def test_null_match(self):
+        self.assertTrue(attribute_matches_value(None, True, ["name", "isnull"]))
+        self.assertFalse(attribute_matches_value("CA", True, ["name", "isnull"]))
+        self.assertTrue(attribute_matches_value("CA", False, ["name", "isnull"]))
+
+
+    def test_startswith_match(self):
+        self.assertTrue(attribute_matches_value("CA", "C", ["name", "startswith"]))
+        self.assertFalse(attribute_matches_value("NE", "C", ["name", "startswith"]))
+        self.assertFalse(attribute_matches_value(None, "C", ["name", "startswith"]))
+
+
 
 class ObjectFilteringTests(TestCase):
 
@@ -109,6 +136,12 @@ class QueryDecoratorTests(TestCase):
         mock_filter.assert_any_call(self.s, "a", 1)
 
 
+    def test_can_get_unfiltered_objects_as_tuple(self):
+        self.s.structures = [6, 2, 4]
+        f = query(self.f, tuple_=True)
+        self.assertEqual(f(self), (6, 2, 4))
+
+
     @patch("atomium.base.filter_objects")
     def test_can_get_filtered_objects_as_tuple(self, mock_filter):
         mock_filter.side_effect = [Mock(structures={2}, ids={1})]
@@ -0,0 +1,94 @@
+import numpy as np
+from unittest import TestCase
+from atomium.geometry import *
+
+class MeasureTests(TestCase):
+
+    def setUp(self):
+        self.coordinates = np.array([
+         [0, 0, 0], [3, 0, 0], [3, 4, 0], [3, 4, 5]
+        ], dtype=float)
+
+
+    def test_pairs_give_distances(self):
+        self.assertEqual(
+         measure(self.coordinates, [[0, 1], [0, 2], [3, 3]]).tolist(), [3, 5, 0]
+        )
+
+
+    def test_triples_give_angles(self):
+        self.assertTrue(np.allclose(
+         measure(self.coordinates, [[0, 1, 2], [1, 0, 1]]), [np.pi / 2, 0]
+        ))
+
+
+    def test_quadruples_give_dihedrals(self):
+        self.assertTrue(np.allclose(
+         measure(self.coordinates, [[0, 1, 2, 3]]), [np.pi / 2]
+        ))
+
+
+    def test_terms_must_be_pairs_triples_or_quadruples(self):
+        with self.assertRaises(ValueError):
+            measure(self.coordinates, [[0, 1, 2, 3, 0]])
+        with self.assertRaises(ValueError):
+            measure(self.coordinates, [0, 1])
+
+
+    def test_no_terms(self):
+        self.assertEqual(len(measure(self.coordinates, [])), 0)
+
+
+
+class DistanceTests(TestCase):
+
+    def test_can_get_distances(self):
+        self.assertEqual(distances(
+         [[0, 0, 0], [1, 1, 1]], [[0, 3, 4], [1, 1, 1]]
+        ).tolist(), [5, 0])
+
+
+    def test_single_points_can_be_given(self):
+        self.assertEqual(distances([1, 2, 2], [0, 0, 0]).tolist(), [3])
+
+
+
+class AngleTests(TestCase):
+
+    def test_can_get_angles(self):
+        self.assertTrue(np.allclose(angles(
+         [[1, 0, 0], [1, 0, 0], [1, 1, 0]], [[0, 0, 0]] * 3,
+         [[0, 1, 0], [-2, 0, 0], [1, 0, 0]]
+        ), [np.pi / 2, np.pi, np.pi / 4]))
+
+
+    def test_zero_length_vectors_give_zero(self):
+        self.assertEqual(angles(
+         [[0, 0, 0], [1, 0, 0]], [[0, 0, 0]] * 2, [[0, 1, 0], [0, 0, 0]]
+        ).tolist(), [0, 0])
+
+
+
+class DihedralTests(TestCase):
+
+    def test_can_get_dihedrals(self):
+        angles = dihedrals(
+         [[1, 0, 0]] * 4, [[0, 0, 0]] * 4, [[0, 0, 1]] * 4,
+         [[1, 0, 1], [0, 1, 1], [-1, 0, 1], [0, -2, 5]]
+        )
+        self.assertTrue(np.allclose(
+         angles, [0, np.pi / 2, np.pi, -np.pi / 2]
+        ))
+
+
+    def test_missing_points_give_nan(self):
+        angles = dihedrals(
+         [[1, 0, 0], [np.nan] * 3], [[0, 0, 0]] * 2, [[0, 0, 1]] * 2,
+         [[0, 1, 1]] * 2
+        )
+        self.assertAlmostEqual(angles[0], np.pi / 2, delta=0.000001)
+        self.assertTrue(np.isnan(angles[1]))
+
+
+    def test_no_dihedrals(self):
+        self.assertEqual(len(dihedrals([], [], [], [])), 0)
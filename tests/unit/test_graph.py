@@ -0,0 +1,109 @@
+import numpy as np
+from unittest import TestCase
+from atomium.graph import *
+from atomium.graph import rings as find_rings
+
+class GraphTest(TestCase):
+
+    def setUp(self):
+        # Two fused six-membered rings (0-9), a methyl (10) on atom 0, and a
+        # separate two-atom fragment (11, 12)
+        self.edges = np.array([
+         [0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [5, 0], [4, 6], [6, 7],
+         [7, 8], [8, 9], [9, 5], [0, 10], [11, 12]
+        ])
+        self.offsets, self.neighbours = csr_adjacency(self.edges, 13)
+
+
+
+class CsrAdjacencyTests(GraphTest):
+
+    def test_can_make_adjacency(self):
+        self.assertEqual(self.offsets.tolist(), [
+         0, 3, 5, 7, 9, 12, 15, 17, 19, 21, 23, 24, 25, 26
+        ])
+        self.assertEqual(self.neighbours[0:3].tolist(), [1, 5, 10])
+        self.assertEqual(self.neighbours[9:12].tolist(), [3, 5, 6])
+        self.assertEqual(self.neighbours[25:26].tolist(), [11])
+
+
+    def test_atoms_can_have_no_bonds(self):
+        offsets, neighbours = csr_adjacency([[1, 2]], 4)
+        self.assertEqual(offsets.tolist(), [0, 0, 1, 2, 2])
+        self.assertEqual(neighbours.tolist(), [2, 1])
+
+
+    def test_no_edges(self):
+        offsets, neighbours = csr_adjacency([], 3)
+        self.assertEqual(offsets.tolist(), [0, 0, 0, 0])
+        self.assertEqual(len(neighbours), 0)
+
+
+
+class ConnectedComponentsTests(GraphTest):
+
+    def test_can_label_components(self):
+        count, labels = connected_components(self.offsets, self.neighbours)
+        self.assertEqual(count, 2)
+        self.assertEqual(labels.tolist(), [0] * 11 + [1, 1])
+
+
+    def test_components_are_ordered_by_lowest_atom(self):
+        count, labels = connected_components(*csr_adjacency([[2, 3], [0, 4]], 5))
+        self.assertEqual(count, 3)
+        self.assertEqual(labels.tolist(), [0, 1, 2, 2, 0])
+
+
+
+class ShortestPathTests(GraphTest):
+
+    def test_can_find_path(self):
+        path = shortest_path(self.offsets, self.neighbours, 10, 8)
+        self.assertEqual(path.tolist(), [10, 0, 5, 9, 8])
+
+
+    def test_path_to_self(self):
+        path = shortest_path(self.offsets, self.neighbours, 3, 3)
+        self.assertEqual(path.tolist(), [3])
+
+
+    def test_no_path(self):
+        self.assertIsNone(shortest_path(self.offsets, self.neighbours, 0, 12))
+
+
+
+class RingTests(GraphTest):
+
+    def test_can_find_ring_atoms(self):
+        self.assertEqual(
+         np.flatnonzero(ring_atoms(self.offsets, self.neighbours)).tolist(),
+         list(range(10))
+        )
+
+
+    def test_ring_atoms_peel_long_chains(self):
+        edges = [[0, 1], [1, 2], [2, 0]] + [[i, i + 1] for i in range(2, 2000)]
+        offsets, neighbours = csr_adjacency(edges, 2002)
+        self.assertEqual(
+         np.flatnonzero(ring_atoms(offsets, neighbours)).tolist(), [0, 1, 2]
+        )
+
+
+    def test_can_find_fused_rings(self):
+        rings = find_rings(self.offsets, self.neighbours)
+        self.assertEqual(len(rings), 2)
+        self.assertEqual(set(rings[0].tolist()), {0, 1, 2, 3, 4, 5})
+        self.assertEqual(set(rings[1].tolist()), {4, 5, 6, 7, 8, 9})
+        for ring in rings:
+            for atom, other in zip(ring, np.roll(ring, 1)):
+                self.assertIn(
+                 other, self.neighbours[self.offsets[atom]:self.offsets[atom + 1]]
+                )
+
+
+    def test_rings_can_be_limited_by_size(self):
+        self.assertEqual(find_rings(self.offsets, self.neighbours, max_size=5), [])
+
+
+    def test_no_rings(self):
+        self.assertEqual(find_rings(*csr_adjacency([[0, 1], [1, 2]], 3)), [])
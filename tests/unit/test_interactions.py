@@ -0,0 +1,67 @@
+import numpy as np
+from unittest import TestCase
+from atomium.interactions import *
+from atomium.graph import csr_adjacency
+
+class ClosePairTests(TestCase):
+
+    def setUp(self):
+        self.coordinates = np.array([
+         [0, 0, 0], [1, 0, 0], [5, 0, 0], [0, 2, 0], [5, 1, 0]
+        ], dtype=float)
+
+
+    def test_can_find_close_pairs(self):
+        first, second, distances = close_pairs(self.coordinates, [0, 2], [1, 3, 4], 2)
+        self.assertEqual(
+         set(zip(first.tolist(), second.tolist(), distances.tolist())),
+         {(0, 1, 1), (0, 3, 2), (2, 4, 1)}
+        )
+
+
+    def test_atoms_are_not_paired_with_themselves(self):
+        first, second, _ = close_pairs(self.coordinates, [0, 1], [0, 1], 2)
+        self.assertEqual(set(zip(first.tolist(), second.tolist())), {(0, 1), (1, 0)})
+
+
+    def test_empty_groups(self):
+        first, second, distances = close_pairs(self.coordinates, [], [1], 2)
+        self.assertEqual(len(first), 0)
+        self.assertEqual(len(distances), 0)
+
+
+
+class AntecedentAngleTests(TestCase):
+
+    def setUp(self):
+        self.coordinates = np.array([
+         [0, 0, 0], [-1, 0, 0], [0, -1, 0], [3, 0, 0], [0, 3, 0], [9, 9, 9]
+        ], dtype=float)
+        self.offsets, self.neighbours = csr_adjacency([[0, 1], [0, 2]], 6)
+
+
+    def test_can_get_smallest_antecedent_angles(self):
+        angles = antecedent_angles(
+         self.coordinates, [0, 0], [3, 4], self.offsets, self.neighbours
+        )
+        self.assertTrue(np.allclose(angles, [np.pi / 2, np.pi / 2]))
+        angles = antecedent_angles(
+         self.coordinates, [0], [5], self.offsets, self.neighbours
+        )
+        self.assertGreater(angles[0], np.pi / 2)
+
+
+    def test_antecedents_can_be_restricted(self):
+        allowed = np.array([True, True, False, True, True, True])
+        angles = antecedent_angles(
+         self.coordinates, [0], [3], self.offsets, self.neighbours, allowed
+        )
+        self.assertAlmostEqual(angles[0], np.pi, delta=0.000001)
+
+
+    def test_atoms_without_antecedents_give_nan(self):
+        angles = antecedent_angles(
+         self.coordinates, [3, 0], [0, 4], self.offsets, self.neighbours
+        )
+        self.assertTrue(np.isnan(angles[0]))
+        self.assertFalse(np.isnan(angles[1]))
@@ -0,0 +1,73 @@
+from unittest import TestCase
+from atomium.structures import Atom, Residue
+
+class PairingTest(TestCase):
+
+    def make_residue(self, ids, offset=0):
+        return Residue(*[Atom(
+         element, i + offset, 0, 0, id_, name, 0, 0, [0] * 6
+        ) for i, (element, id_, name) in enumerate(zip(
+         ("N", "C", "C", "O"), ids, ("N", "CA", "C", "O")
+        ))], id="A1", name="GLY")
+
+
+
+class PairingWithTests(PairingTest):
+
+    def test_can_pair_atoms_with_none_ids(self):
+        residue1 = self.make_residue([None] * 4)
+        residue2 = self.make_residue([None] * 4, offset=1)
+        pairing = residue1.pairing_with(residue2)
+        self.assertEqual(
+         {(a.name, b.name) for a, b in pairing.items()},
+         {("N", "N"), ("CA", "CA"), ("C", "C"), ("O", "O")}
+        )
+        self.assertAlmostEqual(residue1.rmsd_with(residue2), 0, delta=0.000001)
+
+
+    def test_can_pair_atoms_with_mixed_ids(self):
+        residue1 = self.make_residue([1, "2", None, 4])
+        residue2 = self.make_residue([None, "2", 4, 1], offset=1)
+        pairing = {a.id: b.id for a, b in residue1.pairing_with(residue2).items()}
+        self.assertEqual(pairing[1], 1)
+        self.assertEqual(pairing["2"], "2")
+        self.assertEqual(pairing[4], 4)
+        self.assertIsNone(pairing[None])
+
+
+    def test_identical_structures_with_none_ids_are_equal(self):
+        self.assertEqual(
+         self.make_residue([None, 2, None, "x"]),
+         self.make_residue([None, 2, None, "x"])
+        )
+        self.assertNotEqual(
+         self.make_residue([None, 2, None, "x"]),
+         self.make_residue([None, 2, None, "x"], offset=1)
+        )
+
+
+    def test_can_get_pairing_as_indices(self):
+        residue1 = self.make_residue([1, 2, 3, 4])
+        residue2 = self.make_residue([3, 1, 4, 2])
+        atoms1, atoms2, indices1, indices2 = residue1.pairing_indices_with(residue2)
+        self.assertEqual(
+         {atoms1[i]: atoms2[j] for i, j in zip(indices1, indices2)},
+         residue1.pairing_with(residue2)
+        )
+        self.assertEqual(
+         sorted((atoms1[i].id, atoms2[j].id) for i, j in zip(indices1, indices2)),
+         [(1, 1), (2, 2), (3, 3), (4, 4)]
+        )
+
+
+
+class RmsdWithTests(PairingTest):
+
+    def test_copies_have_zero_rmsd(self):
+        residue = Residue(*[Atom(
+         element, x, y, z, id_, name, 0, 0, [0] * 6
+        ) for element, x, y, z, id_, name in (
+         ("N", 1.1, 2.3, -0.7, 1, "N"), ("C", 2.6, 2.1, 0.4, 2, "CA"),
+         ("C", 3.1, 0.7, 0.9, 3, "C"), ("O", 2.8, -0.3, 0.1, 4, "O")
+        )], id="A1", name="GLY")
+        self.assertEqual(residue.rmsd_with(residue.copy()), 0)
@@ -0,0 +1,182 @@
+import numpy as np
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from atomium.base import Selection
+
+class SelectionTest(TestCase):
+
+    def setUp(self):
+        self.structures = tuple(SimpleNamespace(
+         _id=n, _location=np.array([n, 0, 0])
+        ) for n in range(5))
+
+
+
+class SelectionCreationTests(SelectionTest):
+
+    def test_can_create_selection(self):
+        s = Selection(self.structures)
+        self.assertIs(s._universe, self.structures)
+        self.assertIsNone(s._base)
+        self.assertIsNone(s._model)
+        self.assertEqual(s._filters, ())
+        self.assertIsNone(s._indices)
+
+
+
+class SelectionIndicesTests(SelectionTest):
+
+    def test_can_get_all_indices(self):
+        s = Selection(self.structures)
+        self.assertEqual(list(s.indices), [0, 1, 2, 3, 4])
+
+
+    def test_can_get_base_indices(self):
+        s = Selection(self.structures, np.array([1, 3]))
+        self.assertEqual(list(s.indices), [1, 3])
+
+
+    @patch("atomium.base.Selection._matches")
+    def test_filters_are_applied_lazily(self, mock_matches):
+        mock_matches.return_value = np.array([True, False, True, False, True])
+        s = Selection(self.structures).filter(x=1)
+        self.assertFalse(mock_matches.called)
+        self.assertEqual(list(s.indices), [0, 2, 4])
+        mock_matches.assert_called_once()
+        self.assertEqual(list(s.indices), [0, 2, 4])
+        mock_matches.assert_called_once()
+
+
+    @patch("atomium.base.Selection._matches")
+    def test_exclusions_are_applied(self, mock_matches):
+        mock_matches.return_value = np.array([True, False, True, False, True])
+        s = Selection(self.structures).exclude(x=1)
+        self.assertEqual(list(s.indices), [1, 3])
+
+
+
+class SelectionMatchingTests(SelectionTest):
+
+    def test_can_match_structures(self):
+        s = Selection(self.structures)
+        matches = s._matches(np.array([0, 2, 3]), "_id__gt", 1)
+        self.assertEqual(list(matches), [False, True, True])
+
+
+
+    def test_can_match_structures_using_model_index(self):
+        index = Mock()
+        index.mask.return_value = np.array([True, False, True, True, False])
+        model = Mock(_atom_list=self.structures)
+        model._attribute_index.return_value = index
+        s = Selection(self.structures, model=model)
+        matches = s._matches(np.array([0, 1, 3]), "bvalue__between", (1, 2))
+        self.assertEqual(list(matches), [True, False, True])
+        model._attribute_index.assert_called_with("bvalue")
+        index.mask.assert_called_with("between", (1, 2))
+
+
+    def test_can_match_structures_without_model_index(self):
+        model = Mock(_atom_list=self.structures)
+        model._attribute_index.return_value = None
+        s = Selection(self.structures, model=model)
+        matches = s._matches(np.array([0, 2, 3]), "_id__in", (2, 4))
+        self.assertEqual(list(matches), [False, True, False])
+
+
+
+class SelectionChainingTests(SelectionTest):
+
+    def test_can_chain_filters(self):
+        s = Selection(self.structures).filter(_id__gt=0).exclude(_id=3)
+        self.assertEqual(list(s), [self.structures[n] for n in (1, 2, 4)])
+
+
+    def test_can_filter_on_multiple_criteria(self):
+        s = Selection(self.structures).filter(_id__gt=0, _id__lt=3)
+        self.assertEqual(list(s), list(self.structures[1:3]))
+
+
+
+class SelectionContainerTests(SelectionTest):
+
+    def test_can_iterate(self):
+        s = Selection(self.structures, np.array([4, 1]))
+        self.assertEqual(list(s), [self.structures[4], self.structures[1]])
+
+
+    def test_can_get_length(self):
+        s = Selection(self.structures, np.array([4, 1]))
+        self.assertEqual(len(s), 2)
+        self.assertEqual(s.count(), 2)
+
+
+    def test_can_check_membership(self):
+        s = Selection(self.structures, np.array([4, 1]))
+        self.assertIn(self.structures[1], s)
+        self.assertIn(self.structures[4], s)
+        self.assertNotIn(self.structures[2], s)
+        self.assertNotIn(SimpleNamespace(_id=1), s)
+
+
+    def test_can_check_membership_using_model_index(self):
+        model = Mock(_atom_list=self.structures, _universes={})
+        for index, structure in enumerate(self.structures):
+            structure._index = index
+        s = Selection(self.structures, np.array([1, 3]), model)
+        with patch("atomium.base.Selection.__iter__") as mock_iter:
+            self.assertIn(self.structures[3], s)
+            self.assertNotIn(self.structures[2], s)
+            self.assertNotIn(SimpleNamespace(_index=3), s)
+            mock_iter.assert_not_called()
+
+
+
+class SelectionAlgebraTests(SelectionTest):
+
+    def test_can_combine_selections(self):
+        s1 = Selection(self.structures, np.array([0, 1, 2]))
+        s2 = Selection(self.structures, np.array([2, 3]))
+        self.assertEqual(list((s1 | s2).indices), [0, 1, 2, 3])
+        self.assertEqual(list((s1 & s2).indices), [2])
+        self.assertEqual(list((s1 - s2).indices), [0, 1])
+
+
+    def test_cannot_combine_different_universes(self):
+        s1 = Selection(self.structures)
+        with self.assertRaises(ValueError):
+            s1 | Selection(tuple(Mock() for _ in range(5)))
+
+
+
+class SelectionCoordinatesTests(SelectionTest):
+
+    def test_can_get_coordinates_from_structures(self):
+        s = Selection(self.structures, np.array([1, 3]))
+        self.assertEqual(s.coordinates().tolist(), [[1, 0, 0], [3, 0, 0]])
+
+
+    def test_can_get_coordinates_from_model(self):
+        model = Mock(_atom_list=self.structures, _coordinates=np.arange(15).reshape(5, 3))
+        s = Selection(self.structures, np.array([1, 3]), model)
+        self.assertEqual(s.coordinates().tolist(), [[3, 4, 5], [9, 10, 11]])
+
+
+
+class SelectionMaskTests(SelectionTest):
+
+    def test_can_create_selection_from_mask(self):
+        s = Selection.from_mask(self.structures, np.array([0, 1, 1, 0, 1], dtype=bool))
+        self.assertIs(s._universe, self.structures)
+        self.assertEqual(list(s.indices), [1, 2, 4])
+
+
+    def test_can_get_mask(self):
+        s = Selection(self.structures, np.array([1, 3]))
+        self.assertEqual(s.mask.tolist(), [False, True, False, True, False])
+
+
+    def test_can_get_bitset(self):
+        s = Selection(self.structures, np.array([1, 3]))
+        self.assertEqual(s.bitset, bytes([0b01010000]))
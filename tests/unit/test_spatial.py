@@ -0,0 +1,271 @@
+import numpy as np
+from unittest import TestCase
+from atomium.spatial import *
+
+class CellListTest(TestCase):
+
+    def setUp(self):
+        generator = np.random.RandomState(3)
+        self.points = generator.uniform(-10, 10, size=(300, 3))
+        self.queries = generator.uniform(-12, 12, size=(80, 3))
+
+
+    def brute_force(self, queries, cutoff):
+        distances = np.sqrt(np.sum(
+         (queries[:, None] - self.points[None]) ** 2, axis=2
+        ))
+        return {tuple(pair) for pair in np.argwhere(distances <= cutoff).tolist()}
+
+
+
+class CellListCreationTests(CellListTest):
+
+    def test_can_create_cell_list(self):
+        cells = CellList(self.points, 2.5)
+        self.assertEqual(len(cells), 300)
+        self.assertEqual(cells.cell_size, 2.5)
+        self.assertEqual(cells._origin.tolist(), self.points.min(axis=0).tolist())
+        self.assertEqual(sorted(cells._order.tolist()), list(range(300)))
+        self.assertTrue((np.diff(cells._sorted_keys) >= 0).all())
+
+
+    def test_cell_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            CellList(self.points, 0)
+
+
+    def test_can_create_empty_cell_list(self):
+        cells = CellList([], 2)
+        self.assertEqual(len(cells), 0)
+        queries, points, distances = cells.pairs(self.queries, 2)
+        self.assertEqual(len(queries), 0)
+
+
+    def test_cell_list_repr(self):
+        cells = CellList([[0, 0, 0], [5, 1, 0]], 2)
+        self.assertEqual(repr(cells), "<CellList (2 points, 3×1×1 cells)>")
+
+
+
+class CellListPairTests(CellListTest):
+
+    def test_can_find_pairs(self):
+        cells = CellList(self.points, 3)
+        queries, points, distances = cells.pairs(self.queries, 3)
+        self.assertEqual(
+         set(zip(queries.tolist(), points.tolist())),
+         self.brute_force(self.queries, 3)
+        )
+        self.assertTrue(np.allclose(distances, np.linalg.norm(
+         self.queries[queries] - self.points[points], axis=1
+        )))
+
+
+    def test_can_find_pairs_with_smaller_cutoff(self):
+        cells = CellList(self.points, 3)
+        queries, points, distances = cells.pairs(self.queries, 1.5)
+        self.assertEqual(
+         set(zip(queries.tolist(), points.tolist())),
+         self.brute_force(self.queries, 1.5)
+        )
+
+
+    def test_chunks_give_same_pairs(self):
+        cells = CellList(self.points, 3)
+        queries, points, _ = cells.pairs(self.queries, 3, chunk_size=7)
+        self.assertEqual(
+         set(zip(queries.tolist(), points.tolist())),
+         self.brute_force(self.queries, 3)
+        )
+
+
+    def test_cutoff_cannot_exceed_cell_size(self):
+        with self.assertRaises(ValueError):
+            CellList(self.points, 3).pairs(self.queries, 3.5)
+
+
+    def test_can_find_self_pairs(self):
+        cells = CellList(self.points, 3)
+        first, second, distances = cells.self_pairs(2)
+        distances = np.sqrt(np.sum(
+         (self.points[:, None] - self.points[None]) ** 2, axis=2
+        ))
+        self.assertEqual(set(zip(first.tolist(), second.tolist())), {
+         (i, j) for i, j in np.argwhere(distances <= 2).tolist() if i < j
+        })
+
+
+    def test_no_queries(self):
+        queries, points, distances = CellList(self.points, 3).pairs([], 3)
+        self.assertEqual(len(queries), 0)
+
+
+
+class GridAxesTests(TestCase):
+
+    def test_grid_axes_include_origin(self):
+        axes = grid_axes([1, -4, 0.5], [4, -1, 0.5], 2)
+        self.assertEqual([axis.tolist() for axis in axes], [
+         [0, 2, 4], [-4, -2, 0], [0, 2]
+        ])
+
+
+    def test_grid_axes_cover_box(self):
+        axes = grid_axes([-1.2, 0, -0.3], [1.1, 0.25, 0.3], 0.5)
+        self.assertEqual([axis.tolist() for axis in axes], [
+         [-1.5, -1, -0.5, 0, 0.5, 1, 1.5], [0, 0.5], [-0.5, 0, 0.5]
+        ])
+
+
+
+class SplatTests(TestCase):
+
+    def test_can_splat_point_onto_voxel(self):
+        grid = splat([[1, 1, 1]], [0], [0, 0, 0], (3, 3, 3), 1, 1, 1)
+        self.assertEqual(grid.shape, (1, 1, 3, 3, 3))
+        self.assertEqual(grid[0, 0, 1, 1, 1], 1)
+        self.assertAlmostEqual(grid[0, 0, 0, 1, 1], np.exp(-0.5), delta=1e-9)
+        self.assertAlmostEqual(grid[0, 0, 0, 0, 0], np.exp(-1.5), delta=1e-9)
+
+
+    def test_can_truncate_gaussians(self):
+        grid = splat([[1, 1, 1]], [0], [0, 0, 0], (3, 3, 3), 1, 1, 1, truncate=1)
+        self.assertEqual(grid[0, 0, 0, 1, 1], np.exp(-0.5))
+        self.assertEqual(grid[0, 0, 0, 0, 1], 0)
+
+
+    def test_can_use_spacing(self):
+        grid = splat([[1, 1, 1]], [0], [0, 0, 0], (2, 2, 2), 2, 2, 1)
+        self.assertAlmostEqual(grid[0, 0, 0, 0, 0], np.exp(-3 / 8), delta=1e-9)
+
+
+    def test_points_go_in_channels_and_batches(self):
+        grid = splat(
+         [[0, 0, 0], [1, 0, 0], [0, 0, 0]], [1, 0, 1], [[0, 0, 0], [-1, 0, 0]],
+         (2, 1, 1), 1, 0.1, 2, batches=[0, 0, 1], batch_count=2
+        )
+        self.assertEqual(grid.shape, (2, 2, 2, 1, 1))
+        self.assertEqual(grid[..., 0, 0].tolist(), [
+         [[0, 1], [1, 0]], [[0, 0], [0, 1]]
+        ])
+
+
+    def test_contributions_add_up(self):
+        grid = splat([[0, 0, 0]] * 3, [0] * 3, [0, 0, 0], (1, 1, 1), 1, 1, 1)
+        self.assertEqual(grid.ravel().tolist(), [3])
+
+
+
+class SpherePointsTests(TestCase):
+
+    def test_sphere_points_are_on_unit_sphere(self):
+        points = sphere_points(50)
+        self.assertEqual(points.shape, (50, 3))
+        self.assertTrue(np.allclose(np.linalg.norm(points, axis=1), 1))
+
+
+    def test_sphere_points_are_spread_evenly(self):
+        points = sphere_points(500)
+        self.assertTrue(np.allclose(points.mean(axis=0), 0, atol=0.01))
+
+
+
+class ShrakeRupleyTests(TestCase):
+
+    def test_isolated_spheres_are_fully_exposed(self):
+        areas = shrake_rupley([[0, 0, 0], [10, 0, 0]], [2, 1])
+        self.assertTrue(np.allclose(areas, [16 * np.pi, 4 * np.pi]))
+
+
+    def test_overlapping_spheres_bury_caps(self):
+        areas = shrake_rupley([[0, 0, 0], [2, 0, 0]], [2, 2], points=5000)
+        expected = 16 * np.pi - 4 * np.pi
+        self.assertTrue(np.allclose(areas, expected, rtol=0.01))
+
+
+    def test_enclosed_sphere_has_no_area(self):
+        areas = shrake_rupley([[0, 0, 0], [0.5, 0, 0]], [3, 1])
+        self.assertEqual(areas[1], 0)
+        self.assertGreater(areas[0], 0)
+
+
+    def test_chunks_and_threads_give_same_areas(self):
+        points = np.random.RandomState(5).uniform(-6, 6, size=(60, 3))
+        radii = np.full(60, 2.5)
+        areas = shrake_rupley(points, radii)
+        self.assertTrue(np.allclose(areas, shrake_rupley(points, radii, chunk_size=7)))
+        self.assertTrue(np.allclose(areas, shrake_rupley(points, radii, threads=3)))
+
+
+    def test_no_spheres(self):
+        self.assertEqual(len(shrake_rupley([], [])), 0)
+
+
+
+class DistanceBlockTests(TestCase):
+
+    def setUp(self):
+        generator = np.random.RandomState(7)
+        self.points = generator.uniform(-10, 10, size=(90, 3))
+        self.others = generator.uniform(-10, 10, size=(40, 3))
+
+
+    def assemble(self, blocks, shape):
+        matrix = np.full(shape, np.nan)
+        for row, column, block in blocks:
+            if hasattr(block, "toarray"): block = block.toarray()
+            matrix[row:row + block.shape[0], column:column + block.shape[1]] = block
+        return matrix
+
+
+    def test_can_get_blocks_between_point_sets(self):
+        blocks = list(distance_blocks(self.points, self.others, memory=2000))
+        self.assertGreater(len(blocks), 1)
+        for _, _, block in blocks:
+            self.assertLessEqual(block.nbytes, 1000)
+        matrix = self.assemble(blocks, (90, 40))
+        self.assertTrue(np.allclose(matrix, np.linalg.norm(
+         self.points[:, None] - self.others[None], axis=2
+        )))
+
+
+    def test_self_distances_only_give_upper_blocks(self):
+        blocks = list(distance_blocks(self.points, memory=2000))
+        self.assertTrue(all(row <= column for row, column, _ in blocks))
+        matrix = self.assemble(blocks, (90, 90))
+        expected = np.linalg.norm(self.points[:, None] - self.points[None], axis=2)
+        upper = np.triu_indices(90)
+        self.assertTrue(np.allclose(matrix[upper], expected[upper]))
+        self.assertEqual(np.diag(matrix).tolist(), [0] * 90)
+
+
+    def test_can_use_cutoff(self):
+        pairs = set()
+        for row, column, block in distance_blocks(self.points, cutoff=5, memory=2000):
+            pairs.update(zip(
+             (block.row + row).tolist(), (block.col + column).tolist()
+            ))
+        distances = np.linalg.norm(self.points[:, None] - self.points[None], axis=2)
+        self.assertEqual(pairs, {
+         (i, j) for i, j in np.argwhere(distances <= 5).tolist() if i < j
+        })
+
+
+    def test_can_use_float32(self):
+        blocks = list(distance_blocks(self.points, self.others, dtype=np.float32))
+        self.assertEqual(blocks[0][2].dtype, np.float32)
+        self.assertTrue(np.allclose(blocks[0][2], np.linalg.norm(
+         self.points[:, None] - self.others[None], axis=2
+        ), atol=0.001))
+
+
+    def test_threads_give_same_blocks(self):
+        blocks = list(distance_blocks(self.points, memory=2000))
+        threaded = list(distance_blocks(self.points, memory=2000, threads=3))
+        self.assertEqual([b[:2] for b in blocks], [b[:2] for b in threaded])
+        for block, other in zip(blocks, threaded):
+            self.assertTrue(np.array_equal(block[2], other[2]))
+
+
+    def test_no_points(self):
+        self.assertEqual(list(distance_blocks([])), [])
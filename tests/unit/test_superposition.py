@@ -0,0 +1,139 @@
+import numpy as np
+import rmsd
+from unittest import TestCase
+from unittest.mock import Mock
+from atomium.superposition import *
+
+class SuperpositionTest(TestCase):
+
+    def setUp(self):
+        generator = np.random.RandomState(7)
+        self.reference = generator.normal(size=(12, 3)) * 5
+        self.stack = []
+        for _ in range(6):
+            rotation = np.linalg.qr(generator.normal(size=(3, 3)))[0]
+            if np.linalg.det(rotation) < 0: rotation[:, 0] *= -1
+            noise = generator.normal(size=(12, 3)) * 0.3
+            self.stack.append(
+             (self.reference + noise) @ rotation + generator.normal(size=3) * 10
+            )
+        self.stack = np.array(self.stack)
+
+
+    def reference_rmsd(self, coordinates1, coordinates2):
+        return rmsd.kabsch_rmsd(
+         coordinates1 - coordinates1.mean(axis=0),
+         coordinates2 - coordinates2.mean(axis=0)
+        )
+
+
+
+class KabschTests(SuperpositionTest):
+
+    def test_can_get_rmsds(self):
+        rotations, rmsds = kabsch(self.stack, self.reference)
+        self.assertEqual(rotations.shape, (6, 3, 3))
+        for coordinates, value in zip(self.stack, rmsds):
+            self.assertAlmostEqual(
+             value, self.reference_rmsd(coordinates, self.reference), delta=1e-9
+            )
+
+
+    def test_rotations_superpose(self):
+        rotations, rmsds = kabsch(self.stack, self.reference)
+        for coordinates, rotation, value in zip(self.stack, rotations, rmsds):
+            self.assertAlmostEqual(np.linalg.det(rotation), 1, delta=1e-9)
+            moved = (coordinates - coordinates.mean(axis=0)) @ rotation \
+             + self.reference.mean(axis=0)
+            self.assertAlmostEqual(np.sqrt(
+             np.mean(np.sum((moved - self.reference) ** 2, axis=1))
+            ), value, delta=1e-9)
+
+
+    def test_can_handle_single_set(self):
+        rotation, value = kabsch(self.stack[0], self.reference)
+        self.assertEqual(rotation.shape, (3, 3))
+        self.assertAlmostEqual(
+         value, self.reference_rmsd(self.stack[0], self.reference), delta=1e-9
+        )
+
+
+    def test_identical_coordinates_have_zero_rmsd(self):
+        rotation, value = kabsch(self.reference, self.reference)
+        self.assertAlmostEqual(value, 0, delta=1e-6)
+        self.assertTrue(np.allclose(rotation, np.eye(3)))
+
+
+    def test_weights_change_rmsd(self):
+        weights = np.arange(1, 13)
+        value = kabsch(self.stack[0], self.reference, weights=weights)[1]
+        self.assertNotAlmostEqual(value, kabsch(self.stack[0], self.reference)[1])
+        self.assertAlmostEqual(value, kabsch(
+         self.stack[0], self.reference, weights=weights * 3
+        )[1], delta=1e-9)
+
+
+    def test_shapes_must_match(self):
+        with self.assertRaises(ValueError):
+            kabsch(self.stack[:, :10], self.reference)
+
+
+
+class RmsdToReferenceTests(SuperpositionTest):
+
+    def test_can_get_rmsds_to_reference(self):
+        self.assertTrue(np.allclose(
+         rmsd_to_reference(self.stack, self.reference),
+         kabsch(self.stack, self.reference)[1]
+        ))
+
+
+
+class RmsdMatrixTests(SuperpositionTest):
+
+    def test_can_get_rmsd_matrix(self):
+        matrix = rmsd_matrix(self.stack)
+        self.assertEqual(matrix.shape, (6, 6))
+        for i in range(6):
+            self.assertEqual(matrix[i, i], 0)
+            for j in range(6):
+                self.assertAlmostEqual(matrix[i, j], self.reference_rmsd(
+                 self.stack[i], self.stack[j]
+                ), delta=1e-9)
+
+
+    def test_blocks_give_same_matrix(self):
+        self.assertTrue(np.allclose(
+         rmsd_matrix(self.stack, memory=1), rmsd_matrix(self.stack)
+        ))
+
+
+    def test_reflections_are_not_allowed(self):
+        mirrored = self.stack[0] * [1, 1, -1]
+        matrix = rmsd_matrix(np.array([self.stack[0], mirrored]))
+        self.assertAlmostEqual(
+         matrix[0, 1], self.reference_rmsd(self.stack[0], mirrored), delta=1e-9
+        )
+        self.assertGreater(matrix[0, 1], 0.1)
+
+
+
+class StackCoordinatesTests(TestCase):
+
+    def test_can_stack_paired_coordinates(self):
+        reference, structure = Mock(), Mock()
+        reference._atom_tuple.return_value = (1, 2, 3)
+        reference.pairing_indices_with.return_value = (
+         None, None, np.array([0, 1, 2]), np.array([0, 1, 2])
+        )
+        reference._atom_arrays.return_value = (np.arange(9).reshape(3, 3), None)
+        structure.pairing_indices_with.return_value = (
+         None, None, np.array([2, 0, 1]), np.array([0, 1, 2])
+        )
+        structure._atom_arrays.return_value = (np.arange(9, 18).reshape(3, 3), None)
+        stack = stack_coordinates([reference, structure])
+        self.assertEqual(stack.tolist(), [
+         [[0, 1, 2], [3, 4, 5], [6, 7, 8]],
+         [[15, 16, 17], [9, 10, 11], [12, 13, 14]]
+        ])
+        structure.pairing_indices_with.assert_called_with(reference)